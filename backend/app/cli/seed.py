@@ -0,0 +1,302 @@
+"""Bulk-load a deterministic synthetic dataset with COPY.
+
+    python -m app.cli.seed --scale 5 --seed 42 --truncate
+
+Scale 1 is roughly 10k profiles, 2k groups, 150k sessions and 600k time logs; the loader streams
+rows in chunks, so memory stays flat as the scale grows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import math
+import random
+import time
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import asyncpg
+
+from app.core.config import get_settings
+from app.core.database import asyncpg_dsn
+
+TIMEZONES = (
+    "America/New_York",
+    "America/Chicago",
+    "America/Los_Angeles",
+    "Europe/London",
+    "Europe/Berlin",
+    "Asia/Kolkata",
+    "Asia/Tokyo",
+    "Australia/Sydney",
+)
+
+# Group names and descriptions are assembled from these so that search sees a realistic mix of
+# rare words (subjects), common ones (nouns) and free text.
+NAME_ADJECTIVES = (
+    "Early", "Late-night", "Weekend", "Focused", "Quiet", "Daily", "Sunday", "Midterm", "Finals", "Summer",
+    "Deep-work", "Pomodoro", "Lunchtime", "Morning", "Evening", "Accountability", "Silent", "Global", "Campus",
+    "Remote",
+)
+NAME_SUBJECTS = (
+    "Organic Chemistry", "Calculus", "Linear Algebra", "Statistics", "Physics", "Biology", "Genetics",
+    "Microeconomics", "Macroeconomics", "Accounting", "Finance", "Marketing", "Psychology", "Sociology",
+    "Philosophy", "History", "Literature", "Spanish", "French", "German", "Japanese", "Mandarin", "Latin",
+    "Python", "Java", "Algorithms", "Data Structures", "Machine Learning", "Databases", "Networking",
+    "Operating Systems", "Compilers", "Cybersecurity", "Web Development", "Design", "Architecture",
+    "Anatomy", "Pharmacology", "Nursing", "Law", "MCAT", "LSAT", "GRE", "GMAT", "SAT", "Thesis", "Writing",
+    "Music Theory", "Piano", "Guitar", "Painting", "Drawing", "Astronomy", "Geology", "Ecology",
+    "Neuroscience", "Quantum Mechanics", "Thermodynamics", "Electronics", "Robotics",
+)
+NAME_NOUNS = (
+    "Crew", "Club", "Squad", "Circle", "Study Group", "Sprint", "Bootcamp", "Grind", "Sessions", "Lab",
+    "Collective", "Pod", "Hour", "Marathon", "Challenge",
+)
+DESCRIPTION_TEMPLATES = (
+    "We meet to review {subject} problem sets and keep each other on track.",
+    "Cramming {subject} before the exam. Cameras optional, focus mandatory.",
+    "{subject} reading and note-taking, {period} check-ins.",
+    "Accountability group for anyone grinding through {subject}.",
+    "Past papers, flashcards and practice questions for {subject}.",
+    "Open to all levels: bring your {subject} homework and a timer.",
+)
+
+
+# Parent tables first: flushing in this order keeps foreign keys satisfied with triggers enabled.
+TABLE_COLUMNS: dict[str, tuple[str, ...]] = {
+    "profiles": ("id", "email", "display_name", "created_at", "updated_at"),
+    "auth_identities": ("id", "provider", "subject", "profile_id"),
+    "groups": (
+        "id", "owner_id", "name", "description", "start_at", "end_at", "timezone",
+        "period", "period_target_minutes", "status", "created_at", "updated_at",
+    ),
+    "group_members": ("id", "group_id", "user_id", "role", "override_period_target_minutes", "created_at"),
+    "sessions": ("id", "group_id", "creator_id", "status", "started_at", "ended_at", "created_at"),
+    "session_participants": ("id", "session_id", "user_id", "role"),
+    "time_logs": ("id", "participant_id", "started_at", "ended_at", "created_at"),
+    "notifications": ("id", "recipient_id", "kind", "status", "title", "body", "group_id", "created_at", "read_at"),
+}
+
+
+@dataclass
+class ScaleConfig:
+    profiles: int
+    groups: int
+    sessions_per_member: float
+    max_group_size: int
+    notifications_per_profile: float
+
+    @classmethod
+    def for_scale(cls, scale: float) -> ScaleConfig:
+        return cls(
+            profiles=max(10, int(10_000 * scale)),
+            groups=max(2, int(2_000 * scale)),
+            sessions_per_member=8.0,
+            max_group_size=5_000,
+            notifications_per_profile=6.0,
+        )
+
+
+class Generator:
+    def __init__(self, config: ScaleConfig, seed: int, now: datetime) -> None:
+        self.config = config
+        self.rng = random.Random(seed)
+        self.now = now
+        self.profile_ids: list[uuid.UUID] = []
+
+    def uuid(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def profiles(self) -> Iterable[tuple[str, tuple]]:
+        for index in range(self.config.profiles):
+            profile_id = self.uuid()
+            self.profile_ids.append(profile_id)
+            created = self.now - timedelta(days=self.rng.uniform(0, 365))
+            yield "profiles", (profile_id, f"user{index}@synthetic.lockin", f"User {index}", created, created)
+            yield "auth_identities", (self.uuid(), "cognito", f"synthetic-{index}", profile_id)
+
+    def group_size(self) -> int:
+        # Heavy tail: mostly study pods of 2-8, occasionally a lecture-sized group.
+        return min(self.config.max_group_size, len(self.profile_ids), max(2, int(2 * self.rng.paretovariate(1.2))))
+
+    def groups(self) -> Iterable[tuple[str, tuple]]:
+        rng = self.rng
+        for _ in range(self.config.groups):
+            group_id = self.uuid()
+            start_at = self.now - timedelta(days=rng.uniform(0, 180))
+            end_at = start_at + timedelta(days=rng.choice((7, 14, 30, 60, 90, 120)))
+            tz = rng.choice(TIMEZONES)
+            period = "daily" if rng.random() < 0.7 else "weekly"
+            target = rng.choice((30, 45, 60, 90, 120)) * (1 if period == "daily" else 5)
+            members = rng.sample(self.profile_ids, self.group_size())
+            owner = members[0]
+            subject = rng.choice(NAME_SUBJECTS)
+            name = f"{rng.choice(NAME_ADJECTIVES)} {subject} {rng.choice(NAME_NOUNS)}"
+            description = None
+            if rng.random() < 0.7:
+                description = rng.choice(DESCRIPTION_TEMPLATES).format(subject=subject, period=period)
+            yield "groups", (
+                group_id, owner, name, description, start_at, end_at, tz,
+                period, target, "active", start_at, start_at,
+            )
+            for position, user_id in enumerate(members):
+                role = "owner" if position == 0 else ("admin" if rng.random() < 0.05 else "member")
+                override = rng.choice((None, None, None, 45, 90))
+                yield "group_members", (self.uuid(), group_id, user_id, role, override, start_at)
+            yield from self.sessions(group_id, members, start_at, min(end_at, self.now))
+            for user_id in members[1:]:
+                if rng.random() < 0.3:
+                    yield "notifications", self.notification(user_id, group_id, "group_invite", start_at)
+
+    def sessions(self, group_id, members, start_at: datetime, end_at: datetime) -> Iterable[tuple[str, tuple]]:
+        rng = self.rng
+        span = (end_at - start_at).total_seconds()
+        if span <= 0:
+            return
+        count = int(len(members) * self.config.sessions_per_member * rng.uniform(0.5, 1.5))
+        for _ in range(count):
+            session_id = self.uuid()
+            started = start_at + timedelta(seconds=rng.uniform(0, span))
+            length = timedelta(minutes=rng.randint(20, 180))
+            ended = started + length
+            host = rng.choice(members)
+            yield "sessions", (session_id, group_id, host, "ended", started, ended, started)
+            attendees = {host, *rng.sample(members, min(len(members), rng.randint(0, 3)))}
+            for user_id in attendees:
+                participant_id = self.uuid()
+                yield "session_participants", (participant_id, session_id, user_id, "host" if user_id == host else "participant")
+                cursor = started
+                for _ in range(rng.randint(1, 3)):
+                    remaining = (ended - cursor).total_seconds()
+                    if remaining < 60:
+                        break
+                    log_start = cursor + timedelta(seconds=rng.uniform(0, remaining / 3))
+                    log_end = min(ended, log_start + timedelta(seconds=rng.uniform(60, remaining)))
+                    yield "time_logs", (self.uuid(), participant_id, log_start, log_end, log_end)
+                    cursor = log_end
+
+    def notification(self, recipient, group_id, kind: str, created: datetime) -> tuple:
+        statuses = ("pending", "read", "accepted", "declined") if kind == "group_invite" else ("pending", "read")
+        status = self.rng.choice(statuses)
+        read_at = None if status == "pending" else created + timedelta(hours=self.rng.uniform(0, 48))
+        return (self.uuid(), recipient, kind, status, kind.replace("_", " ").capitalize(), None, group_id, created, read_at)
+
+    def generic_notifications(self) -> Iterable[tuple[str, tuple]]:
+        per_profile = self.config.notifications_per_profile
+        for profile_id in self.profile_ids:
+            for _ in range(int(self.rng.expovariate(1 / per_profile))):
+                created = self.now - timedelta(days=self.rng.uniform(0, 120))
+                kind = self.rng.choice(("milestone_member", "milestone_group", "session_reminder", "generic"))
+                yield "notifications", self.notification(profile_id, None, kind, created)
+
+
+class CopyLoader:
+    def __init__(self, connection: asyncpg.Connection, chunk_size: int) -> None:
+        self.connection = connection
+        self.chunk_size = chunk_size
+        self.buffers: dict[str, list[tuple]] = {table: [] for table in TABLE_COLUMNS}
+        self.counts: dict[str, int] = dict.fromkeys(TABLE_COLUMNS, 0)
+
+    async def add(self, rows: Iterable[tuple[str, tuple]]) -> None:
+        for table, row in rows:
+            buffer = self.buffers[table]
+            buffer.append(row)
+            if len(buffer) >= self.chunk_size:
+                await self.flush()
+
+    async def flush(self) -> None:
+        for table, columns in TABLE_COLUMNS.items():
+            rows = self.buffers[table]
+            if rows:
+                await self.connection.copy_records_to_table(table, records=rows, columns=columns)
+                self.counts[table] += len(rows)
+                self.buffers[table] = []
+
+
+async def seed(args: argparse.Namespace) -> None:
+    config = ScaleConfig.for_scale(args.scale)
+    if args.profiles:
+        config.profiles = args.profiles
+    if args.groups:
+        config.groups = args.groups
+    if args.sessions_per_member is not None:
+        config.sessions_per_member = args.sessions_per_member
+    if args.max_group_size:
+        config.max_group_size = args.max_group_size
+
+    database_url = args.database_url or get_settings().database_url
+    connection = await asyncpg.connect(asyncpg_dsn(database_url))
+    started = time.perf_counter()
+    try:
+        async with connection.transaction():
+            if args.skip_triggers:
+                # Skips FK and integrity triggers for speed; requires superuser.
+                await connection.execute("SET LOCAL session_replication_role = replica")
+            if args.truncate:
+                await connection.execute(f"TRUNCATE {', '.join(TABLE_COLUMNS)} CASCADE")
+            now = args.now or datetime.now(timezone.utc).replace(microsecond=0)
+            generator = Generator(config, args.seed, now)
+            loader = CopyLoader(connection, args.chunk_size)
+            await loader.add(generator.profiles())
+            await loader.add(generator.groups())
+            await loader.add(generator.generic_notifications())
+            await loader.flush()
+            archived = await connection.execute(
+                "UPDATE groups SET status = 'archived' WHERE end_at <= $1 AND status <> 'archived'", now
+            )
+            if args.skip_triggers:
+                # Nothing kept the groups' activity counters and versions or queued their periods
+                # for sealing; the backfill bumps the version of every group it counts.
+                await connection.execute("SELECT backfill_group_counters()")
+                await connection.execute(
+                    "INSERT INTO group_rollup_queue (group_id) "
+                    "SELECT g.id FROM groups g WHERE g.summarized_at IS NULL "
+                    "AND NOT EXISTS (SELECT 1 FROM group_period_rollups r WHERE r.group_id = g.id) "
+                    "ON CONFLICT (group_id) DO NOTHING"
+                )
+        # VACUUM too: the archive UPDATE above leaves a dead tuple per archived group in every
+        # index, including the partial ones that exclude archived groups.
+        await connection.execute("VACUUM ANALYZE")
+    finally:
+        await connection.close()
+
+    elapsed = time.perf_counter() - started
+    for table, count in loader.counts.items():
+        print(f"{table:>22}: {count:>12,}")
+    print(f"{'archived groups':>22}: {int(archived.split()[-1]):>12,}")
+    total = sum(loader.counts.values())
+    print(f"loaded {total:,} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier for the default row counts")
+    parser.add_argument("--seed", type=int, default=42, help="random seed; same seed, scale and --now give the same data")
+    parser.add_argument(
+        "--now", type=datetime.fromisoformat, help="anchor timestamp (ISO 8601, with offset); defaults to the current time"
+    )
+    parser.add_argument("--profiles", type=int, help="override the number of profiles")
+    parser.add_argument("--groups", type=int, help="override the number of groups")
+    parser.add_argument("--sessions-per-member", type=float, help="mean sessions hosted per membership")
+    parser.add_argument("--max-group-size", type=int, help="cap on members per group (default 5000)")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="rows buffered per table before COPY")
+    parser.add_argument("--truncate", action="store_true", help="empty the tables before loading")
+    parser.add_argument("--skip-triggers", action="store_true", help="load with session_replication_role=replica")
+    parser.add_argument("--database-url", help="defaults to LOCKIN_DATABASE_URL")
+    args = parser.parse_args(argv)
+    if args.scale <= 0 or math.isnan(args.scale):
+        parser.error("--scale must be positive")
+    if args.now is not None and args.now.tzinfo is None:
+        parser.error("--now needs a UTC offset")
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
+    asyncio.run(seed(parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
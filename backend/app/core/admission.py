@@ -0,0 +1,229 @@
+"""Admission control: per-profile token buckets and a global limit on concurrent DB-bound requests.
+
+Both shed load at the edge (429 / 503 with ``Retry-After``) instead of letting requests pile up
+behind the connection pool until ``db_pool_timeout`` fails them deep inside ``get_db``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Protocol
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import get_settings
+from app.core.database import get_rate_limit_engine
+from app.core.metrics import Histogram
+
+
+# ---------- rate limiting ----------
+class BucketBackend(Protocol):
+    async def take(self, key: str, *, rate: float, burst: float, cost: float = 1.0) -> float:
+        """Spend ``cost`` tokens from ``key``'s bucket; 0 when admitted, else seconds until it would be."""
+        ...
+
+
+class LocalBuckets:
+    """Per-process buckets; the least recently used are dropped (i.e. refilled) past ``max_keys``."""
+
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def take(self, key: str, *, rate: float, burst: float, cost: float = 1.0) -> float:
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        wait = 0.0
+        if tokens >= cost:
+            tokens -= cost
+        else:
+            wait = (cost - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+_REFILLED = (
+    "LEAST(CAST(:burst AS float8), b.tokens + EXTRACT(EPOCH FROM now() - b.updated_at) * CAST(:rate AS float8))"
+)
+_TAKE = text(
+    f"""
+    INSERT INTO rate_limit_buckets AS b (key, tokens, admitted, updated_at)
+    VALUES (:key, CAST(:burst AS float8) - CAST(:cost AS float8), true, now())
+    ON CONFLICT (key) DO UPDATE SET
+      admitted   = {_REFILLED} >= CAST(:cost AS float8),
+      tokens     = CASE WHEN {_REFILLED} >= CAST(:cost AS float8) THEN {_REFILLED} - CAST(:cost AS float8)
+                        ELSE {_REFILLED} END,
+      updated_at = now()
+    RETURNING admitted, tokens
+    """
+)
+_PURGE = text("DELETE FROM rate_limit_buckets WHERE updated_at < now() - make_interval(secs => :idle)")
+
+
+class PostgresBuckets:
+    """Buckets in the UNLOGGED ``rate_limit_buckets`` table, shared by every API worker.
+
+    One upsert per request on the primary, over a small pool of its own
+    (``rate_limit_pool_size``); meant for small multi-worker deployments until a dedicated store
+    is warranted.
+    """
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine
+
+    async def take(self, key: str, *, rate: float, burst: float, cost: float = 1.0) -> float:
+        async with self.engine.begin() as connection:
+            result = await connection.execute(_TAKE, {"key": key, "rate": rate, "burst": burst, "cost": cost})
+            admitted, tokens = result.one()
+        return 0.0 if admitted else (cost - tokens) / rate
+
+
+async def purge_idle_buckets(session, *, idle_seconds: float) -> int:
+    """Drop shared buckets that have refilled completely; they behave exactly like missing ones."""
+    result = await session.execute(_PURGE, {"idle": idle_seconds})
+    await session.commit()
+    return result.rowcount or 0
+
+
+class RateLimiter:
+    def __init__(self, backend: BucketBackend, *, rate: float, burst: float) -> None:
+        self.backend = backend
+        self.rate = rate
+        self.burst = burst
+        self.allowed = 0
+        self.limited = 0
+
+    async def check(self, key: str, cost: float = 1.0) -> float:
+        """0 when the request may proceed, else the ``Retry-After`` in seconds."""
+        wait = await self.backend.take(key, rate=self.rate, burst=self.burst, cost=cost)
+        if wait:
+            self.limited += 1
+        else:
+            self.allowed += 1
+        return wait
+
+
+@lru_cache
+def get_rate_limiter() -> RateLimiter | None:
+    settings = get_settings()
+    if not settings.rate_limit_enabled:
+        return None
+    backend = PostgresBuckets(get_rate_limit_engine()) if settings.rate_limit_shared else LocalBuckets()
+    return RateLimiter(backend, rate=settings.rate_limit_per_second, burst=settings.rate_limit_burst)
+
+
+# ---------- DB concurrency ----------
+class Overloaded(Exception):
+    def __init__(self, reason: str, retry_after: float) -> None:
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimiter:
+    """At most ``limit`` DB-bound requests at once; the rest queue for up to ``queue_timeout``."""
+
+    def __init__(self, limit: int, *, queue_timeout: float, max_queue: int) -> None:
+        self.limit = limit
+        self.queue_timeout = queue_timeout
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(limit)
+        self.active = 0
+        self.waiting = 0
+        self.shed: dict[str, int] = {"queue_full": 0, "timeout": 0}
+        self.wait_seconds = Histogram()
+
+    async def acquire(self) -> None:
+        if self._semaphore.locked():
+            if self.waiting >= self.max_queue:
+                self.shed["queue_full"] += 1
+                raise Overloaded("queue_full", self.queue_timeout)
+            started = time.perf_counter()
+            self.waiting += 1
+            try:
+                async with asyncio.timeout(self.queue_timeout):
+                    await self._semaphore.acquire()
+            except TimeoutError:
+                self.shed["timeout"] += 1
+                raise Overloaded("timeout", self.queue_timeout) from None
+            finally:
+                self.waiting -= 1
+            self.wait_seconds.observe(time.perf_counter() - started)
+        else:
+            await self._semaphore.acquire()
+            self.wait_seconds.observe(0.0)
+        self.active += 1
+
+    async def try_acquire(self) -> bool:
+        """Take a slot only if one is free now, without queueing behind anyone."""
+        if self._semaphore.locked():
+            return False
+        await self._semaphore.acquire()  # returns at once: nothing runs between the check and here
+        self.active += 1
+        return True
+
+    def release(self) -> None:
+        self.active -= 1
+        self._semaphore.release()
+
+
+class Slot:
+    """One request's hold on the limiter; long-polls release it while parked and fan-out
+    handlers borrow extra slots for their parallel reads."""
+
+    def __init__(self, limiter: ConcurrencyLimiter) -> None:
+        self.limiter = limiter
+        self.held = False
+
+    async def acquire(self) -> None:
+        await self.limiter.acquire()
+        self.held = True
+
+    def release(self) -> None:
+        if self.held:
+            self.held = False
+            self.limiter.release()
+
+    @asynccontextmanager
+    async def parked(self) -> AsyncIterator[None]:
+        self.release()
+        try:
+            yield
+        finally:
+            await self.acquire()
+
+    @asynccontextmanager
+    async def extra(self, wanted: int) -> AsyncIterator[int]:
+        """Up to ``wanted`` more slots, of those free right now; yields how many were taken.
+
+        Never waits: a request that queued for more slots while holding one could deadlock with
+        others doing the same, so under load the caller just gets less parallelism.
+        """
+        taken = 0
+        try:
+            while taken < wanted and await self.limiter.try_acquire():
+                taken += 1
+            yield taken
+        finally:
+            for _ in range(taken):
+                self.limiter.release()
+
+
+@lru_cache
+def get_db_limiter() -> ConcurrencyLimiter:
+    settings = get_settings()
+    limit = settings.db_max_concurrent_requests or settings.db_pool_size + settings.db_max_overflow
+    return ConcurrencyLimiter(
+        limit,
+        queue_timeout=settings.db_queue_timeout_seconds,
+        max_queue=settings.db_max_queued_requests,
+    )
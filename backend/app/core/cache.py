@@ -0,0 +1,231 @@
+"""Versioned response caches for read-heavy representations.
+
+Keys embed the version counters that triggers bump on every write (see ``group_versions`` in
+schema.sql), so an entry never needs invalidating: a write moves readers to a new key and the
+old one ages out of the LRU. Values are finished JSON bodies, which makes them cheap to size,
+safe to share between requests and portable to an out-of-process store.
+
+Each ``ResponseCache`` keeps a size-bounded in-process LRU and, optionally, a shared tier
+(``PostgresStore``) so that several API workers reuse each other's work. Concurrent misses for
+the same key are coalesced: one request computes, the others await its result.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Protocol
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import get_settings
+from app.core.database import get_engine
+
+logger = logging.getLogger(__name__)
+
+
+class CacheStore(Protocol):
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes) -> None: ...
+
+
+class LRUStore:
+    """In-process LRU bounded by the total size of its values, not by entry count."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> bytes | None:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size -= len(previous)
+        self._entries[key] = value
+        self.size += len(value)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+
+_SHARED_GET = text(
+    "SELECT value FROM response_cache WHERE key = :key AND stored_at > now() - make_interval(secs => :ttl)"
+)
+_SHARED_SET = text(
+    """
+    INSERT INTO response_cache (key, value, stored_at) VALUES (:key, :value, now())
+    ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, stored_at = EXCLUDED.stored_at
+    """
+)
+_SHARED_PURGE = text("DELETE FROM response_cache WHERE stored_at < now() - make_interval(secs => :ttl)")
+
+
+class PostgresStore:
+    """Shared tier in the UNLOGGED ``response_cache`` table, visible to every API worker.
+
+    Always talks to the primary: replicas are read-only and lag would only cost hit rate.
+    """
+
+    def __init__(self, engine: AsyncEngine, ttl: timedelta) -> None:
+        self.engine = engine
+        self.ttl_seconds = ttl.total_seconds()
+
+    async def get(self, key: str) -> bytes | None:
+        async with self.engine.connect() as connection:
+            value = await connection.scalar(_SHARED_GET, {"key": key, "ttl": self.ttl_seconds})
+        return bytes(value) if value is not None else None
+
+    async def set(self, key: str, value: bytes) -> None:
+        async with self.engine.begin() as connection:
+            await connection.execute(_SHARED_SET, {"key": key, "value": value})
+
+
+async def purge_shared_entries(session, *, older_than: timedelta) -> int:
+    result = await session.execute(_SHARED_PURGE, {"ttl": older_than.total_seconds()})
+    await session.commit()
+    return result.rowcount or 0
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    shared_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+
+
+caches: dict[str, ResponseCache] = {}
+
+
+class ResponseCache:
+    """Options left as ``None`` are read from settings on first use, so routers can create their
+    caches at import time without loading configuration; the shared tier is added when
+    ``response_cache_shared`` is set.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_bytes: int | None = None,
+        shared: CacheStore | None = None,
+        enabled: bool | None = None,
+    ) -> None:
+        self.name = name
+        self.local = LRUStore(max_bytes or 0)
+        self.shared = shared
+        self.enabled = enabled
+        self._configured = max_bytes is not None and enabled is not None
+        self.stats = CacheStats()
+        self._inflight: dict[str, asyncio.Future[bytes]] = {}
+        caches[name] = self
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[bytes]]) -> bytes:
+        """Cached body for ``key``, running ``compute`` at most once across concurrent callers."""
+        if not self._configured:
+            self._configure()
+        if not self.enabled:
+            return await compute()
+        key = f"{self.name}:{key}"
+
+        value = await self.local.get(key)
+        if value is not None:
+            self.stats.hits += 1
+            return value
+
+        while (pending := self._inflight.get(key)) is not None:
+            self.stats.coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # The computing request went away (client disconnect); take over unless we were
+                # the one cancelled.
+                if not pending.cancelled():
+                    raise
+
+        future: asyncio.Future[bytes] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._shared_get(key)
+            if value is not None:
+                self.stats.shared_hits += 1
+            else:
+                self.stats.misses += 1
+                value = await compute()
+                await self._shared_set(key, value)
+            await self.local.set(key, value)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # waiters re-raise it; don't log it as never retrieved
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def _configure(self) -> None:
+        settings = get_settings()
+        if self.enabled is None:
+            self.enabled = settings.response_cache_enabled
+        if not self.local.max_bytes:
+            self.local.max_bytes = settings.response_cache_max_bytes
+        if self.shared is None and settings.response_cache_shared:
+            self.shared = PostgresStore(get_engine(), timedelta(seconds=settings.response_cache_shared_ttl_seconds))
+        self._configured = True
+
+    # The shared tier is an optimisation: when it is unreachable, fall back to computing locally.
+    async def _shared_get(self, key: str) -> bytes | None:
+        if self.shared is None:
+            return None
+        try:
+            return await self.shared.get(key)
+        except Exception:
+            logger.warning("shared cache read failed for %s", self.name, exc_info=True)
+            return None
+
+    async def _shared_set(self, key: str, value: bytes) -> None:
+        if self.shared is None:
+            return
+        try:
+            await self.shared.set(key, value)
+        except Exception:
+            logger.warning("shared cache write failed for %s", self.name, exc_info=True)
+
+    def snapshot(self) -> dict[str, int]:
+        return {
+            "hits": self.stats.hits,
+            "shared_hits": self.stats.shared_hits,
+            "misses": self.stats.misses,
+            "coalesced": self.stats.coalesced,
+            "entries": len(self.local),
+            "bytes": self.local.size,
+            "evictions": self.local.evictions,
+        }
+
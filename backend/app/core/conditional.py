@@ -0,0 +1,73 @@
+"""Conditional GET helpers: weak ETags and ``Last-Modified`` derived from version counters."""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+@dataclass(frozen=True)
+class Validators:
+    etag: str
+    last_modified: datetime | None = None
+
+    @classmethod
+    def build(cls, *parts: object, last_modified: datetime | None = None) -> Validators:
+        """Weak ETag over ``parts``, which must cover everything the representation depends on."""
+        digest = hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=12).hexdigest()
+        return cls(etag=f'W/"{digest}"', last_modified=last_modified)
+
+    def headers(self) -> dict[str, str]:
+        headers = {"ETag": self.etag, "Cache-Control": "private, no-cache"}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified.astimezone(timezone.utc), usegmt=True)
+        return headers
+
+
+def query_variant(request: Request) -> str:
+    """Canonical query string, so ``?a=1&b=2`` and ``?b=2&a=1`` share an ETag."""
+    return "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_fresh(request: Request, validators: Validators) -> bool:
+    """True when the client's cached copy is current (RFC 9110 §13.2.2: If-None-Match wins)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        current = _opaque(validators.etag)
+        return any(_opaque(tag) == current for tag in if_none_match.split(","))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and validators.last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return validators.last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def not_modified(validators: Validators) -> Response:
+    return Response(status_code=304, headers=validators.headers())
+
+
+def attach(result: Any, response: Response, validators: Validators | None) -> Any:
+    """Set validator headers on ``result`` if it is a Response, else on the injected ``response``."""
+    if validators is not None:
+        target = result if isinstance(result, Response) else response
+        target.headers.update(validators.headers())
+    return result
@@ -10,10 +10,65 @@ class Settings(BaseSettings):
     debug: bool = False
     allow_anonymous: bool = False
     database_url: str
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = 100
+    db_warmup_connections: int = 0
+    db_max_concurrent_requests: int | None = None  # default: db_pool_size + db_max_overflow
+    db_queue_timeout_seconds: float = 5.0
+    db_max_queued_requests: int = 200
+    warmup_jwks: bool = False
+    warmup_schemas: bool = False
+    database_replica_url: str | None = None
+    replica_max_lag_seconds: float = 5.0
+    replica_lag_check_interval: float = 2.0
+    read_your_writes_seconds: float = 5.0
+    slow_request_ms: float = 500.0
+    query_repeat_threshold: int = 5
+    readiness_timeout_seconds: float = 2.0
+    profiling_admin_token: str | None = None
+    profiling_sample_rate: float = 0.0
+    profiling_interval_ms: float = 5.0
+    profiling_output_dir: str = "profiles"
+    profiling_max_files: int = 200
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024
+    response_cache_enabled: bool = True
+    response_cache_max_bytes: int = 16 * 1024 * 1024
+    response_cache_shared: bool = False
+    response_cache_shared_ttl_seconds: int = 600
+    rate_limit_enabled: bool = True
+    rate_limit_per_second: float = 10.0
+    rate_limit_burst: int = 50
+    rate_limit_shared: bool = False
+    rate_limit_pool_size: int = 2
     aws_region: str | None = None
     cognito_user_pool_id: str | None = None
     cognito_app_client_id: str | None = None
     s3_bucket: str | None = None
+    s3_endpoint_url: str | None = None  # S3-compatible stand-in for local runs
+    s3_public_base_url: str | None = None  # CDN in front of the bucket; default: the bucket URL
+    avatar_max_upload_bytes: int = 10 * 1024 * 1024
+    avatar_max_pixels: int = 40_000_000
+    avatar_upload_expires_seconds: int = 300
+    avatar_thumbnail_size: int = 256
+    avatar_thumbnail_quality: int = 85
+    avatar_worker_enabled: bool = True
+    avatar_worker_poll_seconds: float = 5.0
+    avatar_worker_max_attempts: int = 3
+    notification_listen: bool = False
+    notification_retention_days: int = 90
+    notification_retention_archive: bool = False
+    notification_purge_batch_size: int = 500
+    maintenance_enabled: bool = True
+    maintenance_interval_seconds: int = 300
+    maintenance_batch_size: int = 500
+    cold_storage_grace_days: int = 30
+    cold_storage_batch_size: int = 20
+    period_rollup_batch_size: int = 200
 
 
 @lru_cache
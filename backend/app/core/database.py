@@ -1,16 +1,236 @@
+import asyncio
+import logging
+import time
+import uuid
 from collections.abc import AsyncGenerator
+from functools import lru_cache
 
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session as OrmSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import get_settings
+from app.core.metrics import Histogram
 
-settings = get_settings()
+logger = logging.getLogger(__name__)
 
-engine: AsyncEngine = create_async_engine(settings.database_url, echo=settings.debug, future=True)
-async_session_factory = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+pool_wait_seconds = Histogram()
+replica_pool_wait_seconds = Histogram()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited (including connect and pre-ping)."""
+
+    wait_histogram = pool_wait_seconds
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            self.wait_histogram.observe(time.perf_counter() - started)
+
+
+class ReplicaQueuePool(InstrumentedQueuePool):
+    wait_histogram = replica_pool_wait_seconds
+
+
+def _create_engine(
+    url: str,
+    poolclass: type[AsyncAdaptedQueuePool],
+    *,
+    pool_size: int | None = None,
+    max_overflow: int | None = None,
+) -> AsyncEngine:
+    settings = get_settings()
+    connect_args: dict[str, object] = {"prepared_statement_cache_size": settings.db_statement_cache_size}
+    if settings.notification_listen:
+        # notify_notification_insert() only calls pg_notify where this is on
+        connect_args["server_settings"] = {"lockin.notify_listen": "on"}
+    return create_async_engine(
+        url,
+        echo=settings.debug,
+        future=True,
+        poolclass=poolclass,
+        pool_size=settings.db_pool_size if pool_size is None else pool_size,
+        max_overflow=settings.db_max_overflow if max_overflow is None else max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args=connect_args,
+    )
+
+
+# Engines are built on first use: importing the app neither reads the database URL nor loads
+# the asyncpg dialect, which keeps cold starts and tooling imports (OpenAPI export, CLIs) cheap.
+@lru_cache
+def get_engine() -> AsyncEngine:
+    return _create_engine(get_settings().database_url, InstrumentedQueuePool)
+
+
+@lru_cache
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(get_engine(), expire_on_commit=False, autoflush=False)
+
+
+@lru_cache
+def get_replica_engine() -> AsyncEngine | None:
+    url = get_settings().database_replica_url
+    return _create_engine(url, ReplicaQueuePool) if url else None
+
+
+@lru_cache
+def get_replica_session_factory() -> async_sessionmaker[AsyncSession] | None:
+    replica = get_replica_engine()
+    return async_sessionmaker(replica, expire_on_commit=False, autoflush=False) if replica is not None else None
+
+
+@lru_cache
+def get_rate_limit_engine() -> AsyncEngine:
+    """A few connections of its own for the shared rate-limit buckets.
+
+    The bucket upsert runs while the request's ``get_db`` session holds a pooled connection, so
+    taking a second one from the main pool could leave every admitted request waiting on another.
+    """
+    settings = get_settings()
+    return _create_engine(
+        settings.database_url, AsyncAdaptedQueuePool, pool_size=settings.rate_limit_pool_size, max_overflow=0
+    )
+
+
+async def dispose_engines() -> None:
+    """Close the pooled connections of whichever engines were created."""
+    for getter in (get_engine, get_replica_engine, get_rate_limit_engine):
+        if getter.cache_info().currsize:
+            target = getter()
+            if target is not None:
+                await target.dispose()
+
+
+def asyncpg_dsn(database_url: str) -> str:
+    """Plain ``postgresql://`` DSN for talking to asyncpg directly (LISTEN, COPY)."""
+    return make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    async with async_session_factory() as session:
+    async with get_session_factory()() as session:
         yield session
 
+
+# ---------- read-your-writes ----------
+# Sessions tagged with info["profile_id"] (see get_current_user) mark that profile as a recent
+# writer when they commit a flush; its reads stay on the primary for read_your_writes_seconds.
+_PROFILE_KEY = "profile_id"
+_WROTE_KEY = "lockin_wrote"
+_recent_writers: dict[uuid.UUID, float] = {}
+
+
+@event.listens_for(OrmSession, "after_flush")
+def _flag_write(session, flush_context) -> None:
+    session.info[_WROTE_KEY] = True
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _record_writer(session) -> None:
+    if session.info.pop(_WROTE_KEY, False):
+        profile_id = session.info.get(_PROFILE_KEY)
+        if profile_id is not None:
+            note_write(profile_id)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _clear_write(session) -> None:
+    session.info.pop(_WROTE_KEY, None)
+
+
+def tag_session_profile(session: AsyncSession, profile_id: uuid.UUID) -> None:
+    session.info[_PROFILE_KEY] = profile_id
+
+
+def note_write(profile_id: uuid.UUID) -> None:
+    now = time.monotonic()
+    _recent_writers[profile_id] = now
+    if len(_recent_writers) > 10_000:
+        horizon = now - get_settings().read_your_writes_seconds
+        for key in [key for key, at in _recent_writers.items() if at < horizon]:
+            del _recent_writers[key]
+
+
+def wrote_recently(profile_id: uuid.UUID) -> bool:
+    wrote_at = _recent_writers.get(profile_id)
+    return wrote_at is not None and time.monotonic() - wrote_at < get_settings().read_your_writes_seconds
+
+
+# ---------- replica health ----------
+_REPLICA_LAG = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+    "THEN 0 ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+_replica_checked_at = float("-inf")
+_replica_lag_seconds: float | None = None
+_replica_check_lock = asyncio.Lock()
+
+
+async def replica_lag_seconds() -> float | None:
+    """Cached replica lag; ``None`` when the replica is unreachable or not configured."""
+    global _replica_checked_at, _replica_lag_seconds
+    replica_engine = get_replica_engine()
+    if replica_engine is None:
+        return None
+    settings = get_settings()
+    if time.monotonic() - _replica_checked_at < settings.replica_lag_check_interval:
+        return _replica_lag_seconds
+    async with _replica_check_lock:
+        if time.monotonic() - _replica_checked_at >= settings.replica_lag_check_interval:
+            try:
+                async with replica_engine.connect() as connection:
+                    lag = await asyncio.wait_for(connection.scalar(_REPLICA_LAG), settings.replica_lag_check_interval)
+                _replica_lag_seconds = float(lag or 0)
+            except Exception:
+                logger.warning("Replica lag check failed; routing reads to the primary", exc_info=True)
+                _replica_lag_seconds = None
+            _replica_checked_at = time.monotonic()
+    return _replica_lag_seconds
+
+
+async def replica_available() -> bool:
+    lag = await replica_lag_seconds()
+    return lag is not None and lag <= get_settings().replica_max_lag_seconds
+
+
+async def warm_up_pool(connections: int) -> None:
+    """Open ``connections`` pooled connections up front so the first requests skip the handshake."""
+
+    async def _touch(target: AsyncEngine) -> None:
+        async with target.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    count = min(connections, get_settings().db_pool_size)
+    replica_engine = get_replica_engine()
+    targets = [get_engine()] if replica_engine is None else [get_engine(), replica_engine]
+    await asyncio.gather(*(_touch(target) for target in targets for _ in range(count)))
+
+
+def _engine_pool_stats(target: AsyncEngine, histogram: Histogram) -> dict[str, object]:
+    pool = target.sync_engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "max_overflow": get_settings().db_max_overflow,
+        "wait_seconds": histogram.snapshot(),
+    }
+
+
+def pool_stats() -> dict[str, object]:
+    stats = _engine_pool_stats(get_engine(), pool_wait_seconds)
+    replica_engine = get_replica_engine()
+    if replica_engine is not None:
+        stats["replica"] = {
+            **_engine_pool_stats(replica_engine, replica_pool_wait_seconds),
+            "lag_seconds": _replica_lag_seconds,
+        }
+    return stats
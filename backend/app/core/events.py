@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from app.core.database import asyncpg_dsn
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_CHANNEL = "lockin_notifications"
+_LISTEN_RETRY_SECONDS = 5.0
+
+
+class Subscription:
+    def __init__(self, event: asyncio.Event) -> None:
+        self._event = event
+
+    async def wait(self, timeout: float) -> bool:
+        """Park until the key is published or ``timeout`` elapses; True when woken."""
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+class RecipientEventBus:
+    """In-process wakeups keyed by recipient id, used to park long-poll requests."""
+
+    def __init__(self) -> None:
+        self._events: dict[uuid.UUID, asyncio.Event] = {}
+        self._waiters: dict[uuid.UUID, int] = {}
+
+    @contextmanager
+    def subscribe(self, key: uuid.UUID) -> Iterator[Subscription]:
+        # Subscribe before querying so a publish racing the query is never missed.
+        event = self._events.get(key)
+        if event is None:
+            event = self._events[key] = asyncio.Event()
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            yield Subscription(event)
+        finally:
+            remaining = self._waiters[key] - 1
+            if remaining:
+                self._waiters[key] = remaining
+            else:
+                del self._waiters[key]
+                if self._events.get(key) is event:
+                    del self._events[key]
+
+    def publish(self, key: uuid.UUID) -> None:
+        event = self._events.pop(key, None)
+        if event is not None:
+            event.set()
+
+    def waiting(self) -> int:
+        return sum(self._waiters.values())
+
+
+notification_bus = RecipientEventBus()
+
+
+async def listen_for_notifications(database_url: str, bus: RecipientEventBus = notification_bus) -> None:
+    """Relay ``pg_notify`` inserts from other workers onto the local bus until cancelled."""
+    import asyncpg
+
+    def _on_notify(_connection, _pid, _channel, payload: str) -> None:
+        try:
+            bus.publish(uuid.UUID(payload))
+        except ValueError:
+            logger.warning("Ignoring malformed %s payload: %r", NOTIFICATION_CHANNEL, payload)
+
+    dsn = asyncpg_dsn(database_url)
+    while True:
+        try:
+            connection = await asyncpg.connect(dsn)
+        except (OSError, asyncpg.PostgresError):
+            logger.exception("Notification listener could not connect; retrying")
+            await asyncio.sleep(_LISTEN_RETRY_SECONDS)
+            continue
+
+        closed = asyncio.Event()
+        connection.add_termination_listener(lambda _conn: closed.set())
+        try:
+            await connection.add_listener(NOTIFICATION_CHANNEL, _on_notify)
+            await closed.wait()
+            logger.warning("Notification listener connection lost; reconnecting")
+        finally:
+            if not connection.is_closed():
+                await connection.close()
+        await asyncio.sleep(_LISTEN_RETRY_SECONDS)
@@ -0,0 +1,152 @@
+"""Sparse fieldsets: ``?fields=`` picks top-level attributes, ``?include=`` picks relations.
+
+Relations are the nested ``ORMModel`` fields of a read schema, addressed by dotted path
+(``members.user``, ``sessions.participants``); including a path includes its parents. As soon
+as either parameter is given, relations that were not asked for are neither loaded nor
+serialized. Without either parameter the full schema is returned as before.
+"""
+
+from __future__ import annotations
+
+import types
+import typing
+from functools import lru_cache
+from typing import Any
+
+from pydantic import BaseModel, TypeAdapter, create_model
+from sqlalchemy.orm import selectinload
+from starlette.responses import Response
+
+ALWAYS_INCLUDED = frozenset({"id"})
+
+
+def _unwrap(annotation: Any) -> tuple[type[BaseModel] | None, str]:
+    """Nested model behind ``Model``, ``Model | None`` or ``list[Model]`` and which wrapper it was."""
+    origin = typing.get_origin(annotation)
+    if origin is list:
+        (inner,) = typing.get_args(annotation)
+        return (inner, "list") if isinstance(inner, type) and issubclass(inner, BaseModel) else (None, "")
+    if origin in (typing.Union, types.UnionType):
+        members = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        if len(members) == 1 and isinstance(members[0], type) and issubclass(members[0], BaseModel):
+            return members[0], "optional"
+        return None, ""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, "plain"
+    return None, ""
+
+
+@lru_cache(maxsize=None)
+def relations(model: type[BaseModel]) -> dict[str, type[BaseModel]]:
+    return {
+        name: nested
+        for name, field in model.model_fields.items()
+        if (nested := _unwrap(field.annotation)[0]) is not None
+    }
+
+
+def relation_paths(model: type[BaseModel], prefix: str = "") -> set[str]:
+    paths: set[str] = set()
+    for name, nested in relations(model).items():
+        path = f"{prefix}{name}"
+        paths.add(path)
+        paths |= relation_paths(nested, f"{path}.")
+    return paths
+
+
+def _children(include: frozenset[str], name: str) -> frozenset[str]:
+    prefix = f"{name}."
+    return frozenset(path[len(prefix):] for path in include if path.startswith(prefix))
+
+
+@lru_cache(maxsize=256)
+def sparse_model(model: type[BaseModel], fields: frozenset[str] | None, include: frozenset[str]) -> type[BaseModel]:
+    """A copy of ``model`` with only the requested fields; nested relations keep all their scalars."""
+    nested_models = relations(model)
+    definitions: dict[str, Any] = {}
+    for name, field in model.model_fields.items():
+        if name in nested_models:
+            if name not in include:
+                continue
+            child = sparse_model(nested_models[name], None, _children(include, name))
+            wrapper = _unwrap(field.annotation)[1]
+            annotation: Any = list[child] if wrapper == "list" else (child | None if wrapper == "optional" else child)
+        elif fields is not None and name not in fields and name not in ALWAYS_INCLUDED:
+            continue
+        else:
+            annotation = field.annotation
+        definitions[name] = (annotation, field)
+    return create_model(f"Sparse{model.__name__}", __base__=model.__base__, **definitions)
+
+
+@lru_cache(maxsize=256)
+def _adapter(model: type[BaseModel], many: bool) -> TypeAdapter:
+    return TypeAdapter(list[model] if many else model)
+
+
+class FieldSet:
+    def __init__(self, model: type[BaseModel], fields: frozenset[str] | None, include: frozenset[str] | None) -> None:
+        self.model = model
+        self.fields = fields
+        self.include = include
+
+    @classmethod
+    def parse(cls, model: type[BaseModel], fields: str | None, include: str | None) -> FieldSet:
+        """Validate the raw query values against ``model``; unknown names raise ``ValueError``."""
+        known_relations = relation_paths(model)
+        scalars = set(model.model_fields) - set(relations(model))
+
+        selected = None
+        if fields is not None:
+            selected = frozenset(name.strip() for name in fields.split(",") if name.strip())
+            unknown = selected - scalars
+            if unknown:
+                raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+        included = None
+        if include is not None or selected is not None:
+            requested = {path.strip() for path in (include or "").split(",") if path.strip()}
+            unknown = requested - known_relations
+            if unknown:
+                raise ValueError(f"Unknown relations: {', '.join(sorted(unknown))}")
+            # "members.user" implies "members".
+            included = frozenset(
+                ".".join(path.split(".")[: depth + 1]) for path in requested for depth in range(path.count(".") + 1)
+            )
+        return cls(model, selected, included)
+
+    @property
+    def active(self) -> bool:
+        return self.include is not None
+
+    def includes(self, path: str) -> bool:
+        return self.include is None or path in self.include
+
+    def loader_options(self, entity: type) -> list:
+        """``selectinload`` chains for the included relations, mirroring the schema onto ``entity``."""
+        options = []
+
+        def walk(parent_entity: type, parent_loader, include: frozenset[str]) -> None:
+            for name in sorted(path for path in include if "." not in path):
+                attribute = getattr(parent_entity, name)
+                loader = selectinload(attribute) if parent_loader is None else parent_loader.selectinload(attribute)
+                children = _children(include, name)
+                if children:
+                    walk(attribute.property.mapper.class_, loader, children)
+                else:
+                    options.append(loader)
+
+        walk(entity, None, self.include or frozenset())
+        return options
+
+    def dump(self, content: Any) -> bytes:
+        """JSON body for ``content`` under the sparse schema, or the full one when inactive."""
+        model = sparse_model(self.model, self.fields, self.include) if self.active else self.model
+        adapter = _adapter(model, isinstance(content, list))
+        return adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+
+    def render(self, content: Any, *, status_code: int = 200) -> Any:
+        """Serialize with the sparse schema, or hand ``content`` back for the route's ``response_model``."""
+        if not self.active:
+            return content
+        return Response(self.dump(content), status_code=status_code, media_type="application/json")
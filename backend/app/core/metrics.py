@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Sequence
+
+# Seconds; shared by DB pool waits and anything else latency-shaped.
+DEFAULT_BUCKETS: tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram; updated from the event loop thread only, so no locking."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """``(upper_bound, count <= bound)`` pairs ending with ``inf``."""
+        running = 0
+        pairs: list[tuple[float, int]] = []
+        for bound, count in zip((*self.buckets, float("inf")), self._counts):
+            running += count
+            pairs.append((bound, running))
+        return pairs
+
+    def snapshot(self) -> dict[str, object]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": {("+Inf" if bound == float("inf") else str(bound)): n for bound, n in self.cumulative()},
+        }
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+
+def format_sample(name: str, value: float, labels: dict[str, str] | None = None) -> str:
+    return f"{name}{_format_labels(labels or {})} {value}"
+
+
+def format_histogram(name: str, histogram: Histogram, labels: dict[str, str] | None = None) -> list[str]:
+    labels = labels or {}
+    lines = [
+        format_sample(f"{name}_bucket", count, {**labels, "le": "+Inf" if bound == float("inf") else str(bound)})
+        for bound, count in histogram.cumulative()
+    ]
+    lines.append(format_sample(f"{name}_sum", histogram.sum, labels))
+    lines.append(format_sample(f"{name}_count", histogram.count, labels))
+    return lines
+
+
+class RequestMetrics:
+    """Per-route request counts and latency, keyed by route template rather than raw path."""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.requests: dict[tuple[str, str, str], int] = {}
+        self.latency: dict[tuple[str, str], Histogram] = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float) -> None:
+        key = (method, route, str(status))
+        self.requests[key] = self.requests.get(key, 0) + 1
+        histogram = self.latency.get((method, route))
+        if histogram is None:
+            histogram = self.latency[(method, route)] = Histogram()
+        histogram.observe(seconds)
+
+    def render(self) -> list[str]:
+        lines = [
+            "# TYPE lockin_http_requests_in_flight gauge",
+            format_sample("lockin_http_requests_in_flight", self.in_flight),
+            "# TYPE lockin_http_requests_total counter",
+        ]
+        for (method, route, status), count in sorted(self.requests.items()):
+            lines.append(
+                format_sample("lockin_http_requests_total", count, {"method": method, "route": route, "status": status})
+            )
+        lines.append("# TYPE lockin_http_request_duration_seconds histogram")
+        for (method, route), histogram in sorted(self.latency.items()):
+            lines.extend(
+                format_histogram("lockin_http_request_duration_seconds", histogram, {"method": method, "route": route})
+            )
+        return lines
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,77 @@
+"""Period boundaries: the daily/weekly goal windows of a group, in the group's timezone.
+
+A window starts at local midnight (Monday for weekly periods), the same rule as ``date_trunc``
+in ``group_period_totals`` and the progress view, so windows follow DST: a day across a
+spring-forward change lasts 23 hours and a week 167. A group's windows are clamped to its
+``start_at``/``end_at``. Boundaries depend only on the timezone and the local date, so they are
+cached and every caller shares them. Python and PostgreSQL only agree where their tz databases
+do; keep the API hosts' ``tzdata`` and the server's in step (Paraguay's 2024 change shows the
+difference).
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import NamedTuple
+from zoneinfo import ZoneInfo
+
+from app.models.enums import GoalPeriod
+
+
+class PeriodWindow(NamedTuple):
+    start: datetime
+    end: datetime
+
+    def contains(self, instant: datetime) -> bool:
+        return self.start <= instant < self.end
+
+
+_STEP_DAYS = {GoalPeriod.DAILY: 1, GoalPeriod.WEEKLY: 7}
+
+
+@lru_cache(maxsize=256)
+def _zone(name: str) -> ZoneInfo:
+    return ZoneInfo(name)
+
+
+def _first_day(period: GoalPeriod, day: date) -> date:
+    """Local date on which the period containing ``day`` starts."""
+    return day - timedelta(days=day.weekday()) if period is GoalPeriod.WEEKLY else day
+
+
+@lru_cache(maxsize=65536)
+def boundary(day: date, tz: str) -> datetime:
+    """UTC instant of local midnight starting ``day`` in ``tz``.
+
+    Where a DST change skips or repeats midnight, the standard-time (smaller) offset wins, as
+    in PostgreSQL's ``AT TIME ZONE``, so Python and SQL agree on every window.
+    """
+    midnight = datetime.combine(day, time(), tzinfo=_zone(tz))
+    return min(midnight, midnight.replace(fold=1), key=datetime.utcoffset).astimezone(timezone.utc)
+
+
+def window_at(period: GoalPeriod | str, tz: str, instant: datetime) -> PeriodWindow:
+    """The unclamped window containing ``instant``.
+
+    Where midnight repeats, the day starts at the second one, so the first hour of the local
+    date still belongs to the previous window.
+    """
+    period = GoalPeriod(period)
+    step = timedelta(days=_STEP_DAYS[period])
+    first = _first_day(period, instant.astimezone(_zone(tz)).date())
+    if instant < boundary(first, tz):
+        first -= step
+    return PeriodWindow(boundary(first, tz), boundary(first + step, tz))
+
+
+def group_window(
+    period: GoalPeriod | str, tz: str, start_at: datetime, end_at: datetime, instant: datetime
+) -> PeriodWindow:
+    """``window_at`` clamped to the group's lifetime, as the progress view reports it.
+
+    Outside the lifetime the result is empty (``start >= end``), which matches no log.
+    """
+    window = window_at(period, tz, instant)
+    return PeriodWindow(max(window.start, start_at), min(window.end, end_at))
+
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import sys
+import threading
+from collections import Counter
+from types import FrameType
+
+
+def _collapse(frame: FrameType | None) -> str:
+    names: list[str] = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_qualname} ({code.co_filename}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class StackSampler:
+    """Samples one thread's Python stack from a helper thread.
+
+    Output is in the collapsed ``frame;frame;frame count`` format read by flamegraph.pl,
+    speedscope and inferno. Sampling the event loop thread captures whatever coroutine is
+    running at each tick, so concurrent requests on the same worker show up as well.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.005) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="lockin-profiler", daemon=True)
+
+    def start(self) -> StackSampler:
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter[str]:
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples[_collapse(frame)] += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
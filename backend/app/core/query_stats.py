@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_PLACEHOLDER = re.compile(r"\$\d+(\s*,\s*\$\d+)*")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Statement shape with bind placeholders (including expanded IN lists) collapsed."""
+    return _WHITESPACE.sub(" ", _PLACEHOLDER.sub("?", statement)).strip()
+
+
+class QueryStats:
+    __slots__ = ("count", "seconds", "rows", "statements")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+        self.rows = 0
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, seconds: float, rows: int) -> None:
+        self.count += 1
+        self.seconds += seconds
+        if rows > 0:
+            self.rows += rows
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes issued at least ``threshold`` times (likely N+1 loops)."""
+        shapes: Counter[str] = Counter()
+        for statement, count in self.statements.items():
+            shapes[fingerprint(statement)] += count
+        return [(shape, count) for shape, count in shapes.most_common() if count >= threshold]
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("lockin_query_stats", default=None)
+
+
+def start() -> QueryStats:
+    stats = QueryStats()
+    _current.set(stats)
+    return stats
+
+
+def current() -> QueryStats | None:
+    return _current.get()
+
+
+# Class-level listeners cover the primary, the replica and any engine created later.
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None:
+        context._lockin_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current.get()
+    started = getattr(context, "_lockin_started", None)
+    if stats is not None and started is not None:
+        stats.record(statement, time.perf_counter() - started, cursor.rowcount)
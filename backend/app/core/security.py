@@ -1,24 +1,38 @@
+"""Cognito token verification.
+
+``jose`` (and the ``cryptography`` backend it loads) and ``httpx`` are imported on first use;
+``prefetch_jwks`` lets the lifespan hook pay for them, and the JWKS round trip, before traffic.
+"""
+
 from __future__ import annotations
 
 import time
+from collections import OrderedDict
 from typing import Any
 
-import httpx
-from jose import JWTError, jwt
-
 from app.core.config import get_settings
 
-settings = get_settings()
-
 _ISSUER = None
 _JWKS_CACHE: dict[str, Any] = {}
 _JWKS_EXP = 0.0
 _JWKS_TTL = 60 * 60  # 1 hour
+_JWKS_FETCHED_AT: float | None = None
+
+# Verified payloads keyed by raw token, kept until the token expires (bounded LRU).
+_TOKEN_CACHE: OrderedDict[str, tuple[dict[str, Any], float]] = OrderedDict()
+_TOKEN_CACHE_SIZE = 4096
+token_cache_hits = 0
+token_cache_misses = 0
+
+
+class InvalidTokenError(Exception):
+    """The bearer token is malformed, expired, or not signed by the user pool."""
 
 
 def _issuer() -> str:
     global _ISSUER
     if _ISSUER is None:
+        settings = get_settings()
         if not settings.aws_region or not settings.cognito_user_pool_id:
             raise RuntimeError("Cognito configuration is missing")
         _ISSUER = f"https://cognito-idp.{settings.aws_region}.amazonaws.com/{settings.cognito_user_pool_id}"
@@ -26,14 +40,22 @@ def _issuer() -> str:
 
 
 async def _refresh_jwks() -> None:
-    global _JWKS_CACHE, _JWKS_EXP
+    global _JWKS_CACHE, _JWKS_EXP, _JWKS_FETCHED_AT
+    import httpx
+
     jwks_url = f"{_issuer()}/.well-known/jwks.json"
     async with httpx.AsyncClient(timeout=10) as client:
         response = await client.get(jwks_url)
         response.raise_for_status()
         data = response.json()
         _JWKS_CACHE = {key["kid"]: key for key in data.get("keys", [])}
-        _JWKS_EXP = time.time() + _JWKS_TTL
+        _JWKS_FETCHED_AT = time.time()
+        _JWKS_EXP = _JWKS_FETCHED_AT + _JWKS_TTL
+
+
+def jwks_cache_age() -> float | None:
+    """Seconds since the JWKS was last fetched, or ``None`` before the first fetch."""
+    return None if _JWKS_FETCHED_AT is None else time.time() - _JWKS_FETCHED_AT
 
 
 async def get_signing_key(kid: str) -> dict[str, Any]:
@@ -44,25 +66,52 @@ async def get_signing_key(kid: str) -> dict[str, Any]:
         await _refresh_jwks()
         key = _JWKS_CACHE.get(kid)
     if not key:
-        raise JWTError("Unable to find matching JWKS key")
+        raise InvalidTokenError("Unable to find matching JWKS key")
     return key
 
 
 async def verify_token(token: str) -> dict[str, Any]:
+    global token_cache_hits, token_cache_misses
+    settings = get_settings()
     if not settings.cognito_app_client_id:
         raise RuntimeError("Cognito app client id not configured")
 
-    header = jwt.get_unverified_header(token)
-    kid = header.get("kid")
-    if not kid:
-        raise JWTError("Token header missing 'kid'")
-
-    key = await get_signing_key(kid)
-    payload = jwt.decode(
-        token,
-        key,
-        algorithms=["RS256"],
-        audience=settings.cognito_app_client_id,
-        issuer=_issuer(),
-    )
+    cached = _TOKEN_CACHE.get(token)
+    if cached is not None and cached[1] > time.time():
+        token_cache_hits += 1
+        _TOKEN_CACHE.move_to_end(token)
+        return cached[0]
+    token_cache_misses += 1
+
+    from jose import JWTError, jwt
+
+    try:
+        header = jwt.get_unverified_header(token)
+        kid = header.get("kid")
+        if not kid:
+            raise InvalidTokenError("Token header missing 'kid'")
+
+        key = await get_signing_key(kid)
+        payload = jwt.decode(
+            token,
+            key,
+            algorithms=["RS256"],
+            audience=settings.cognito_app_client_id,
+            issuer=_issuer(),
+        )
+    except JWTError as exc:
+        raise InvalidTokenError(str(exc)) from exc
+    expires_at = payload.get("exp")
+    if isinstance(expires_at, (int, float)):
+        _TOKEN_CACHE[token] = (payload, float(expires_at))
+        if len(_TOKEN_CACHE) > _TOKEN_CACHE_SIZE:
+            _TOKEN_CACHE.popitem(last=False)
     return payload
+
+
+async def prefetch_jwks() -> None:
+    """Import the JWT stack and fetch the signing keys ahead of the first authenticated request."""
+    from jose import jwt  # noqa: F401
+
+    if not _JWKS_CACHE or time.time() >= _JWKS_EXP:
+        await _refresh_jwks()
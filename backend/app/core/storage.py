@@ -0,0 +1,127 @@
+"""S3 object storage for user uploads.
+
+Clients upload straight to the bucket with presigned POSTs, so image bytes never pass through the
+API workers. ``LOCKIN_S3_ENDPOINT_URL`` points the client at any S3-compatible stand-in (MinIO,
+``moto_server``) for local runs. boto3 is synchronous and slow to import, so it is loaded on first
+use and every call runs in a worker thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from functools import lru_cache
+from typing import Any
+
+from app.core.config import get_settings
+
+
+class ObjectMissing(LookupError):
+    """The key does not exist (the client never finished its upload)."""
+
+
+class ObjectTooLarge(ValueError):
+    pass
+
+
+class ObjectStorage:
+    def __init__(
+        self,
+        bucket: str,
+        *,
+        region: str | None = None,
+        endpoint_url: str | None = None,
+        public_base_url: str | None = None,
+    ) -> None:
+        self.bucket = bucket
+        self.region = region
+        self.endpoint_url = endpoint_url
+        self.public_base_url = (public_base_url or self._default_public_base_url()).rstrip("/")
+        self._client_lock = threading.Lock()
+        self._client: Any = None
+
+    def _default_public_base_url(self) -> str:
+        if self.endpoint_url:
+            return f"{self.endpoint_url.rstrip('/')}/{self.bucket}"
+        return f"https://{self.bucket}.s3.{self.region or 'us-east-1'}.amazonaws.com"
+
+    def client(self) -> Any:
+        with self._client_lock:
+            if self._client is None:
+                import boto3
+                from botocore.config import Config
+
+                # Path-style addressing keeps local stand-ins working without wildcard DNS.
+                config = Config(
+                    signature_version="s3v4",
+                    s3={"addressing_style": "path" if self.endpoint_url else "auto"},
+                    retries={"mode": "standard"},
+                )
+                self._client = boto3.client(
+                    "s3", region_name=self.region, endpoint_url=self.endpoint_url, config=config
+                )
+            return self._client
+
+    def public_url(self, key: str) -> str:
+        return f"{self.public_base_url}/{key}"
+
+    async def presigned_post(
+        self, key: str, *, content_type: str, max_bytes: int, expires_in: int
+    ) -> dict[str, Any]:
+        """``{"url", "fields"}`` for a browser-style multipart POST of at most ``max_bytes``."""
+
+        def sign() -> dict[str, Any]:
+            return self.client().generate_presigned_post(
+                Bucket=self.bucket,
+                Key=key,
+                Fields={"Content-Type": content_type},
+                Conditions=[{"Content-Type": content_type}, ["content-length-range", 1, max_bytes]],
+                ExpiresIn=expires_in,
+            )
+
+        return await asyncio.to_thread(sign)
+
+    async def get(self, key: str, *, max_bytes: int) -> bytes:
+        def download() -> bytes:
+            client = self.client()
+            try:
+                response = client.get_object(Bucket=self.bucket, Key=key)
+            except client.exceptions.NoSuchKey:
+                raise ObjectMissing(key) from None
+            body = response["Body"]
+            try:
+                if response.get("ContentLength", 0) > max_bytes:
+                    raise ObjectTooLarge(key)
+                data = body.read(max_bytes + 1)
+            finally:
+                body.close()
+            if len(data) > max_bytes:
+                raise ObjectTooLarge(key)
+            return data
+
+        return await asyncio.to_thread(download)
+
+    async def put(self, key: str, data: bytes, *, content_type: str, cache_control: str | None = None) -> None:
+        extra = {"CacheControl": cache_control} if cache_control else {}
+
+        def upload() -> None:
+            self.client().put_object(Bucket=self.bucket, Key=key, Body=data, ContentType=content_type, **extra)
+
+        await asyncio.to_thread(upload)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(lambda: self.client().delete_object(Bucket=self.bucket, Key=key))
+
+
+@lru_cache
+def get_storage() -> ObjectStorage | None:
+    """The configured bucket, or None when ``LOCKIN_S3_BUCKET`` is unset (uploads disabled)."""
+    settings = get_settings()
+    if not settings.s3_bucket:
+        return None
+    return ObjectStorage(
+        settings.s3_bucket,
+        region=settings.aws_region,
+        endpoint_url=settings.s3_endpoint_url,
+        public_base_url=settings.s3_public_base_url,
+    )
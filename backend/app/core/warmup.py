@@ -0,0 +1,63 @@
+"""Start-up work that would otherwise land on the first requests after a cold start.
+
+Each step is opt-in through settings and runs in the lifespan hook before the app accepts
+traffic. A failing step is logged and skipped: the request path redoes the same work lazily.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable
+
+from fastapi import FastAPI
+from sqlalchemy.orm import configure_mappers
+
+from app.core import security
+from app.core.config import get_settings
+from app.core.database import warm_up_pool
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_schemas(app: FastAPI) -> None:
+    # Mapper configuration otherwise runs inside the first query; the OpenAPI document builds
+    # the JSON schema of every request/response model.
+    configure_mappers()
+    app.openapi()
+
+
+async def _timed(name: str, step: Awaitable[None]) -> tuple[str, float]:
+    started = time.perf_counter()
+    try:
+        await step
+    except Exception:
+        logger.warning("Warm-up step %s failed", name, exc_info=True)
+    return name, time.perf_counter() - started
+
+
+async def warm_up(app: FastAPI) -> dict[str, float]:
+    """Run the configured steps and return the seconds each took."""
+    settings = get_settings()
+    timings: dict[str, float] = {}
+    if settings.warmup_schemas:
+        started = time.perf_counter()
+        try:
+            _warm_schemas(app)
+        except Exception:
+            logger.warning("Warm-up step schemas failed", exc_info=True)
+        timings["schemas"] = time.perf_counter() - started
+
+    # Network-bound steps overlap.
+    steps: list[tuple[str, Awaitable[None]]] = []
+    if settings.db_warmup_connections:
+        steps.append(("connections", warm_up_pool(settings.db_warmup_connections)))
+    if settings.warmup_jwks:
+        steps.append(("jwks", security.prefetch_jwks()))
+    timings.update(await asyncio.gather(*(_timed(name, step) for name, step in steps)))
+
+    if timings:
+        summary = ", ".join(f"{name}={seconds * 1000:.0f}ms" for name, seconds in timings.items())
+        logger.info("Warm-up finished: %s", summary)
+    return timings
@@ -1,20 +1,20 @@
 from __future__ import annotations
 
+import math
 import uuid
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.admission import get_rate_limiter
 from app.core.config import get_settings
-from app.core.database import get_db
-from app.core.security import verify_token
+from app.core.database import get_db, tag_session_profile
+from app.core.security import InvalidTokenError, verify_token
 from app.models import Profile
 from app.services import auth_service
 
 security = HTTPBearer(auto_error=False)
-settings = get_settings()
 
 PROVIDER = "cognito"
 ANON_PROVIDER = "demo"
@@ -22,6 +22,19 @@ ANON_SUBJECT = "anonymous"
 ANON_EMAIL = "anonymous@lockin.demo"
 
 
+async def _enforce_rate_limit(profile_id: uuid.UUID) -> None:
+    limiter = get_rate_limiter()
+    if limiter is None:
+        return
+    retry_after = await limiter.check(str(profile_id))
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+
 async def _ensure_profile(
     session: AsyncSession,
     *,
@@ -37,10 +50,12 @@ async def _ensure_profile(
         email=email,
         display_name=display_name,
     )
+    tag_session_profile(session, profile.id)
     if created:
         await session.commit()
     else:
         await session.flush()
+    await _enforce_rate_limit(profile.id)
     return profile
 
 
@@ -49,7 +64,7 @@ async def get_current_user(
     session: AsyncSession = Depends(get_db),
 ) -> Profile:
     if credentials is None:
-        if settings.allow_anonymous:
+        if get_settings().allow_anonymous:
             return await _ensure_profile(
                 session,
                 provider=ANON_PROVIDER,
@@ -62,7 +77,7 @@ async def get_current_user(
     token = credentials.credentials
     try:
         payload = await verify_token(token)
-    except JWTError as exc:  # pragma: no cover
+    except InvalidTokenError as exc:  # pragma: no cover
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import uuid
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.database import (
+    get_db,
+    get_replica_session_factory,
+    get_session_factory,
+    replica_available,
+    wrote_recently,
+)
+from app.dependencies.auth import get_current_user
+from app.models import Profile
+
+
+@asynccontextmanager
+async def read_session(profile_id: uuid.UUID, session: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """The replica when it is healthy and caught up, else ``session`` itself (the primary).
+
+    Users who committed a write within ``read_your_writes_seconds`` stay on the primary so they
+    always see their own changes.
+    """
+    replica_session_factory = get_replica_session_factory()
+    if replica_session_factory is None or wrote_recently(profile_id) or not await replica_available():
+        yield session
+        return
+
+    # Release the primary connection used for authentication before reading from the replica.
+    await session.commit()
+    async with replica_session_factory() as replica_session:
+        yield replica_session
+
+
+async def get_read_db(
+    current_user: Profile = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
+) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only routes, routed by ``read_session``."""
+    async with read_session(current_user.id, session) as routed:
+        yield routed
+
+
+async def read_session_factory(profile_id: uuid.UUID) -> async_sessionmaker[AsyncSession]:
+    """Factory for extra read sessions (parallel queries), routed like ``get_read_db``."""
+    replica_session_factory = get_replica_session_factory()
+    if replica_session_factory is None or wrote_recently(profile_id) or not await replica_available():
+        return get_session_factory()
+    return replica_session_factory
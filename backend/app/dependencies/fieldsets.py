@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel
+
+from app.core.fieldsets import FieldSet
+
+
+def sparse_fields(model: type[BaseModel]) -> Callable[..., FieldSet]:
+    """Dependency parsing ``fields`` and ``include`` for routes returning ``model``."""
+
+    def dependency(
+        fields: str | None = Query(default=None, description="Comma-separated top-level fields to return"),
+        include: str | None = Query(default=None, description="Comma-separated relations to embed, e.g. members.user"),
+    ) -> FieldSet:
+        try:
+            return FieldSet.parse(model, fields, include)
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    return dependency
@@ -1,13 +1,86 @@
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from starlette.types import ASGIApp
+
+from app.core.config import get_settings
+from app.core.database import dispose_engines
+from app.core.events import listen_for_notifications
+from app.core.storage import get_storage
+from app.core.warmup import warm_up
+from app.middleware import (
+    AdmissionMiddleware,
+    CompressionMiddleware,
+    MetricsMiddleware,
+    ProfilingMiddleware,
+    QueryStatsMiddleware,
+)
+from app.routers import avatars, health, groups, profile, sessions, notifications, maintenance, metrics
+from app.services import avatar_service, maintenance_service
+
+
+@asynccontextmanager
+async def lifespan(app_: FastAPI) -> AsyncIterator[None]:
+    settings = get_settings()
+    app_.state.warmup_seconds = await warm_up(app_)
+    tasks: list[asyncio.Task[None]] = []
+    if settings.notification_listen:
+        tasks.append(asyncio.create_task(listen_for_notifications(settings.database_url)))
+    if settings.maintenance_enabled:
+        tasks.append(asyncio.create_task(maintenance_service.run_forever(settings.maintenance_interval_seconds)))
+    storage = get_storage()
+    if storage is not None and settings.avatar_worker_enabled:
+        tasks.append(asyncio.create_task(avatar_service.run_worker(storage, settings.avatar_worker_poll_seconds)))
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        await dispose_engines()
 
-from app.routers import health, groups, profile, sessions, notifications, maintenance
 
-app = FastAPI(title="LockIN API", version="0.1.0")
+def configured_middleware(app_: ASGIApp) -> ASGIApp:
+    """Wrap ``app_`` in the settings-dependent middleware.
+
+    Starlette builds the middleware stack on the first lifespan or HTTP event, so settings are
+    read then rather than when ``app.main`` is imported.
+    """
+    settings = get_settings()
+    if settings.compression_enabled:
+        app_ = CompressionMiddleware(app_, minimum_size=settings.compression_minimum_size)
+    if settings.profiling_admin_token or settings.profiling_sample_rate:
+        app_ = ProfilingMiddleware(
+            app_,
+            admin_token=settings.profiling_admin_token,
+            sample_rate=settings.profiling_sample_rate,
+            interval=settings.profiling_interval_ms / 1000,
+            output_dir=settings.profiling_output_dir,
+            max_files=settings.profiling_max_files,
+        )
+    app_ = QueryStatsMiddleware(
+        app_,
+        slow_request_ms=settings.slow_request_ms,
+        detect_repeats=settings.debug,
+        repeat_threshold=settings.query_repeat_threshold,
+    )
+    return AdmissionMiddleware(app_)
+
+
+app = FastAPI(title="LockIN API", version="0.1.0", lifespan=lifespan)
+app.add_middleware(configured_middleware)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(health.router)
 app.include_router(profile.router)
+app.include_router(avatars.router)
 app.include_router(groups.router)
 app.include_router(sessions.router)
 app.include_router(notifications.router)
 app.include_router(maintenance.router)
-
+app.include_router(metrics.router)
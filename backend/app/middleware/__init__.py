@@ -0,0 +1,13 @@
+from .admission import AdmissionMiddleware
+from .compression import CompressionMiddleware
+from .metrics import MetricsMiddleware
+from .profiling import ProfilingMiddleware
+from .query_stats import QueryStatsMiddleware
+
+__all__ = [
+    "AdmissionMiddleware",
+    "CompressionMiddleware",
+    "MetricsMiddleware",
+    "ProfilingMiddleware",
+    "QueryStatsMiddleware",
+]
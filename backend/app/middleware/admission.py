@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import json
+import math
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.admission import ConcurrencyLimiter, Overloaded, Slot, get_db_limiter
+
+SLOT_SCOPE_KEY = "lockin.db_slot"
+
+# Liveness, scraping and docs never touch the database and must answer while the API is saturated.
+DEFAULT_EXEMPT = ("/api/healthz", "/metrics", "/docs", "/redoc", "/openapi.json")
+
+
+class AdmissionMiddleware:
+    """Holds a ``ConcurrencyLimiter`` slot for each request; sheds with 503 when none frees up in time.
+
+    The slot is exposed as ``scope["lockin.db_slot"]`` so handlers that park without a connection
+    (notification long-polls) can hand it back while they wait.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        limiter: ConcurrencyLimiter | None = None,
+        exempt: tuple[str, ...] = DEFAULT_EXEMPT,
+    ) -> None:
+        self.app = app
+        self.limiter = limiter
+        self.exempt = exempt
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt):
+            await self.app(scope, receive, send)
+            return
+
+        slot = Slot(self.limiter or get_db_limiter())
+        try:
+            await slot.acquire()
+        except Overloaded as exc:
+            await _shed(send, exc)
+            return
+
+        started = False
+
+        async def send_tracking(message: Message) -> None:
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        scope[SLOT_SCOPE_KEY] = slot
+        try:
+            await self.app(scope, receive, send_tracking)
+        except Overloaded as exc:
+            # A parked handler could not get its slot back.
+            if started:
+                raise
+            await _shed(send, exc)
+        finally:
+            slot.release()
+
+
+async def _shed(send: Send, exc: Overloaded) -> None:
+    body = json.dumps({"detail": "Server is busy, retry shortly"}).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(math.ceil(exc.retry_after)).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import gzip
+import io
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - gzip only
+    brotli = None
+
+# Already-compressed or incremental payloads gain nothing (or break) when re-encoded.
+_SKIP_TYPES = ("image/", "video/", "audio/", "application/zip", "application/gzip", "text/event-stream")
+
+
+def _negotiate(accept_encoding: str, offers: tuple[str, ...]) -> str | None:
+    """Best offered coding by the client's q-values; ties go to the server's preference order."""
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[coding.strip().lower()] = quality
+    ranked = [(weights.get(offer, weights.get("*", 0.0)), -index, offer) for index, offer in enumerate(offers)]
+    quality, _, offer = max(ranked)
+    return offer if quality > 0 else None
+
+
+class _Encoder:
+    def __init__(self, coding: str, level: int | None) -> None:
+        self.coding = coding
+        if coding == "br":
+            self._brotli = brotli.Compressor(quality=4 if level is None else level)
+        else:
+            self._buffer = io.BytesIO()
+            self._gzip = gzip.GzipFile(mode="wb", fileobj=self._buffer, compresslevel=6 if level is None else level)
+
+    def compress(self, data: bytes, *, final: bool) -> bytes:
+        if self.coding == "br":
+            out = self._brotli.process(data)
+            return out + (self._brotli.finish() if final else self._brotli.flush())
+        self._gzip.write(data)
+        if final:
+            self._gzip.close()
+        else:
+            self._gzip.flush(zlib.Z_SYNC_FLUSH)
+        out = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return out
+
+
+class CompressionMiddleware:
+    """Negotiated brotli/gzip for response bodies of at least ``minimum_size`` bytes.
+
+    Single-message bodies are only compressed when they reach the threshold; streamed bodies are
+    compressed chunk by chunk with a flush per chunk so clients can parse rows as they arrive.
+    Brotli is offered when the ``brotli`` package is installed.
+    """
+
+    def __init__(self, app: ASGIApp, *, minimum_size: int = 1024, level: int | None = None) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+        self.offers = ("br", "gzip") if brotli is not None else ("gzip",)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        coding = _negotiate(Headers(scope=scope).get("accept-encoding", ""), self.offers)
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        encoder: _Encoder | None = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, encoder, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if "content-encoding" in headers or content_type.startswith(_SKIP_TYPES):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoder is None:
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    MutableHeaders(scope=start).add_vary_header("Accept-Encoding")
+                    await send(start)
+                    await send(message)
+                    return
+                encoder = _Encoder(coding, self.level)
+                headers = MutableHeaders(scope=start)
+                headers["Content-Encoding"] = coding
+                headers.add_vary_header("Accept-Encoding")
+                if "content-length" in headers:
+                    del headers["content-length"]
+                if "etag" in headers and not headers["etag"].startswith("W/"):
+                    headers["etag"] = f"W/{headers['etag']}"
+                compressed = encoder.compress(body, final=not more_body)
+                if not more_body:
+                    headers["Content-Length"] = str(len(compressed))
+                await send(start)
+                await send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+                return
+            await send(
+                {"type": "http.response.body", "body": encoder.compress(body, final=not more_body), "more_body": more_body}
+            )
+
+        await self.app(scope, receive, send_compressed)
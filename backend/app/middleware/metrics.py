@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import RequestMetrics, request_metrics
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """Records in-flight requests plus count and latency per route template."""
+
+    def __init__(self, app: ASGIApp, *, metrics: RequestMetrics = request_metrics) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self.metrics.in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.metrics.in_flight -= 1
+            # The router stores the matched route in scope; unmatched paths share one label.
+            route = scope.get("route")
+            template = getattr(route, "path", None) or UNMATCHED_ROUTE
+            self.metrics.observe(scope["method"], template, status_code, time.perf_counter() - started)
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import hmac
+import logging
+import random
+import re
+import threading
+import time
+from pathlib import Path
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.profiling import StackSampler
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-lockin-profile"
+PROFILE_OUTPUT_HEADER = "x-lockin-profile-output"
+_UNSAFE_FILENAME = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+class ProfilingMiddleware:
+    """Opt-in sampling profiler for individual requests.
+
+    A request is profiled when it carries ``X-Lockin-Profile: <admin token>`` or is picked by
+    ``sample_rate``. Profiles are written as collapsed stacks under ``output_dir``, which keeps the
+    newest ``max_files`` of them; admin requests may send ``X-Lockin-Profile-Output: inline`` to get
+    the stacks back instead of the response body. Only one request per worker is profiled at a time.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        admin_token: str | None = None,
+        sample_rate: float = 0.0,
+        interval: float = 0.005,
+        output_dir: str = "profiles",
+        max_files: int = 200,
+    ) -> None:
+        self.app = app
+        self.admin_token = admin_token
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.output_dir = Path(output_dir)
+        self.max_files = max_files
+        self._busy = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._busy:
+            await self.app(scope, receive, send)
+            return
+
+        requested = self._admin_requested(scope)
+        if not requested and not (self.sample_rate and random.random() < self.sample_rate):
+            await self.app(scope, receive, send)
+            return
+
+        inline = requested and Headers(scope=scope).get(PROFILE_OUTPUT_HEADER) == "inline"
+        self._busy = True
+        sampler = StackSampler(threading.get_ident(), self.interval).start()
+        started = time.time()
+        try:
+            if inline:
+                await self.app(scope, receive, _discard)
+            else:
+                await self.app(scope, receive, self._tag_response(scope, send, started))
+        finally:
+            # Joining waits out the sampler's current tick; do it off the event loop.
+            await asyncio.to_thread(sampler.stop)
+            self._busy = False
+
+        if inline:
+            await _send_text(send, sampler.folded())
+        else:
+            await asyncio.to_thread(self._write, scope, sampler, started)
+
+    def _admin_requested(self, scope: Scope) -> bool:
+        if not self.admin_token:
+            return False
+        supplied = Headers(scope=scope).get(PROFILE_HEADER)
+        return supplied is not None and hmac.compare_digest(supplied, self.admin_token)
+
+    def _path_for(self, scope: Scope, started: float) -> Path:
+        route = getattr(scope.get("route"), "path", None) or scope["path"]
+        name = _UNSAFE_FILENAME.sub("_", f'{scope["method"]}{route}').strip("_")
+        return self.output_dir / f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime(started))}-{name}.folded"
+
+    def _tag_response(self, scope: Scope, send: Send, started: float) -> Send:
+        async def send_with_path(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Lockin-Profile-File", self._path_for(scope, started).name)
+            await send(message)
+
+        return send_with_path
+
+    def _write(self, scope: Scope, sampler: StackSampler, started: float) -> None:
+        path = self._path_for(scope, started)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(sampler.folded())
+            # Names start with a UTC timestamp, so they sort oldest first.
+            profiles = sorted(self.output_dir.glob("*.folded"))
+            for stale in profiles[: max(len(profiles) - self.max_files, 0)]:
+                stale.unlink(missing_ok=True)
+        except OSError:
+            logger.exception("Could not write profile %s", path)
+
+
+async def _discard(message: Message) -> None:
+    return None
+
+
+async def _send_text(send: Send, body: str) -> None:
+    payload = body.encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-length", str(len(payload)).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": payload})
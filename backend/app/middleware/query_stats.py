@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import query_stats
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware:
+    """Counts SQL statements, DB time and rows per request.
+
+    Adds a ``Server-Timing`` header, logs requests slower than ``slow_request_ms`` with their
+    statement fingerprints and, when ``detect_repeats`` is on, warns about statement shapes
+    repeated ``repeat_threshold`` times or more (N+1 loops).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        slow_request_ms: float = 500.0,
+        detect_repeats: bool = False,
+        repeat_threshold: int = 5,
+    ) -> None:
+        self.app = app
+        self.slow_request_ms = slow_request_ms
+        self.detect_repeats = detect_repeats
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = query_stats.start()
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries, {stats.rows} rows", '
+                    f"app;dur={elapsed_ms:.1f}",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            self._report(scope, stats, (time.perf_counter() - started) * 1000)
+
+    def _report(self, scope: Scope, stats: query_stats.QueryStats, elapsed_ms: float) -> None:
+        path = f'{scope["method"]} {scope["path"]}'
+        if elapsed_ms >= self.slow_request_ms:
+            logger.warning(
+                "Slow request %s: %.1f ms, %d queries, %.1f ms in DB, %d rows\n%s",
+                path,
+                elapsed_ms,
+                stats.count,
+                stats.seconds * 1000,
+                stats.rows,
+                "\n".join(f"  {count}x {query_stats.fingerprint(sql)}" for sql, count in stats.statements.items()),
+            )
+        if self.detect_repeats:
+            for shape, count in stats.repeated(self.repeat_threshold):
+                logger.warning("Possible N+1 in %s: %dx %s", path, count, shape)
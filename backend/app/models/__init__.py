@@ -1,6 +1,7 @@
 from .base import Base
 from .entities import (
     AuthIdentity,
+    AvatarUpload,
     Group,
     GroupMember,
     Notification,
@@ -20,4 +21,5 @@ __all__ = [
     "SessionParticipant",
     "TimeLog",
     "Notification",
+    "AvatarUpload",
 ]
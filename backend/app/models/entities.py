@@ -3,12 +3,13 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import CheckConstraint, DateTime, Enum, ForeignKey, Integer, Text, UniqueConstraint, func
+from sqlalchemy import BigInteger, CheckConstraint, DateTime, Enum, ForeignKey, Integer, Text, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import CITEXT, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
 from app.models.enums import (
+    AvatarUploadStatus,
     GoalPeriod,
     GroupStatus,
     MemberRole,
@@ -41,6 +42,7 @@ class Profile(UpdatedTimestampMixin, Base):
     email: Mapped[str] = mapped_column(CITEXT(), unique=True, nullable=False)
     display_name: Mapped[str | None] = mapped_column(Text)
     avatar_url: Mapped[str | None] = mapped_column(Text)
+    avatar_key: Mapped[str | None] = mapped_column(Text)
 
     identities: Mapped[list[AuthIdentity]] = relationship(
         back_populates="profile", cascade="all, delete-orphan", passive_deletes=True
@@ -91,6 +93,11 @@ class Group(UpdatedTimestampMixin, Base):
         nullable=False,
         default=GroupStatus.ACTIVE,
     )
+    summarized_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # Maintained by database triggers on members, sessions and time logs; never written here.
+    member_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    active_session_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    total_seconds: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
 
     owner: Mapped[Profile] = relationship(back_populates="owned_groups")
     members: Mapped[list[GroupMember]] = relationship(back_populates="group", cascade="all, delete-orphan")
@@ -217,6 +224,7 @@ class Notification(TimestampMixin, Base):
     group_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("groups.id", ondelete="SET NULL"), nullable=True
     )
+    read_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
     recipient: Mapped[Profile] = relationship(back_populates="notifications")
     group: Mapped[Group | None] = relationship(back_populates="notifications")
@@ -224,3 +232,23 @@ class Notification(TimestampMixin, Base):
     __table_args__ = (
         CheckConstraint("status IS NOT NULL", name="ck_notifications_status_not_null"),
     )
+
+
+class AvatarUpload(TimestampMixin, Base):
+    __tablename__ = "avatar_uploads"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    profile_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("profiles.id", ondelete="CASCADE"), nullable=False
+    )
+    source_key: Mapped[str] = mapped_column(Text, unique=True, nullable=False)
+    status: Mapped[AvatarUploadStatus] = mapped_column(
+        Enum(AvatarUploadStatus, name="avatar_upload_status", values_callable=enum_values, create_constraint=False),
+        nullable=False,
+        server_default=AvatarUploadStatus.PENDING.value,
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    thumbnail_key: Mapped[str | None] = mapped_column(Text)
+    error: Mapped[str | None] = mapped_column(Text)
+    claimed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    processed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
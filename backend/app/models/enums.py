@@ -46,3 +46,11 @@ class NotificationStatus(str, enum.Enum):
     ACCEPTED = "accepted"
     DECLINED = "declined"
     READ = "read"
+
+
+class AvatarUploadStatus(str, enum.Enum):
+    PENDING = "pending"
+    PROCESSING = "processing"
+    DONE = "done"
+    SUPERSEDED = "superseded"
+    FAILED = "failed"
@@ -1,3 +1,3 @@
-from . import groups, health, profile, sessions, notifications, maintenance
+from . import avatars, groups, health, maintenance, metrics, notifications, profile, sessions
 
-__all__ = ["groups", "health", "profile", "sessions", "notifications", "maintenance"]
+__all__ = ["groups", "health", "profile", "avatars", "sessions", "notifications", "maintenance", "metrics"]
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.storage import ObjectStorage, get_storage
+from app.dependencies.auth import get_current_user
+from app.models import AvatarUpload, Profile
+from app.schemas.profile import AvatarUploadComplete, AvatarUploadRead, AvatarUploadRequest, AvatarUploadTicket
+from app.services import avatar_service
+
+router = APIRouter(prefix="/api/profiles/avatar", tags=["profile"])
+
+
+def require_storage() -> ObjectStorage:
+    storage = get_storage()
+    if storage is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Avatar uploads are not configured"
+        )
+    return storage
+
+
+@router.post("/upload-url", response_model=AvatarUploadTicket)
+async def create_upload_url(
+    payload: AvatarUploadRequest,
+    current_user: Profile = Depends(get_current_user),
+    storage: ObjectStorage = Depends(require_storage),
+) -> dict[str, object]:
+    """Presigned POST for uploading the original straight to S3; then register it below."""
+    return await avatar_service.request_upload(storage, current_user.id, payload.content_type)
+
+
+@router.post(
+    "/uploads",
+    response_model=AvatarUploadRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(require_storage)],
+)
+async def complete_upload(
+    payload: AvatarUploadComplete,
+    current_user: Profile = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
+) -> AvatarUpload:
+    """Queue the uploaded original for thumbnailing; ``avatar_url`` changes once it is ``done``."""
+    try:
+        return await avatar_service.register_upload(session, current_user.id, payload.key)
+    except PermissionError as exc:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(exc)) from exc
+
+
+@router.get("/uploads/{upload_id}", response_model=AvatarUploadRead)
+async def read_upload(
+    upload_id: uuid.UUID,
+    current_user: Profile = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
+) -> AvatarUpload:
+    upload = await avatar_service.get_upload(session, current_user.id, upload_id)
+    if upload is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found")
+    return upload
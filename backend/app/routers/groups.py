@@ -1,30 +1,116 @@
 from __future__ import annotations
 
 import uuid
+from datetime import datetime
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import conditional
+from app.core.cache import ResponseCache
 from app.core.database import get_db
+from app.core.fieldsets import FieldSet
 from app.dependencies.auth import get_current_user
-from app.models import Profile
-from app.models.enums import GroupStatus, MemberRole
-from app.schemas.group import GroupCreate, GroupListItem, GroupRead
-from app.schemas.member import GroupMemberCreate, GroupMemberRead, GroupMemberUpdate
-from app.schemas.progress import GroupProgressRow
-from app.services import group_service, profile_service
+from app.dependencies.database import get_read_db
+from app.dependencies.fieldsets import sparse_fields
+from app.models import Group, GroupMember, Profile
+from app.models.enums import GoalPeriod, GroupStatus, MemberRole
+from app.schemas.group import GroupCreate, GroupOverview, GroupRead, GroupSearchHit
+from app.schemas.member import (
+    GroupBulkInvite,
+    GroupBulkInviteResult,
+    GroupMemberCreate,
+    GroupMemberRead,
+    GroupMemberUpdate,
+)
+from app.schemas.progress import GroupProgressRow, GroupStreakRow
+from app.services import export_service, group_service, profile_service
 
 router = APIRouter(prefix="/api/groups", tags=["groups"])
 
+# Keyed by the validator ETag, which already covers group, version, query variant and period.
+detail_cache = ResponseCache("group_detail")
+progress_cache = ResponseCache("group_progress")
+history_cache = ResponseCache("group_history")
+streaks_cache = ResponseCache("group_streaks")
+_progress_rows = TypeAdapter(list[GroupProgressRow])
+_streak_rows = TypeAdapter(list[GroupStreakRow])
 
-@router.get("", response_model=list[GroupListItem])
+
+async def _member_group_version(session: AsyncSession, group_id: uuid.UUID, user_id: uuid.UUID) -> dict[str, object]:
+    version = await group_service.get_group_version(session, group_id, user_id)
+    if version is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+    if not version["is_member"]:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this group")
+    return version
+
+
+def _cached_json(body: bytes, validators: conditional.Validators) -> Response:
+    return Response(body, media_type="application/json", headers=validators.headers())
+
+
+def _group_validators(
+    request: Request,
+    group_id: uuid.UUID,
+    version: dict[str, object],
+    representation: str,
+) -> conditional.Validators:
+    if representation in ("detail", "members"):
+        return conditional.Validators.build(
+            representation,
+            group_id,
+            version["version"],
+            conditional.query_variant(request),
+            last_modified=version["changed_at"],
+        )
+    # Progress also moves when the current period rolls over, without any write.
+    return conditional.Validators.build(
+        representation,
+        group_id,
+        version["version"],
+        version["period_start"].isoformat(),
+        last_modified=max(version["changed_at"], version["period_start"]),
+    )
+
+
+@router.get("", response_model=list[GroupOverview])
 async def list_groups(
     status: GroupStatus | None = Query(default=None),
     current_user: Profile = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db),
-) -> list[GroupListItem]:
+    session: AsyncSession = Depends(get_read_db),
+) -> list[Group]:
     groups = await group_service.list_groups_for_user(session, current_user.id, status=status)
-    return [GroupListItem.model_validate(group) for group in groups]
+    return groups
+
+
+@router.get("/search", response_model=list[GroupSearchHit])
+async def search_groups(
+    q: str = Query(min_length=1, max_length=200),
+    group_status: GroupStatus | None = Query(default=None, alias="status"),
+    period: GoalPeriod | None = Query(default=None),
+    cursor_rank: float | None = Query(default=None),
+    cursor_id: uuid.UUID | None = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=50),
+    current_user: Profile = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_db),
+) -> list[dict[str, object]]:
+    """Discover non-archived groups by name and description; registered before ``/{group_id}``."""
+    try:
+        return await group_service.search_groups(
+            session,
+            q,
+            status=group_status,
+            period=period,
+            cursor_rank=cursor_rank,
+            cursor_id=cursor_id,
+            limit=limit,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
 
 @router.post("", response_model=GroupRead, status_code=status.HTTP_201_CREATED)
@@ -32,13 +118,13 @@ async def create_group(
     payload: GroupCreate,
     current_user: Profile = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
-) -> GroupRead:
+) -> Group:
     group = await group_service.create_group(session, current_user, payload)
     await session.commit()
     group_with_relations = await group_service.get_group(session, group.id)
     if group_with_relations is None:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Group creation failed")
-    return GroupRead.model_validate(group_with_relations)
+    return group_with_relations
 
 
 @router.post("/{group_id}:clone", response_model=GroupRead, status_code=status.HTTP_201_CREATED)
@@ -46,7 +132,7 @@ async def clone_group(
     group_id: uuid.UUID,
     current_user: Profile = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
-) -> GroupRead:
+) -> Group:
     group = await group_service.get_group(session, group_id)
     if group is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
@@ -56,39 +142,51 @@ async def clone_group(
     cloned = await group_service.get_group(session, new_group_id)
     if cloned is None:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Clone failed")
-    return GroupRead.model_validate(cloned)
+    return cloned
 
 
 @router.get("/{group_id}", response_model=GroupRead)
 async def get_group(
     group_id: uuid.UUID,
+    request: Request,
+    fieldset: FieldSet = Depends(sparse_fields(GroupRead)),
     current_user: Profile = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db),
-) -> GroupRead:
-    group = await group_service.get_group(session, group_id)
-    if group is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+    session: AsyncSession = Depends(get_read_db),
+) -> Response:
+    version = await _member_group_version(session, group_id, current_user.id)
+    validators = _group_validators(request, group_id, version, "detail")
+    if conditional.is_fresh(request, validators):
+        return conditional.not_modified(validators)
 
-    if all(member.user_id != current_user.id for member in group.members):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this group")
+    async def render() -> bytes:
+        group = await group_service.get_group(session, group_id, fieldset)
+        if group is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+        return fieldset.dump(group)
 
-    return GroupRead.model_validate(group)
+    return _cached_json(await detail_cache.get_or_compute(validators.etag, render), validators)
 
 
 @router.get("/{group_id}/members", response_model=list[GroupMemberRead])
 async def list_members(
     group_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    cursor_created_at: datetime | None = Query(default=None),
+    cursor_id: uuid.UUID | None = Query(default=None),
+    limit: int = Query(default=50, ge=1, le=200),
     current_user: Profile = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db),
-) -> list[GroupMemberRead]:
-    group = await group_service.get_group(session, group_id)
-    if group is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
-    if all(member.user_id != current_user.id for member in group.members):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this group")
-
-    memberships = await group_service.list_members(session, group_id)
-    return [GroupMemberRead.model_validate(member) for member in memberships]
+    session: AsyncSession = Depends(get_read_db),
+) -> list[GroupMember] | Response:
+    version = await _member_group_version(session, group_id, current_user.id)
+    validators = _group_validators(request, group_id, version, "members")
+    if conditional.is_fresh(request, validators):
+        return conditional.not_modified(validators)
+
+    memberships = await group_service.list_members(
+        session, group_id, cursor_created_at=cursor_created_at, cursor_id=cursor_id, limit=limit
+    )
+    return conditional.attach(memberships, response, validators)
 
 
 @router.post("/{group_id}/members", response_model=GroupMemberRead, status_code=status.HTTP_201_CREATED)
@@ -97,7 +195,7 @@ async def add_member(
     payload: GroupMemberCreate,
     current_user: Profile = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
-) -> GroupMemberRead:
+) -> GroupMember:
     group = await group_service.get_group(session, group_id)
     if group is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
@@ -115,7 +213,7 @@ async def add_member(
     await session.commit()
     await session.refresh(member)
 
-    return GroupMemberRead.model_validate(member)
+    return member
 
 
 @router.patch("/{group_id}/members/{membership_id}", response_model=GroupMemberRead)
@@ -125,7 +223,7 @@ async def update_member(
     payload: GroupMemberUpdate,
     current_user: Profile = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
-) -> GroupMemberRead:
+) -> GroupMember:
     membership = await group_service.get_membership_by_id(session, membership_id)
     if membership is None or membership.group_id != group_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Membership not found")
@@ -144,7 +242,7 @@ async def update_member(
     await session.commit()
     await session.refresh(updated)
 
-    return GroupMemberRead.model_validate(updated)
+    return updated
 
 
 @router.delete("/{group_id}/members/{membership_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -193,17 +291,163 @@ async def invite_member(
     return {"status": "invited"}
 
 
+@router.post("/{group_id}:bulk-invite", response_model=GroupBulkInviteResult)
+async def bulk_invite(
+    group_id: uuid.UUID,
+    payload: GroupBulkInvite,
+    current_user: Profile = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
+) -> dict[str, list]:
+    # Only name and status are needed, so skip get_group's member and session loading.
+    group = await session.get(Group, group_id)
+    if group is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+
+    try:
+        await group_service.require_admin(session, group_id, current_user.id)
+    except PermissionError:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin rights required")
+
+    try:
+        outcome = await group_service.invite_many(
+            session, group, current_user, emails=payload.emails, user_ids=payload.user_ids
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    await session.commit()
+
+    return outcome
+
+
 @router.get("/{group_id}/progress/current", response_model=list[GroupProgressRow])
 async def get_progress(
     group_id: uuid.UUID,
+    request: Request,
     current_user: Profile = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db),
-) -> list[GroupProgressRow]:
-    group = await group_service.get_group(session, group_id)
+    session: AsyncSession = Depends(get_read_db),
+) -> Response:
+    version = await _member_group_version(session, group_id, current_user.id)
+    validators = _group_validators(request, group_id, version, "progress")
+    if conditional.is_fresh(request, validators):
+        return conditional.not_modified(validators)
+
+    async def render() -> bytes:
+        rows = await group_service.fetch_progress(session, group_id, version["current_window"])
+        return _progress_rows.dump_json(_progress_rows.validate_python(rows))
+
+    return _cached_json(await progress_cache.get_or_compute(validators.etag, render), validators)
+
+
+async def _history_group(session: AsyncSession, group_id: uuid.UUID) -> Group:
+    # Only the cold-storage flag is needed, so skip get_group's member and session loading.
+    group = await session.get(Group, group_id)
     if group is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
-    if all(member.user_id != current_user.id for member in group.members):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this group")
+    return group
+
+
+@router.get("/{group_id}/progress/history", response_model=list[GroupProgressRow])
+async def get_progress_history(
+    group_id: uuid.UUID,
+    request: Request,
+    current_user: Profile = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_db),
+) -> Response:
+    version = await _member_group_version(session, group_id, current_user.id)
+    validators = _group_validators(request, group_id, version, "history")
+    if conditional.is_fresh(request, validators):
+        return conditional.not_modified(validators)
+
+    async def render() -> bytes:
+        group = await _history_group(session, group_id)
+        rows = await group_service.fetch_progress_history(session, group)
+        return _progress_rows.dump_json(_progress_rows.validate_python(rows))
+
+    return _cached_json(await history_cache.get_or_compute(validators.etag, render), validators)
+
+
+@router.get("/{group_id}/progress/streaks", response_model=list[GroupStreakRow])
+async def get_progress_streaks(
+    group_id: uuid.UUID,
+    request: Request,
+    current_user: Profile = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Current and best run of consecutive periods with the goal met, per member."""
+    version = await _member_group_version(session, group_id, current_user.id)
+    validators = _group_validators(request, group_id, version, "streaks")
+    if conditional.is_fresh(request, validators):
+        return conditional.not_modified(validators)
+
+    async def render() -> bytes:
+        group = await _history_group(session, group_id)
+        rows = await group_service.fetch_streaks(session, group)
+        return _streak_rows.dump_json(_streak_rows.validate_python(rows))
+
+    return _cached_json(await streaks_cache.get_or_compute(validators.etag, render), validators)
 
-    rows = await group_service.fetch_progress(session, group_id)
-    return [GroupProgressRow.model_validate(row) for row in rows]
+
+_EXPORT_MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+
+async def _export(
+    session: AsyncSession,
+    current_user: Profile,
+    group_id: uuid.UUID,
+    kind: str,
+    export_format: str,
+    since: datetime | None,
+    until: datetime | None,
+) -> StreamingResponse:
+    if since is not None and until is not None and since >= until:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="since must be before until")
+
+    # Only summarized_at is needed to pick the source tables.
+    group = await session.get(Group, group_id)
+    if group is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+
+    try:
+        await group_service.require_admin(session, group_id, current_user.id)
+    except PermissionError:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin rights required")
+
+    if kind == "time-logs":
+        columns = export_service.TIME_LOG_COLUMNS
+        batches = export_service.stream_time_logs(session, group, since=since, until=until)
+    else:
+        columns = export_service.PROGRESS_COLUMNS
+        batches = export_service.stream_progress(session, group, since=since, until=until)
+    encode = export_service.encode_csv if export_format == "csv" else export_service.encode_ndjson
+    # The session stays open until the last batch is sent; the cursor is read as the client drains.
+    return StreamingResponse(
+        encode(columns, batches),
+        media_type=_EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="group-{group_id}-{kind}.{export_format}"'},
+    )
+
+
+@router.get("/{group_id}/export/time-logs", response_class=StreamingResponse)
+async def export_time_logs(
+    group_id: uuid.UUID,
+    export_format: Literal["csv", "ndjson"] = Query("csv", alias="format"),
+    since: datetime | None = None,
+    until: datetime | None = None,
+    current_user: Profile = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_db),
+) -> StreamingResponse:
+    """Every time log started in [since, until), oldest first; owners and admins only."""
+    return await _export(session, current_user, group_id, "time-logs", export_format, since, until)
+
+
+@router.get("/{group_id}/export/progress", response_class=StreamingResponse)
+async def export_progress(
+    group_id: uuid.UUID,
+    export_format: Literal["csv", "ndjson"] = Query("csv", alias="format"),
+    since: datetime | None = None,
+    until: datetime | None = None,
+    current_user: Profile = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_db),
+) -> StreamingResponse:
+    """Per-member totals for every period starting in [since, until); owners and admins only."""
+    return await _export(session, current_user, group_id, "progress", export_format, since, until)
@@ -1,7 +1,31 @@
-from fastapi import APIRouter
+import asyncio
+
+from fastapi import APIRouter, HTTPException, status
+from sqlalchemy import text
+
+from app.core.config import get_settings
+from app.core.database import get_engine, pool_stats
 
 router = APIRouter(prefix="/api", tags=["health"])
 
 @router.get("/healthz")
 async def healthcheck() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@router.get("/healthz/pool")
+async def pool_status() -> dict[str, object]:
+    return pool_stats()
+
+
+@router.get("/readyz")
+async def readiness() -> dict[str, str]:
+    async def ping() -> None:
+        async with get_engine().connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    try:
+        await asyncio.wait_for(ping(), get_settings().readiness_timeout_seconds)
+    except Exception as exc:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Database unavailable") from exc
+    return {"status": "ready"}
@@ -2,11 +2,11 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
 
 from app.core.database import get_db
 from app.dependencies.auth import get_current_user
 from app.models import Profile
+from app.services import maintenance_service
 
 router = APIRouter(prefix="/api/maintenance", tags=["maintenance"])
 
@@ -17,7 +17,40 @@ async def archive_expired_groups(
     session: AsyncSession = Depends(get_db),
 ) -> dict[str, int]:
     # In a real app, restrict to admins / cron jobs.
-    result = await session.execute(text("SELECT archive_expired_groups() AS affected"))
-    row = result.mappings().first()
-    count = int(row["affected"]) if row else 0
+    count = await maintenance_service.run_job("archive_expired_groups", session)
     return {"archived": count}
+
+
+@router.post("/summarize-archived-groups")
+async def summarize_archived_groups(
+    current_user: Profile = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
+) -> dict[str, int]:
+    # In a real app, restrict to admins / cron jobs.
+    count = await maintenance_service.run_job("summarize_archived_groups", session)
+    return {"summarized": count}
+
+
+@router.post("/seal-period-rollups")
+async def seal_period_rollups(
+    current_user: Profile = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
+) -> dict[str, int]:
+    # In a real app, restrict to admins / cron jobs.
+    count = await maintenance_service.run_job("seal_period_rollups", session)
+    return {"sealed": count}
+
+
+@router.post("/purge-notifications")
+async def purge_notifications(
+    current_user: Profile = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
+) -> dict[str, int]:
+    # In a real app, restrict to admins / cron jobs.
+    count = await maintenance_service.run_job("purge_notifications", session)
+    return {"purged": count}
+
+
+@router.get("/status")
+async def maintenance_status(current_user: Profile = Depends(get_current_user)) -> dict[str, object]:
+    return maintenance_service.snapshot()
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core import admission, cache, database, security
+from app.core.metrics import format_histogram, format_sample, request_metrics
+from app.services import avatar_service, maintenance_service
+
+router = APIRouter(tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _pool_lines() -> list[str]:
+    pools = [("primary", database.get_engine(), database.pool_wait_seconds)]
+    replica_engine = database.get_replica_engine()
+    if replica_engine is not None:
+        pools.append(("replica", replica_engine, database.replica_pool_wait_seconds))
+
+    lines = ["# TYPE lockin_db_pool_connections gauge"]
+    for name, engine, _ in pools:
+        pool = engine.sync_engine.pool
+        for state, value in (
+            ("checked_out", pool.checkedout()),
+            ("checked_in", pool.checkedin()),
+            ("overflow", pool.overflow()),
+            ("size", pool.size()),
+        ):
+            lines.append(format_sample("lockin_db_pool_connections", value, {"pool": name, "state": state}))
+    lines.append("# TYPE lockin_db_pool_wait_seconds histogram")
+    for name, _, histogram in pools:
+        lines.extend(format_histogram("lockin_db_pool_wait_seconds", histogram, {"pool": name}))
+    return lines
+
+
+def _auth_lines() -> list[str]:
+    lines = [
+        "# TYPE lockin_token_cache_hits_total counter",
+        format_sample("lockin_token_cache_hits_total", security.token_cache_hits),
+        "# TYPE lockin_token_cache_misses_total counter",
+        format_sample("lockin_token_cache_misses_total", security.token_cache_misses),
+    ]
+    age = security.jwks_cache_age()
+    if age is not None:
+        lines += ["# TYPE lockin_jwks_cache_age_seconds gauge", format_sample("lockin_jwks_cache_age_seconds", age)]
+    return lines
+
+
+def _maintenance_lines() -> list[str]:
+    snapshot = maintenance_service.snapshot()
+    lines = [
+        "# TYPE lockin_maintenance_skipped_runs_total counter",
+        format_sample("lockin_maintenance_skipped_runs_total", snapshot["skipped_runs"]),
+    ]
+    for metric, field, kind in (
+        ("lockin_maintenance_job_runs_total", "runs", "counter"),
+        ("lockin_maintenance_job_failures_total", "failures", "counter"),
+        ("lockin_maintenance_job_rows_total", "rows_total", "counter"),
+        ("lockin_maintenance_job_last_duration_seconds", "last_duration_seconds", "gauge"),
+    ):
+        lines.append(f"# TYPE {metric} {kind}")
+        for job, stats in snapshot["jobs"].items():
+            lines.append(format_sample(metric, stats[field], {"job": job}))
+    return lines
+
+
+def _cache_lines() -> list[str]:
+    snapshots = {name: response_cache.snapshot() for name, response_cache in cache.caches.items()}
+    lines = []
+    for metric, field, kind in (
+        ("lockin_response_cache_hits_total", "hits", "counter"),
+        ("lockin_response_cache_shared_hits_total", "shared_hits", "counter"),
+        ("lockin_response_cache_misses_total", "misses", "counter"),
+        ("lockin_response_cache_coalesced_total", "coalesced", "counter"),
+        ("lockin_response_cache_evictions_total", "evictions", "counter"),
+        ("lockin_response_cache_entries", "entries", "gauge"),
+        ("lockin_response_cache_bytes", "bytes", "gauge"),
+    ):
+        lines.append(f"# TYPE {metric} {kind}")
+        for name, snapshot in snapshots.items():
+            lines.append(format_sample(metric, snapshot[field], {"cache": name}))
+    return lines
+
+
+def _admission_lines() -> list[str]:
+    limiter = admission.get_db_limiter()
+    lines = [
+        "# TYPE lockin_db_admission_active gauge",
+        format_sample("lockin_db_admission_active", limiter.active),
+        "# TYPE lockin_db_admission_waiting gauge",
+        format_sample("lockin_db_admission_waiting", limiter.waiting),
+        "# TYPE lockin_db_admission_shed_total counter",
+    ]
+    lines += [
+        format_sample("lockin_db_admission_shed_total", count, {"reason": reason})
+        for reason, count in limiter.shed.items()
+    ]
+    lines.append("# TYPE lockin_db_admission_wait_seconds histogram")
+    lines.extend(format_histogram("lockin_db_admission_wait_seconds", limiter.wait_seconds))
+    rate_limiter = admission.get_rate_limiter()
+    if rate_limiter is not None:
+        lines += [
+            "# TYPE lockin_rate_limit_decisions_total counter",
+            format_sample("lockin_rate_limit_decisions_total", rate_limiter.allowed, {"outcome": "allowed"}),
+            format_sample("lockin_rate_limit_decisions_total", rate_limiter.limited, {"outcome": "limited"}),
+        ]
+    return lines
+
+
+def _avatar_lines() -> list[str]:
+    lines = ["# TYPE lockin_avatar_uploads_total counter"]
+    lines += [
+        format_sample("lockin_avatar_uploads_total", count, {"outcome": outcome})
+        for outcome, count in avatar_service.snapshot().items()
+    ]
+    lines.append("# TYPE lockin_avatar_processing_seconds histogram")
+    lines.extend(format_histogram("lockin_avatar_processing_seconds", avatar_service.stats.processing_seconds))
+    return lines
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    lines = (
+        request_metrics.render()
+        + _pool_lines()
+        + _auth_lines()
+        + _admission_lines()
+        + _cache_lines()
+        + _maintenance_lines()
+        + _avatar_lines()
+    )
+    return PlainTextResponse("\n".join(lines) + "\n", media_type=PROMETHEUS_CONTENT_TYPE)
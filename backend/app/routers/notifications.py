@@ -1,14 +1,21 @@
 from __future__ import annotations
 
+import contextlib
 import uuid
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import conditional
 from app.core.database import get_db
+from app.core.events import notification_bus
+from app.core.fieldsets import FieldSet
 from app.dependencies.auth import get_current_user
-from app.models import Profile
+from app.dependencies.database import get_read_db, read_session
+from app.dependencies.fieldsets import sparse_fields
+from app.middleware.admission import SLOT_SCOPE_KEY
+from app.models import Notification, Profile
 from app.models.enums import NotificationKind, NotificationStatus
 from app.schemas.notification import NotificationRead
 from app.services import group_service, notification_service
@@ -18,34 +25,72 @@ router = APIRouter(prefix="/api/notifications", tags=["notifications"])
 
 @router.get("", response_model=list[NotificationRead])
 async def list_notifications(
+    request: Request,
+    response: Response,
     unread: bool | None = Query(default=None),
     cursor_created_at: datetime | None = Query(default=None),
     cursor_id: uuid.UUID | None = Query(default=None),
+    since_created_at: datetime | None = Query(default=None),
+    since_id: uuid.UUID | None = Query(default=None),
+    wait: int | None = Query(default=None, ge=1, le=60),
     limit: int = Query(default=20, ge=1, le=100),
+    fieldset: FieldSet = Depends(sparse_fields(NotificationRead)),
     current_user: Profile = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
-) -> list[NotificationRead]:
-    rows = await notification_service.list_notifications(
-        session,
-        current_user.id,
-        unread=unread,
-        cursor_created_at=cursor_created_at,
-        cursor_id=cursor_id,
-        limit=limit,
-    )
-    return [NotificationRead.model_validate(row) for row in rows]
+) -> list[Notification] | Response:
+    async def fetch(session: AsyncSession) -> list[Notification]:
+        return await notification_service.list_notifications(
+            session,
+            current_user.id,
+            unread=unread,
+            cursor_created_at=cursor_created_at,
+            cursor_id=cursor_id,
+            since_created_at=since_created_at,
+            since_id=since_id,
+            limit=limit,
+            fieldset=fieldset,
+        )
+
+    if wait is None:
+        # Routed like get_read_db. Long-polls below stay on the primary: the commit that wakes
+        # them is there, and a lagging replica could still answer [] after the wakeup.
+        async with read_session(current_user.id, session) as routed:
+            version = await notification_service.get_recipient_version(routed, current_user.id)
+            validators = conditional.Validators.build(
+                "notifications",
+                current_user.id,
+                version["version"],
+                conditional.query_variant(request),
+                last_modified=version["changed_at"],
+            )
+            if conditional.is_fresh(request, validators):
+                return conditional.not_modified(validators)
+            return conditional.attach(fieldset.render(await fetch(routed)), response, validators)
+
+    with notification_bus.subscribe(current_user.id) as subscription:
+        rows = await fetch(session)
+        if not rows:
+            # Hand the pooled connection and the admission slot back while parked; expire_on_commit is off.
+            await session.commit()
+            slot = request.scope.get(SLOT_SCOPE_KEY)
+            async with slot.parked() if slot is not None else contextlib.nullcontext():
+                woke = await subscription.wait(wait)
+            if woke:
+                rows = await fetch(session)
+    return fieldset.render(rows)
 
 
 @router.get("/{notification_id}", response_model=NotificationRead)
 async def get_notification_detail(
     notification_id: uuid.UUID,
+    fieldset: FieldSet = Depends(sparse_fields(NotificationRead)),
     current_user: Profile = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db),
-) -> NotificationRead:
-    notification = await notification_service.get_notification(session, notification_id, current_user.id)
+    session: AsyncSession = Depends(get_read_db),
+) -> Notification | Response:
+    notification = await notification_service.get_notification(session, notification_id, current_user.id, fieldset)
     if notification is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Notification not found")
-    return NotificationRead.model_validate(notification)
+    return fieldset.render(notification)
 
 
 @router.post("/{notification_id}:read", response_model=NotificationRead)
@@ -53,14 +98,14 @@ async def mark_read(
     notification_id: uuid.UUID,
     current_user: Profile = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
-) -> NotificationRead:
+) -> Notification:
     notification = await notification_service.get_notification(session, notification_id, current_user.id)
     if notification is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Notification not found")
 
     async with session.begin():
         updated = await notification_service.mark_read(session, notification)
-    return NotificationRead.model_validate(updated)
+    return updated
 
 
 async def _ensure_invite(notification) -> None:
@@ -77,7 +122,7 @@ async def accept_invite(
     notification_id: uuid.UUID,
     current_user: Profile = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
-) -> NotificationRead:
+) -> Notification:
     notification = await notification_service.get_notification(session, notification_id, current_user.id)
     if notification is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Notification not found")
@@ -94,7 +139,7 @@ async def accept_invite(
             pass
         updated = await notification_service.update_status(session, notification, NotificationStatus.ACCEPTED)
 
-    return NotificationRead.model_validate(updated)
+    return updated
 
 
 @router.post("/{notification_id}:decline", response_model=NotificationRead)
@@ -102,7 +147,7 @@ async def decline_invite(
     notification_id: uuid.UUID,
     current_user: Profile = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
-) -> NotificationRead:
+) -> Notification:
     notification = await notification_service.get_notification(session, notification_id, current_user.id)
     if notification is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Notification not found")
@@ -111,4 +156,4 @@ async def decline_invite(
     async with session.begin():
         updated = await notification_service.update_status(session, notification, NotificationStatus.DECLINED)
 
-    return NotificationRead.model_validate(updated)
+    return updated
@@ -1,19 +1,75 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import contextlib
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.dependencies.auth import get_current_user
+from app.dependencies.database import read_session_factory
+from app.middleware.admission import SLOT_SCOPE_KEY
 from app.models import Profile
+from app.models.enums import GroupStatus
+from app.schemas.home import HomeFeed
 from app.schemas.profile import ProfileRead, ProfileUpdate
+from app.services import group_service, notification_service
+
+T = TypeVar("T")
 
 router = APIRouter(prefix="/api/me", tags=["profile"])
 
 
 @router.get("", response_model=ProfileRead)
-async def read_me(current_user: Profile = Depends(get_current_user)) -> ProfileRead:
-    return ProfileRead.model_validate(current_user)
+async def read_me(current_user: Profile = Depends(get_current_user)) -> Profile:
+    return current_user
+
+
+@router.get("/home", response_model=HomeFeed)
+async def read_home(
+    request: Request,
+    notifications_limit: int = Query(default=20, ge=1, le=100),
+    current_user: Profile = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
+) -> dict[str, object]:
+    """Everything the app shows on launch in one roundtrip.
+
+    The four reads are independent once the profile is known, so each runs on its own pooled
+    connection and the response waits only for the slowest of them. Every connection beyond the
+    first needs an admission slot of its own; when none are free the reads share one.
+    """
+    # Hand back the connection used for authentication; the reads below bring their own.
+    await session.commit()
+    factory = await read_session_factory(current_user.id)
+    slot = request.scope.get(SLOT_SCOPE_KEY)
+
+    async with slot.extra(3) if slot is not None else contextlib.nullcontext(3) as extra:
+        connections = asyncio.Semaphore(1 + extra)
+
+        async def run(query: Callable[[AsyncSession], Awaitable[T]]) -> T:
+            async with connections, factory() as read_session:
+                return await query(read_session)
+
+        groups, progress, unread_count, notifications = await asyncio.gather(
+            run(lambda s: group_service.list_groups_for_user(s, current_user.id, status=GroupStatus.ACTIVE)),
+            run(lambda s: group_service.fetch_member_progress(s, current_user.id)),
+            run(lambda s: notification_service.count_unread(s, current_user.id)),
+            run(lambda s: notification_service.list_notifications(s, current_user.id, limit=notifications_limit)),
+        )
+
+    progress_by_group: defaultdict[object, list[dict[str, object]]] = defaultdict(list)
+    for row in progress:
+        progress_by_group[row["group_id"]].append(row)
+    return {
+        "profile": current_user,
+        "groups": [{"group": group, "progress": progress_by_group[group.id]} for group in groups],
+        "unread_count": unread_count,
+        "notifications": notifications,
+    }
 
 
 @router.patch("", response_model=ProfileRead)
@@ -21,13 +77,15 @@ async def update_me(
     payload: ProfileUpdate,
     session: AsyncSession = Depends(get_db),
     current_user: Profile = Depends(get_current_user),
-) -> ProfileRead:
+) -> Profile:
     if payload.display_name is not None:
         current_user.display_name = payload.display_name
     if payload.avatar_url is not None:
+        # A URL set directly is served as-is; only uploads through /api/profiles/avatar get thumbnails.
         current_user.avatar_url = payload.avatar_url
+        current_user.avatar_key = None
 
     session.add(current_user)
     await session.commit()
     await session.refresh(current_user)
-    return ProfileRead.model_validate(current_user)
+    return current_user
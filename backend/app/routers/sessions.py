@@ -3,12 +3,15 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.fieldsets import FieldSet
 from app.dependencies.auth import get_current_user
-from app.models import Profile
+from app.dependencies.database import get_read_db
+from app.dependencies.fieldsets import sparse_fields
+from app.models import Profile, Session, SessionParticipant
 from app.models.enums import SessionStatus
 from app.schemas.session import (
     SessionCreate,
@@ -27,7 +30,7 @@ async def create_session(
     payload: SessionCreate,
     current_user: Profile = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
-) -> SessionRead:
+) -> Session:
     if payload.group_id:
         group = await group_service.get_group(session, payload.group_id)
         if group is None:
@@ -45,25 +48,26 @@ async def create_session(
     db_session = await session_service.get_session(session, created.id)
     if db_session is None:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Session creation failed")
-    return SessionRead.model_validate(db_session)
+    return db_session
 
 
 @router.get("/{session_id}", response_model=SessionRead)
 async def get_session(
     session_id: uuid.UUID,
+    fieldset: FieldSet = Depends(sparse_fields(SessionRead)),
     current_user: Profile = Depends(get_current_user),
-    session: AsyncSession = Depends(get_db),
-) -> SessionRead:
-    db_session = await session_service.get_session(session, session_id)
+    session: AsyncSession = Depends(get_read_db),
+) -> Session | Response:
+    db_session = await session_service.get_session(session, session_id, fieldset)
     if db_session is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
 
     if db_session.group_id:
-        group = await group_service.get_group(session, db_session.group_id)
-        if group is None or all(member.user_id != current_user.id for member in group.members):
+        membership = await group_service.get_group_member_by_user(session, db_session.group_id, current_user.id)
+        if membership is None:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed")
 
-    return SessionRead.model_validate(db_session)
+    return fieldset.render(db_session)
 
 
 @router.post("/{session_id}:status", response_model=SessionRead)
@@ -72,7 +76,7 @@ async def update_session_status(
     payload: SessionStatusUpdate,
     current_user: Profile = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
-) -> SessionRead:
+) -> Session:
     db_session = await session_service.get_session(session, session_id)
     if db_session is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
@@ -87,7 +91,7 @@ async def update_session_status(
     refreshed = await session_service.get_session(session, session_id)
     if refreshed is None:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Session update failed")
-    return SessionRead.model_validate(refreshed)
+    return refreshed
 
 
 @router.post("/{session_id}/participants", response_model=SessionParticipantRead, status_code=status.HTTP_201_CREATED)
@@ -95,7 +99,7 @@ async def ensure_participant(
     session_id: uuid.UUID,
     current_user: Profile = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
-) -> SessionParticipantRead:
+) -> SessionParticipant:
     db_session = await session_service.get_session(session, session_id)
     if db_session is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
@@ -107,7 +111,7 @@ async def ensure_participant(
 
     participant = await session_service.ensure_participant(session, session_id, current_user.id)
     await session.commit()
-    return SessionParticipantRead.model_validate(participant)
+    return participant
 
 
 @router.post("/{session_id}/logs", status_code=status.HTTP_201_CREATED)
@@ -1,7 +1,14 @@
 from __future__ import annotations
 
-from pydantic import BaseModel, ConfigDict
+from typing import Annotated
+
+from pydantic import BaseModel, ConfigDict, WithJsonSchema
 
 
 class ORMModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
+
+
+# Emails read back from our own rows: documented as ``format: email`` but not re-run through
+# email-validator, which costs ~30µs per address and dominated serializing member lists.
+StoredEmail = Annotated[str, WithJsonSchema({"type": "string", "format": "email"})]
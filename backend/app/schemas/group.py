@@ -22,6 +22,10 @@ class GroupRead(ORMModel):
     status: GroupStatus
     created_at: datetime
     updated_at: datetime
+    summarized_at: datetime | None = None
+    member_count: int
+    active_session_count: int
+    total_seconds: int
     members: list[GroupMemberRead] = []
     sessions: list[SessionRead] = []
 
@@ -49,3 +53,16 @@ class GroupListItem(ORMModel):
     status: GroupStatus
     created_at: datetime
     updated_at: datetime
+
+
+# Notifications embed GroupListItem and are revalidated only when its columns change (see
+# trg_touch_group_recipient_versions); the counters move on every time log, so they stay out of it.
+class GroupOverview(GroupListItem):
+    member_count: int
+    active_session_count: int
+    total_seconds: int
+
+
+class GroupSearchHit(GroupOverview):
+    # Pass the last hit's rank and id back as cursor_rank / cursor_id for the next page.
+    rank: float
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from app.schemas.base import ORMModel
+from app.schemas.group import GroupListItem
+from app.schemas.notification import NotificationRead
+from app.schemas.profile import ProfileRead
+from app.schemas.progress import GroupProgressRow
+
+
+class HomeGroup(ORMModel):
+    group: GroupListItem
+    progress: list[GroupProgressRow]
+
+
+class HomeFeed(ORMModel):
+    profile: ProfileRead
+    groups: list[HomeGroup]
+    unread_count: int
+    notifications: list[NotificationRead]
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import uuid
+from datetime import datetime
+
+from pydantic import EmailStr, Field, model_validator
 
 from app.models.enums import MemberRole
 from app.schemas.base import ORMModel
@@ -13,6 +16,8 @@ class GroupMemberRead(ORMModel):
     user_id: uuid.UUID
     role: MemberRole
     override_period_target_minutes: int | None
+    # Pass the last member's created_at and id back as cursor_created_at / cursor_id for the next page.
+    created_at: datetime
     user: ProfileRead | None = None
 
 
@@ -25,3 +30,25 @@ class GroupMemberCreate(ORMModel):
 class GroupMemberUpdate(ORMModel):
     role: MemberRole | None = None
     override_period_target_minutes: int | None = None
+
+
+MAX_BULK_INVITES = 100
+
+
+class GroupBulkInvite(ORMModel):
+    emails: list[EmailStr] = Field(default_factory=list, max_length=MAX_BULK_INVITES)
+    user_ids: list[uuid.UUID] = Field(default_factory=list, max_length=MAX_BULK_INVITES)
+
+    @model_validator(mode="after")
+    def _not_empty(self) -> GroupBulkInvite:
+        if not self.emails and not self.user_ids:
+            raise ValueError("Provide at least one email or user_id")
+        return self
+
+
+class GroupBulkInviteResult(ORMModel):
+    invited: list[uuid.UUID]
+    already_members: list[uuid.UUID]
+    already_invited: list[uuid.UUID]
+    # Emails and ids that match no profile, as sent.
+    not_found: list[str]
@@ -1,19 +1,47 @@
 from __future__ import annotations
 
 import uuid
+from datetime import datetime
+from typing import Literal
 
-from pydantic import EmailStr
-
-from app.schemas.base import ORMModel
+from app.models.enums import AvatarUploadStatus
+from app.schemas.base import ORMModel, StoredEmail
 
 
 class ProfileRead(ORMModel):
     id: uuid.UUID
-    email: EmailStr
+    email: StoredEmail
     display_name: str | None = None
+    # Thumbnail URL once an uploaded avatar has been processed.
     avatar_url: str | None = None
 
 
 class ProfileUpdate(ORMModel):
     display_name: str | None = None
     avatar_url: str | None = None
+
+
+class AvatarUploadRequest(ORMModel):
+    content_type: Literal["image/jpeg", "image/png", "image/webp", "image/gif"]
+
+
+class AvatarUploadTicket(ORMModel):
+    """Presigned POST: send ``fields`` plus the file (last) as multipart form data to ``url``."""
+
+    key: str
+    url: str
+    fields: dict[str, str]
+    max_bytes: int
+    expires_at: datetime
+
+
+class AvatarUploadComplete(ORMModel):
+    key: str
+
+
+class AvatarUploadRead(ORMModel):
+    id: uuid.UUID
+    status: AvatarUploadStatus
+    error: str | None = None
+    created_at: datetime
+    processed_at: datetime | None = None
@@ -14,3 +14,12 @@ class GroupProgressRow(ORMModel):
     seconds_done: int
     target_minutes: int
     goal_met: bool
+
+
+class GroupStreakRow(ORMModel):
+    group_id: uuid.UUID
+    user_id: uuid.UUID
+    current_streak: int
+    best_streak: int
+    periods_met: int
+    periods_completed: int
@@ -1,3 +1,10 @@
-from . import auth_service, group_service, notification_service, profile_service
+from . import auth_service, avatar_service, group_service, maintenance_service, notification_service, profile_service
 
-__all__ = ["auth_service", "group_service", "profile_service", "notification_service"]
+__all__ = [
+    "auth_service",
+    "avatar_service",
+    "group_service",
+    "profile_service",
+    "notification_service",
+    "maintenance_service",
+]
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import io
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import get_settings
+from app.core.database import get_session_factory
+from app.core.metrics import Histogram
+from app.core.storage import ObjectMissing, ObjectStorage, ObjectTooLarge
+from app.models import AvatarUpload
+from app.models.enums import AvatarUploadStatus
+
+logger = logging.getLogger(__name__)
+
+ORIGINALS_PREFIX = "avatars/originals"
+THUMBNAILS_PREFIX = "avatars/thumbnails"
+# Thumbnail keys are unique per upload, so clients and CDNs may cache them forever.
+THUMBNAIL_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# A worker that died mid-upload leaves its row in 'processing'; another claims it after this long.
+STALE_CLAIM_SECONDS = 300
+ALLOWED_FORMATS = {"JPEG", "PNG", "WEBP", "GIF", "MPO"}  # MPO: multi-picture JPEGs from phone cameras
+
+
+class AvatarRejected(ValueError):
+    """The upload can never produce a thumbnail; retrying would not help."""
+
+
+def original_prefix(profile_id: uuid.UUID) -> str:
+    return f"{ORIGINALS_PREFIX}/{profile_id}/"
+
+
+async def request_upload(storage: ObjectStorage, profile_id: uuid.UUID, content_type: str) -> dict[str, object]:
+    settings = get_settings()
+    key = f"{original_prefix(profile_id)}{uuid.uuid4().hex}"
+    presigned = await storage.presigned_post(
+        key,
+        content_type=content_type,
+        max_bytes=settings.avatar_max_upload_bytes,
+        expires_in=settings.avatar_upload_expires_seconds,
+    )
+    return {
+        "key": key,
+        "url": presigned["url"],
+        "fields": presigned["fields"],
+        "max_bytes": settings.avatar_max_upload_bytes,
+        "expires_at": datetime.now(timezone.utc) + timedelta(seconds=settings.avatar_upload_expires_seconds),
+    }
+
+
+async def register_upload(session, profile_id: uuid.UUID, key: str) -> AvatarUpload:
+    """Queue ``key`` for thumbnailing; registering the same key twice returns the existing row."""
+    name = key.removeprefix(original_prefix(profile_id))
+    if name == key or not name or "/" in name:
+        raise PermissionError("Upload key does not belong to this profile")
+
+    await session.execute(
+        insert(AvatarUpload)
+        .values(profile_id=profile_id, source_key=key)
+        .on_conflict_do_nothing(index_elements=[AvatarUpload.source_key])
+    )
+    upload = await session.scalar(select(AvatarUpload).where(AvatarUpload.source_key == key))
+    await session.commit()
+    if upload.status is AvatarUploadStatus.PENDING:
+        wake_worker()
+    return upload
+
+
+async def get_upload(session, profile_id: uuid.UUID, upload_id: uuid.UUID) -> AvatarUpload | None:
+    return await session.scalar(
+        select(AvatarUpload).where(AvatarUpload.id == upload_id, AvatarUpload.profile_id == profile_id)
+    )
+
+
+def make_thumbnail(data: bytes, *, size: int, quality: int, max_pixels: int) -> bytes:
+    """Square ``size``×``size`` JPEG, centre-cropped and upright. CPU-bound: call off the loop."""
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            if image.format not in ALLOWED_FORMATS:
+                raise AvatarRejected(f"Unsupported image format: {image.format}")
+            width, height = image.size
+            if width * height > max_pixels:
+                raise AvatarRejected(f"Image is too large: {width}x{height}")
+            # JPEGs decode straight to a reduced scale, which is most of the work for camera photos.
+            image.draft("RGB", (size * 2, size * 2))
+            image = ImageOps.exif_transpose(image)
+            if image.mode in ("RGBA", "LA", "P"):
+                image = image.convert("RGBA")
+                background = Image.new("RGBA", image.size, (255, 255, 255, 255))
+                image = Image.alpha_composite(background, image)
+            thumbnail = ImageOps.fit(image.convert("RGB"), (size, size), Image.Resampling.LANCZOS)
+    except (UnidentifiedImageError, Image.DecompressionBombError) as exc:
+        raise AvatarRejected(str(exc)) from None
+    except OSError as exc:  # truncated or corrupt image data
+        raise AvatarRejected(f"Unreadable image: {exc}") from None
+
+    out = io.BytesIO()
+    thumbnail.save(out, "JPEG", quality=quality, optimize=True, progressive=True)
+    return out.getvalue()
+
+
+# ---------- worker ----------
+@dataclass
+class WorkerStats:
+    done: int = 0
+    superseded: int = 0
+    failed: int = 0
+    retried: int = 0
+    processing_seconds: Histogram = field(default_factory=Histogram)
+
+
+stats = WorkerStats()
+_wakeup = asyncio.Event()
+
+_CLAIM = text(
+    """
+UPDATE avatar_uploads u
+   SET status = 'processing', attempts = u.attempts + 1, claimed_at = now()
+  FROM (
+    SELECT id FROM avatar_uploads
+     WHERE status = 'pending'
+        OR (status = 'processing' AND claimed_at < now() - make_interval(secs => :stale))
+     ORDER BY created_at
+     LIMIT 1
+     FOR UPDATE SKIP LOCKED
+  ) next
+ WHERE u.id = next.id
+RETURNING u.id, u.profile_id, u.source_key, u.attempts, u.created_at
+"""
+)
+
+_FINISH = text(
+    """
+UPDATE avatar_uploads
+   SET status = CAST(:status AS avatar_upload_status), thumbnail_key = :thumbnail_key, error = :error,
+       processed_at = CASE WHEN :status = 'pending' THEN NULL ELSE now() END
+ WHERE id = :id
+"""
+)
+
+# Uploads can finish out of order; never replace a thumbnail from a newer upload.
+_APPLY = text(
+    """
+UPDATE profiles p
+   SET avatar_url = :avatar_url, avatar_key = :thumbnail_key
+ WHERE p.id = :profile_id
+   AND NOT EXISTS (
+     SELECT 1 FROM avatar_uploads n
+      WHERE n.profile_id = :profile_id AND n.status = 'done' AND n.created_at > :created_at
+   )
+"""
+)
+
+
+def wake_worker() -> None:
+    """Start on freshly registered uploads now instead of at the next poll."""
+    _wakeup.set()
+
+
+async def _finish(upload_id: uuid.UUID, status: AvatarUploadStatus, *, error: str | None = None) -> None:
+    async with get_session_factory()() as session:
+        await session.execute(
+            _FINISH, {"id": upload_id, "status": status.value, "thumbnail_key": None, "error": error}
+        )
+        await session.commit()
+
+
+async def _apply(storage: ObjectStorage, upload, thumbnail_key: str) -> AvatarUploadStatus:
+    async with get_session_factory()() as session:
+        previous_key = await session.scalar(
+            text("SELECT avatar_key FROM profiles WHERE id = :profile_id FOR UPDATE"),
+            {"profile_id": upload.profile_id},
+        )
+        result = await session.execute(
+            _APPLY,
+            {
+                "profile_id": upload.profile_id,
+                "avatar_url": storage.public_url(thumbnail_key),
+                "thumbnail_key": thumbnail_key,
+                "created_at": upload.created_at,
+            },
+        )
+        status = AvatarUploadStatus.DONE if result.rowcount else AvatarUploadStatus.SUPERSEDED
+        kept_key = thumbnail_key if status is AvatarUploadStatus.DONE else None
+        await session.execute(
+            _FINISH, {"id": upload.id, "status": status.value, "thumbnail_key": kept_key, "error": None}
+        )
+        await session.commit()
+
+    if status is AvatarUploadStatus.SUPERSEDED:
+        stale_key = thumbnail_key
+    else:
+        stale_key = previous_key if previous_key != thumbnail_key else None
+    if stale_key:
+        try:
+            await storage.delete(stale_key)
+        except Exception:
+            logger.warning("Could not delete replaced avatar thumbnail %s", stale_key, exc_info=True)
+    return status
+
+
+async def process_next_upload(storage: ObjectStorage) -> AvatarUploadStatus | None:
+    """Thumbnail the oldest queued upload; its new status, or None when the queue is empty."""
+    settings = get_settings()
+    async with get_session_factory()() as session:
+        upload = (await session.execute(_CLAIM, {"stale": STALE_CLAIM_SECONDS})).first()
+        await session.commit()
+    if upload is None:
+        return None
+    if upload.attempts > settings.avatar_worker_max_attempts:
+        stats.failed += 1
+        await _finish(upload.id, AvatarUploadStatus.FAILED, error="Gave up after repeated worker failures")
+        return AvatarUploadStatus.FAILED
+
+    started = time.perf_counter()
+    try:
+        source = await storage.get(upload.source_key, max_bytes=settings.avatar_max_upload_bytes)
+        thumbnail = await asyncio.to_thread(
+            make_thumbnail,
+            source,
+            size=settings.avatar_thumbnail_size,
+            quality=settings.avatar_thumbnail_quality,
+            max_pixels=settings.avatar_max_pixels,
+        )
+        thumbnail_key = f"{THUMBNAILS_PREFIX}/{upload.profile_id}/{upload.id}.jpg"
+        await storage.put(
+            thumbnail_key, thumbnail, content_type="image/jpeg", cache_control=THUMBNAIL_CACHE_CONTROL
+        )
+    except (AvatarRejected, ObjectMissing, ObjectTooLarge) as exc:
+        stats.failed += 1
+        message = {ObjectMissing: "Upload not found", ObjectTooLarge: "Upload is too large"}.get(type(exc), str(exc))
+        await _finish(upload.id, AvatarUploadStatus.FAILED, error=message)
+        return AvatarUploadStatus.FAILED
+    except Exception as exc:
+        logger.warning("Avatar upload %s failed (attempt %d)", upload.id, upload.attempts, exc_info=True)
+        if upload.attempts < settings.avatar_worker_max_attempts:
+            stats.retried += 1
+            status = AvatarUploadStatus.PENDING
+        else:
+            stats.failed += 1
+            status = AvatarUploadStatus.FAILED
+        await _finish(upload.id, status, error=repr(exc))
+        return status
+
+    status = await _apply(storage, upload, thumbnail_key)
+    stats.processing_seconds.observe(time.perf_counter() - started)
+    if status is AvatarUploadStatus.DONE:
+        stats.done += 1
+    else:
+        stats.superseded += 1
+    return status
+
+
+async def run_worker(storage: ObjectStorage, poll_seconds: float) -> None:
+    """Drain the queue, then sleep until woken or ``poll_seconds`` pass; every API worker runs one."""
+    while True:
+        _wakeup.clear()
+        try:
+            # A retry backs off until the next poll rather than spinning on a failing dependency.
+            while await process_next_upload(storage) not in (None, AvatarUploadStatus.PENDING):
+                pass
+        except Exception:
+            logger.exception("Avatar worker run failed")
+        with contextlib.suppress(TimeoutError):
+            async with asyncio.timeout(poll_seconds):
+                await _wakeup.wait()
+
+
+def snapshot() -> dict[str, int]:
+    return {"done": stats.done, "superseded": stats.superseded, "failed": stats.failed, "retried": stats.retried}
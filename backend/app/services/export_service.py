@@ -0,0 +1,135 @@
+"""Streaming exports of a group's time logs and per-period progress.
+
+Rows come off a server-side cursor ``EXPORT_BATCH_ROWS`` at a time and are encoded batch by
+batch, so API memory stays flat however large the group or the requested range is.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import uuid
+from collections.abc import AsyncIterator, Sequence
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy import text
+
+from app.models import Group
+
+EXPORT_BATCH_ROWS = 1000
+
+TIME_LOG_COLUMNS = (
+    "log_id",
+    "session_id",
+    "user_id",
+    "email",
+    "display_name",
+    "started_at",
+    "ended_at",
+    "seconds",
+)
+PROGRESS_COLUMNS = (
+    "user_id",
+    "email",
+    "display_name",
+    "period_start",
+    "period_end",
+    "seconds_done",
+    "target_minutes",
+    "goal_met",
+)
+
+_TIME_LOGS_SQL = """
+SELECT tl.id AS log_id, s.id AS session_id, sp.user_id, p.email, p.display_name,
+       tl.started_at, tl.ended_at, EXTRACT(EPOCH FROM tl.ended_at - tl.started_at)::bigint AS seconds
+  FROM {sessions} s
+  JOIN {participants} sp ON sp.session_id = s.id
+  JOIN {logs} tl ON tl.participant_id = sp.id
+  JOIN profiles p ON p.id = sp.user_id
+ WHERE s.group_id = :group_id
+   AND tl.started_at >= COALESCE(CAST(:since AS timestamptz), '-infinity')
+   AND tl.started_at <  COALESCE(CAST(:until AS timestamptz), 'infinity')
+ ORDER BY tl.started_at, tl.id
+"""
+_TIME_LOGS = text(_TIME_LOGS_SQL.format(sessions="sessions", participants="session_participants", logs="time_logs"))
+# summarize_archived_group moves a cold group's logs out of the hot tables.
+_ARCHIVED_TIME_LOGS = text(
+    _TIME_LOGS_SQL.format(
+        sessions="sessions_archive", participants="session_participants_archive", logs="time_logs_archive"
+    )
+)
+
+_PROGRESS_SQL = """
+SELECT t.user_id, p.email, p.display_name, t.period_start, t.period_end, t.seconds_done,
+       t.target_minutes, {goal_met} AS goal_met
+  FROM {source} t
+  JOIN profiles p ON p.id = t.user_id
+ WHERE t.period_start >= COALESCE(CAST(:since AS timestamptz), '-infinity')
+   AND t.period_start <  COALESCE(CAST(:until AS timestamptz), 'infinity')
+   {group_filter}
+ ORDER BY t.period_start, t.seconds_done DESC, t.user_id
+"""
+_PROGRESS = text(
+    _PROGRESS_SQL.format(
+        source="group_period_totals(:group_id, CAST(:since AS timestamptz), CAST(:until AS timestamptz))",
+        goal_met="t.seconds_done >= t.target_minutes * 60",
+        group_filter="",
+    )
+)
+_SUMMARIZED_PROGRESS = text(
+    _PROGRESS_SQL.format(
+        source="group_period_summaries", goal_met="t.goal_met", group_filter="AND t.group_id = :group_id"
+    )
+)
+
+
+async def _stream(session, stmt, params: dict[str, object]) -> AsyncIterator[Sequence[Any]]:
+    result = await session.stream(stmt, params)
+    async for batch in result.partitions(EXPORT_BATCH_ROWS):
+        yield batch
+
+
+def stream_time_logs(
+    session, group: Group, *, since: datetime | None = None, until: datetime | None = None
+) -> AsyncIterator[Sequence[Any]]:
+    """Batches of ``TIME_LOG_COLUMNS`` rows for logs started in [since, until), oldest first."""
+    stmt = _TIME_LOGS if group.summarized_at is None else _ARCHIVED_TIME_LOGS
+    return _stream(session, stmt, {"group_id": group.id, "since": since, "until": until})
+
+
+def stream_progress(
+    session, group: Group, *, since: datetime | None = None, until: datetime | None = None
+) -> AsyncIterator[Sequence[Any]]:
+    """Batches of ``PROGRESS_COLUMNS`` rows for periods starting in [since, until)."""
+    stmt = _PROGRESS if group.summarized_at is None else _SUMMARIZED_PROGRESS
+    return _stream(session, stmt, {"group_id": group.id, "since": since, "until": until})
+
+
+# ---------- encoding ----------
+def _plain(value: object) -> object:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+async def encode_csv(columns: Sequence[str], batches: AsyncIterator[Sequence[Any]]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue().encode()
+    async for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_plain(value) for value in row] for row in batch)
+        yield buffer.getvalue().encode()
+
+
+async def encode_ndjson(columns: Sequence[str], batches: AsyncIterator[Sequence[Any]]) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        yield "".join(
+            json.dumps(dict(zip(columns, row)), default=_plain, separators=(",", ":")) + "\n" for row in batch
+        ).encode()
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
+import re
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 
-from sqlalchemy import Select, select, text
+from sqlalchemy import Select, insert, select, text, tuple_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 
+from app.core import periods
+from app.core.fieldsets import FieldSet
 from app.models import Group, GroupMember, Notification, Profile, Session
 from app.models.enums import GoalPeriod, GroupStatus, MemberRole, NotificationKind, NotificationStatus
 from app.schemas.group import GroupCreate
+from app.services import notification_service
 
 
 async def list_groups_for_user(
@@ -21,8 +25,6 @@ async def list_groups_for_user(
         select(Group)
         .join(GroupMember, GroupMember.group_id == Group.id)
         .where(GroupMember.user_id == user_id)
-        .options(selectinload(Group.members).selectinload(GroupMember.user))
-        .options(selectinload(Group.sessions).selectinload(Session.participants))
         .distinct()
         .order_by(Group.created_at.desc())
     )
@@ -38,13 +40,15 @@ async def list_groups_for_user(
     return list(result.scalars().all())
 
 
-async def get_group(session, group_id: uuid.UUID) -> Group | None:
-    stmt = (
-        select(Group)
-        .where(Group.id == group_id)
-        .options(selectinload(Group.members).selectinload(GroupMember.user))
-        .options(selectinload(Group.sessions).selectinload(Session.participants))
-    )
+async def get_group(session, group_id: uuid.UUID, fieldset: FieldSet | None = None) -> Group | None:
+    stmt = select(Group).where(Group.id == group_id)
+    if fieldset is not None and fieldset.active:
+        stmt = stmt.options(*fieldset.loader_options(Group))
+    else:
+        stmt = stmt.options(
+            selectinload(Group.members).selectinload(GroupMember.user),
+            selectinload(Group.sessions).selectinload(Session.participants),
+        )
     result = await session.execute(stmt)
     return result.scalar_one_or_none()
 
@@ -80,6 +84,8 @@ async def create_group(session, owner: Profile, payload: GroupCreate) -> Group:
     )
     session.add(owner_membership)
     await session.flush()
+    # The owner's membership moved the trigger-kept counters; reload them with the group.
+    session.expire(group, ["member_count", "active_session_count", "total_seconds"])
 
     return group
 
@@ -111,13 +117,24 @@ async def require_admin(session, group_id: uuid.UUID, user_id: uuid.UUID) -> Gro
     return membership
 
 
-async def list_members(session, group_id: uuid.UUID) -> list[GroupMember]:
+async def list_members(
+    session,
+    group_id: uuid.UUID,
+    *,
+    cursor_created_at: datetime | None = None,
+    cursor_id: uuid.UUID | None = None,
+    limit: int = 50,
+) -> list[GroupMember]:
+    """One page of memberships with profiles, oldest first, keyset-paginated on (created_at, id)."""
     stmt = (
         select(GroupMember)
         .where(GroupMember.group_id == group_id)
         .options(selectinload(GroupMember.user))
-        .order_by(GroupMember.created_at)
+        .order_by(GroupMember.created_at, GroupMember.id)
     )
+    if cursor_created_at and cursor_id:
+        stmt = stmt.where(tuple_(GroupMember.created_at, GroupMember.id) > tuple_(cursor_created_at, cursor_id))
+    stmt = stmt.limit(min(limit, 200))
     result = await session.execute(stmt)
     return list(result.scalars().all())
 
@@ -163,19 +180,323 @@ async def create_invite_notification(
         recipient_id=recipient.id,
         kind=NotificationKind.GROUP_INVITE,
         status=NotificationStatus.PENDING,
-        title=f"{sender.display_name or sender.email} invited you",
-        body=f"Join {group.name} to lock in together",
         group_id=group.id,
+        **_invite_copy(group, sender),
     )
     session.add(notification)
     await session.flush()
     return notification
 
 
-async def fetch_progress(session, group_id: uuid.UUID) -> list[dict[str, object]]:
-    stmt = text(
-        "SELECT * FROM group_member_period_progress WHERE group_id = :group_id ORDER BY seconds_done DESC"
+def _invite_copy(group: Group, sender: Profile) -> dict[str, str]:
+    return {
+        "title": f"{sender.display_name or sender.email} invited you",
+        "body": f"Join {group.name} to lock in together",
+    }
+
+
+# CITEXT keeps the email match case-insensitive and on the unique index.
+_RESOLVE_INVITEES = text(
+    """
+SELECT p.id, p.email,
+       EXISTS (SELECT 1 FROM group_members gm WHERE gm.group_id = :group_id AND gm.user_id = p.id) AS is_member,
+       EXISTS (
+         SELECT 1 FROM notifications n
+          WHERE n.recipient_id = p.id AND n.status = 'pending'
+            AND n.kind = 'group_invite' AND n.group_id = :group_id
+       ) AS is_invited
+  FROM profiles p
+ WHERE p.email = ANY(CAST(CAST(:emails AS text[]) AS citext[]))
+    OR p.id = ANY(CAST(:user_ids AS uuid[]))
+"""
+)
+
+
+async def invite_many(
+    session,
+    group: Group,
+    sender: Profile,
+    *,
+    emails: list[str],
+    user_ids: list[uuid.UUID],
+) -> dict[str, list]:
+    """Invite every resolvable profile that is neither a member nor holding a pending invite.
+
+    One query resolves and classifies all invitees and one multi-row insert creates the
+    notifications; the caller commits.
+    """
+    if group.status == GroupStatus.ARCHIVED.value:
+        raise ValueError("Archived groups cannot take new members")
+
+    result = await session.execute(
+        _RESOLVE_INVITEES, {"group_id": group.id, "emails": emails, "user_ids": user_ids}
     )
-    result = await session.execute(stmt, {"group_id": str(group_id)})
     rows = result.mappings().all()
-    return [dict(row) for row in rows]
+    by_email = {row["email"].lower(): row for row in rows}
+    by_id = {row["id"]: row for row in rows}
+
+    outcome: dict[str, list] = {"invited": [], "already_members": [], "already_invited": [], "not_found": []}
+    seen: set[uuid.UUID] = set()
+    for key, row in [(email, by_email.get(email.lower())) for email in emails] + [
+        (str(user_id), by_id.get(user_id)) for user_id in user_ids
+    ]:
+        if row is None:
+            outcome["not_found"].append(key)
+        elif row["id"] not in seen:
+            seen.add(row["id"])
+            bucket = "already_members" if row["is_member"] else "already_invited" if row["is_invited"] else "invited"
+            outcome[bucket].append(row["id"])
+
+    if outcome["invited"]:
+        copy = _invite_copy(group, sender)
+        await session.execute(
+            insert(Notification).values(
+                [
+                    {
+                        "recipient_id": recipient_id,
+                        "kind": NotificationKind.GROUP_INVITE,
+                        "status": NotificationStatus.PENDING,
+                        "group_id": group.id,
+                        **copy,
+                    }
+                    for recipient_id in outcome["invited"]
+                ]
+            )
+        )
+        # Core inserts bypass the ORM flush hook that normally wakes long-polling inboxes.
+        notification_service.publish_after_commit(session, outcome["invited"])
+    return outcome
+
+
+async def get_group_version(session, group_id: uuid.UUID, user_id: uuid.UUID) -> dict[str, object] | None:
+    """Version counter, membership and current period for a group in one lookup.
+
+    ``period_start`` is the unclamped start of the current period, for validators;
+    ``current_window`` is the same period clamped to the group's lifetime, for progress rows.
+    """
+    stmt = text(
+        "SELECT COALESCE(v.version, 0) AS version, COALESCE(v.changed_at, g.updated_at) AS changed_at, "
+        "g.period, g.timezone, g.start_at, g.end_at, "
+        "EXISTS (SELECT 1 FROM group_members gm WHERE gm.group_id = g.id AND gm.user_id = :user_id) AS is_member "
+        "FROM groups g LEFT JOIN group_versions v ON v.group_id = g.id WHERE g.id = :group_id"
+    )
+    result = await session.execute(stmt, {"group_id": group_id, "user_id": user_id})
+    row = result.mappings().one_or_none()
+    if row is None:
+        return None
+    now = datetime.now(timezone.utc)
+    return {
+        **row,
+        "period_start": periods.window_at(row["period"], row["timezone"], now).start,
+        "current_window": periods.group_window(row["period"], row["timezone"], row["start_at"], row["end_at"], now),
+    }
+
+
+# Current-period progress for known windows. With the bounds as parameters, sessions and logs
+# outside the window are skipped by their timestamps; group_member_period_progress has to
+# compute each group's window per joined row and can only filter logs after the join.
+_WINDOW_PROGRESS = text(
+    """
+WITH w AS (
+  SELECT * FROM unnest(CAST(:group_ids AS uuid[]), CAST(:starts AS timestamptz[]), CAST(:ends AS timestamptz[]))
+    AS w(group_id, period_start, period_end)
+),
+done AS (
+  SELECT w.group_id, sp.user_id, SUM(EXTRACT(EPOCH FROM (tl.ended_at - tl.started_at)))::bigint AS seconds_done
+    FROM w
+    JOIN sessions s ON s.group_id = w.group_id
+                   AND s.started_at < w.period_end
+                   AND (s.ended_at IS NULL OR s.ended_at > w.period_start)
+    JOIN session_participants sp ON sp.session_id = s.id
+    JOIN time_logs tl ON tl.participant_id = sp.id
+                     AND tl.started_at < w.period_end
+                     AND tl.ended_at   > w.period_start
+   GROUP BY w.group_id, sp.user_id
+)
+SELECT w.group_id, gm.user_id, w.period_start, w.period_end,
+       COALESCE(d.seconds_done, 0) AS seconds_done,
+       COALESCE(gm.override_period_target_minutes, g.period_target_minutes) AS target_minutes,
+       COALESCE(d.seconds_done, 0) >= COALESCE(gm.override_period_target_minutes, g.period_target_minutes) * 60
+         AS goal_met
+  FROM w
+  JOIN groups g ON g.id = w.group_id
+  JOIN group_members gm ON gm.group_id = w.group_id
+  LEFT JOIN done d ON d.group_id = w.group_id AND d.user_id = gm.user_id
+ WHERE g.status IN ('pending', 'active')
+ ORDER BY w.group_id, seconds_done DESC
+"""
+)
+
+
+async def _progress_in_windows(session, windows: dict[uuid.UUID, periods.PeriodWindow]) -> list[dict[str, object]]:
+    if not windows:
+        return []
+    result = await session.execute(
+        _WINDOW_PROGRESS,
+        {
+            "group_ids": list(windows),
+            "starts": [window.start for window in windows.values()],
+            "ends": [window.end for window in windows.values()],
+        },
+    )
+    return [dict(row) for row in result.mappings().all()]
+
+
+async def fetch_progress(session, group_id: uuid.UUID, window: periods.PeriodWindow) -> list[dict[str, object]]:
+    """Rows of ``group_member_period_progress`` for one group, ``window`` from ``get_group_version``."""
+    return await _progress_in_windows(session, {group_id: window})
+
+
+async def fetch_member_progress(session, user_id: uuid.UUID) -> list[dict[str, object]]:
+    """Current-period rows for every member of each active group ``user_id`` belongs to."""
+    stmt = text(
+        "SELECT g.id, g.period, g.timezone, g.start_at, g.end_at "
+        "FROM group_members gm JOIN groups g ON g.id = gm.group_id "
+        "WHERE gm.user_id = :user_id AND g.status = 'active'"
+    )
+    result = await session.execute(stmt, {"user_id": user_id})
+    now = datetime.now(timezone.utc)
+    windows = {
+        row.id: periods.group_window(row.period, row.timezone, row.start_at, row.end_at, now) for row in result
+    }
+    return await _progress_in_windows(session, windows)
+
+
+async def fetch_progress_history(session, group: Group) -> list[dict[str, object]]:
+    """Per-member totals for every period; frozen summaries once the group is in cold storage."""
+    if group.summarized_at is not None:
+        stmt = text(
+            "SELECT group_id, user_id, period_start, period_end, seconds_done, target_minutes, goal_met "
+            "FROM group_period_summaries WHERE group_id = :group_id ORDER BY period_start, seconds_done DESC"
+        )
+    else:
+        stmt = text(
+            "SELECT *, seconds_done >= target_minutes * 60 AS goal_met "
+            "FROM group_period_totals(:group_id) ORDER BY period_start, seconds_done DESC"
+        )
+    result = await session.execute(stmt, {"group_id": str(group.id)})
+    return [dict(row) for row in result.mappings().all()]
+
+
+def member_streaks(rows: list[dict[str, object]], now: datetime) -> list[dict[str, object]]:
+    """Per-member streaks over ``fetch_progress_history`` rows (ordered by period_start).
+
+    A streak is a run of consecutive periods with the goal met. The period in progress extends
+    the current streak once its goal is met, but does not break it before it has ended;
+    periods that have not started are ignored.
+    """
+    streaks: dict[uuid.UUID, dict[str, object]] = {}
+    for row in rows:
+        if row["period_start"] > now:
+            continue
+        member = streaks.setdefault(
+            row["user_id"],
+            {
+                "group_id": row["group_id"],
+                "user_id": row["user_id"],
+                "current_streak": 0,
+                "best_streak": 0,
+                "periods_met": 0,
+                "periods_completed": 0,
+            },
+        )
+        completed = row["period_end"] <= now
+        member["periods_completed"] += completed
+        if row["goal_met"]:
+            member["periods_met"] += 1
+            member["current_streak"] += 1
+            member["best_streak"] = max(member["best_streak"], member["current_streak"])
+        elif completed:
+            member["current_streak"] = 0
+    return sorted(
+        streaks.values(),
+        key=lambda member: (-member["current_streak"], -member["best_streak"], str(member["user_id"])),
+    )
+
+
+async def fetch_streaks(session, group: Group) -> list[dict[str, object]]:
+    rows = await fetch_progress_history(session, group)
+    return member_streaks(rows, datetime.now(timezone.utc))
+
+
+_SEARCH_TERM = re.compile(r"\w+")
+MAX_SEARCH_TERMS = 8
+# Only the newest matches are ranked. Broad terms ("study", "an") match a large share of all
+# groups, and ranking every match would cost a heap fetch per row.
+SEARCH_CANDIDATES = 1000
+
+
+def search_tsquery(query: str) -> str | None:
+    """``to_tsquery`` input for free text: every word must match, the last one as a prefix.
+
+    Only word characters reach the tsquery parser, so user input cannot inject operators. A
+    one-letter trailing word is matched exactly; as a prefix it would hit most of the index.
+    """
+    terms = _SEARCH_TERM.findall(query.lower())[:MAX_SEARCH_TERMS]
+    if not terms:
+        return None
+    if len(terms[-1]) > 1:
+        terms[-1] += ":*"
+    return " & ".join(terms)
+
+
+async def search_groups(
+    session,
+    query: str,
+    *,
+    status: GroupStatus | None = None,
+    period: GoalPeriod | None = None,
+    cursor_rank: float | None = None,
+    cursor_id: uuid.UUID | None = None,
+    limit: int = 20,
+) -> list[dict[str, object]]:
+    """Non-archived groups matching ``query``, best match first, keyset-paginated on (rank, id).
+
+    Ranks the ``SEARCH_CANDIDATES`` most recently created matches, which also caps how far a
+    client can page.
+    """
+    if status is GroupStatus.ARCHIVED:
+        raise ValueError("Archived groups are not searchable")
+    tsquery = search_tsquery(query)
+    if tsquery is None:
+        return []
+    filters = ["g.search_vector @@ q.query", "g.status <> 'archived'"]
+    params: dict[str, object] = {"tsquery": tsquery, "limit": limit, "candidates": SEARCH_CANDIDATES}
+    if status is GroupStatus.ACTIVE:
+        # Nearly every searchable group is active. Written as an equality, this filter draws the
+        # planner into scanning idx_groups_status across every active group; as the complement
+        # it is a cheap per-row check.
+        filters.append("g.status <> 'pending'")
+    elif status is not None:
+        filters.append("g.status = CAST(:status AS group_status)")
+        params["status"] = status.value
+    if period is not None:
+        filters.append("g.period = CAST(:period AS goal_period)")
+        params["period"] = period.value
+    cursor = ""
+    if cursor_rank is not None and cursor_id is not None:
+        # rank is float4; casting the echoed value back to real compares it exactly.
+        cursor = "WHERE (hits.rank, hits.id) < (CAST(:cursor_rank AS real), CAST(:cursor_id AS uuid))"
+        params.update(cursor_rank=cursor_rank, cursor_id=str(cursor_id))
+
+    # The planner picks per query: selective terms go through the GIN index and sort the few
+    # matches by recency; broad ones walk idx_groups_searchable_recent and stop after
+    # :candidates hits. Either way ts_rank runs on at most :candidates rows. The cursor is applied
+    # outside the candidate set so that pages stay stable.
+    stmt = text(
+        "SELECT * FROM ("
+        "  SELECT g.id, g.owner_id, g.name, g.description, g.start_at, g.end_at, g.timezone, g.period,"
+        "         g.period_target_minutes, g.status, g.created_at, g.updated_at,"
+        "         g.member_count, g.active_session_count, g.total_seconds,"
+        "         ts_rank(g.search_vector, q.query) AS rank"
+        "    FROM groups g, to_tsquery('simple', :tsquery) q(query)"
+        f"  WHERE {' AND '.join(filters)}"
+        "   ORDER BY g.created_at DESC, g.id DESC LIMIT :candidates"
+        f") hits {cursor} "
+        "ORDER BY hits.rank DESC, hits.id DESC LIMIT :limit"
+    )
+    # The right plan depends on how common the terms are, which a cached generic plan cannot see;
+    # after five runs of the prepared statement Postgres would settle on one path for every query.
+    await session.execute(text("SET LOCAL plan_cache_mode = force_custom_plan"))
+    result = await session.execute(stmt, params)
+    return [dict(row) for row in result.mappings().all()]
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from app.core import admission, cache
+from app.core.config import get_settings
+from app.core.database import get_engine, get_session_factory
+from app.services import notification_service
+
+logger = logging.getLogger(__name__)
+
+# Session-level advisory lock held by whichever API worker is running the jobs.
+MAINTENANCE_LOCK_KEY = 0x4C4F434B  # "LOCK"
+
+_ARCHIVE_BATCH = text(
+    """
+WITH expired AS (
+  SELECT id FROM groups
+   WHERE status <> 'archived' AND end_at <= now()
+   ORDER BY end_at
+   LIMIT :batch_size
+   FOR UPDATE SKIP LOCKED
+)
+UPDATE groups g
+   SET status = 'archived',
+       updated_at = now()
+  FROM expired e
+ WHERE g.id = e.id
+"""
+)
+
+
+async def archive_expired_groups(session, *, batch_size: int = 500, max_batches: int | None = None) -> int:
+    """Archive expired groups in short, separately committed batches."""
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        result = await session.execute(_ARCHIVE_BATCH, {"batch_size": batch_size})
+        await session.commit()
+        total += result.rowcount
+        batches += 1
+        if result.rowcount < batch_size:
+            break
+    return total
+
+
+_SUMMARIZE_NEXT = text(
+    """
+SELECT summarize_archived_group(id) AS moved
+  FROM (
+    SELECT id FROM groups
+     WHERE status = 'archived' AND summarized_at IS NULL AND end_at < :cutoff
+     ORDER BY end_at
+     LIMIT 1
+     FOR UPDATE SKIP LOCKED
+  ) candidate
+"""
+)
+
+
+async def summarize_archived_groups(session, *, grace: timedelta, max_groups: int = 20) -> int:
+    """Move archived groups past ``grace`` into cold storage, one group per transaction."""
+    cutoff = datetime.now(timezone.utc) - grace
+    summarized = 0
+    while summarized < max_groups:
+        result = await session.execute(_SUMMARIZE_NEXT, {"cutoff": cutoff})
+        moved = result.first()
+        await session.commit()
+        if moved is None:
+            break
+        summarized += 1
+    return summarized
+
+
+_SEAL_NEXT = text(
+    """
+SELECT seal_group_periods(group_id) AS sealed
+  FROM (
+    SELECT group_id FROM group_rollup_queue
+     WHERE queued_at < :started
+     ORDER BY queued_at
+     LIMIT 1
+     FOR UPDATE SKIP LOCKED
+  ) candidate
+"""
+)
+
+
+async def seal_period_rollups(session, *, max_groups: int = 200) -> int:
+    """Store completed periods of queued groups in ``group_period_rollups``, one group per transaction.
+
+    A group that still has activity in its current period is requeued behind the others, so
+    one run visits each queued group at most once. Returns the number of periods sealed.
+    """
+    # The database clock stamps queued_at. Against an app clock that runs ahead, groups requeued
+    # during this run would come round again; against one that lags, just-queued groups wait.
+    started = (await session.execute(text("SELECT now()"))).scalar_one()
+    sealed = 0
+    for _ in range(max_groups):
+        result = await session.execute(_SEAL_NEXT, {"started": started})
+        row = result.first()
+        await session.commit()
+        if row is None:
+            break
+        sealed += row.sealed
+    return sealed
+
+
+@dataclass
+class JobStats:
+    runs: int = 0
+    failures: int = 0
+    rows_total: int = 0
+    last_rows: int = 0
+    last_duration_seconds: float = 0.0
+    last_finished_at: datetime | None = None
+    last_error: str | None = None
+
+
+_stats: dict[str, JobStats] = {}
+_skipped_runs = 0
+
+
+async def _archive_job(session) -> int:
+    settings = get_settings()
+    return await archive_expired_groups(session, batch_size=settings.maintenance_batch_size)
+
+
+async def _purge_notifications_job(session) -> int:
+    settings = get_settings()
+    return await notification_service.purge_resolved_notifications(
+        session,
+        older_than=timedelta(days=settings.notification_retention_days),
+        batch_size=settings.notification_purge_batch_size,
+        archive=settings.notification_retention_archive,
+    )
+
+
+async def _summarize_archived_job(session) -> int:
+    settings = get_settings()
+    return await summarize_archived_groups(
+        session,
+        grace=timedelta(days=settings.cold_storage_grace_days),
+        max_groups=settings.cold_storage_batch_size,
+    )
+
+
+async def _seal_period_rollups_job(session) -> int:
+    settings = get_settings()
+    return await seal_period_rollups(session, max_groups=settings.period_rollup_batch_size)
+
+
+async def _purge_response_cache_job(session) -> int:
+    settings = get_settings()
+    if not settings.response_cache_shared:
+        return 0
+    return await cache.purge_shared_entries(
+        session, older_than=timedelta(seconds=settings.response_cache_shared_ttl_seconds)
+    )
+
+
+async def _purge_rate_limit_buckets_job(session) -> int:
+    settings = get_settings()
+    if not (settings.rate_limit_enabled and settings.rate_limit_shared):
+        return 0
+    # An idle bucket is full again after burst / rate seconds.
+    return await admission.purge_idle_buckets(
+        session, idle_seconds=settings.rate_limit_burst / settings.rate_limit_per_second
+    )
+
+
+JOBS: dict[str, Callable[..., Awaitable[int]]] = {
+    "archive_expired_groups": _archive_job,
+    "summarize_archived_groups": _summarize_archived_job,
+    "seal_period_rollups": _seal_period_rollups_job,
+    "purge_notifications": _purge_notifications_job,
+    "purge_response_cache": _purge_response_cache_job,
+    "purge_rate_limit_buckets": _purge_rate_limit_buckets_job,
+}
+
+
+async def run_job(name: str, session) -> int:
+    """Run one job on ``session`` and record its duration and affected rows."""
+    stats = _stats.setdefault(name, JobStats())
+    started = time.perf_counter()
+    try:
+        rows = await JOBS[name](session)
+    except Exception as exc:
+        await session.rollback()
+        stats.failures += 1
+        stats.last_error = repr(exc)
+        raise
+    finally:
+        stats.runs += 1
+        stats.last_duration_seconds = time.perf_counter() - started
+        stats.last_finished_at = datetime.now(timezone.utc)
+    stats.rows_total += rows
+    stats.last_rows = rows
+    stats.last_error = None
+    return rows
+
+
+async def run_scheduled_jobs() -> bool:
+    """Run every job if this worker wins the advisory lock; False when another worker holds it."""
+    global _skipped_runs
+    async with get_engine().connect() as lock_connection:
+        acquired = await lock_connection.scalar(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": MAINTENANCE_LOCK_KEY}
+        )
+        if not acquired:
+            _skipped_runs += 1
+            return False
+        try:
+            for name in JOBS:
+                async with get_session_factory()() as session:
+                    try:
+                        await run_job(name, session)
+                    except Exception:
+                        logger.exception("Maintenance job %s failed", name)
+        finally:
+            await lock_connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MAINTENANCE_LOCK_KEY})
+    return True
+
+
+async def run_forever(interval_seconds: float) -> None:
+    while True:
+        try:
+            await run_scheduled_jobs()
+        except Exception:
+            logger.exception("Maintenance run failed")
+        await asyncio.sleep(interval_seconds)
+
+
+def snapshot() -> dict[str, object]:
+    return {
+        "skipped_runs": _skipped_runs,
+        "jobs": {name: asdict(stats) for name, stats in _stats.items()},
+    }
@@ -1,14 +1,48 @@
 from __future__ import annotations
 
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import Select, select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Select, event, func, literal_column, select, text, tuple_
+from sqlalchemy.orm import Session as OrmSession, selectinload
 
+from app.core.events import notification_bus
+from app.core.fieldsets import FieldSet
 from app.models import Notification
 from app.models.enums import NotificationStatus
 
+_NEW_RECIPIENTS_KEY = "lockin_new_notification_recipients"
+
+
+@event.listens_for(OrmSession, "after_flush")
+def _collect_new_recipients(session, flush_context) -> None:
+    recipients = {obj.recipient_id for obj in session.new if isinstance(obj, Notification)}
+    if recipients:
+        session.info.setdefault(_NEW_RECIPIENTS_KEY, set()).update(recipients)
+
+
+def publish_after_commit(session, recipient_ids) -> None:
+    """Wake ``recipient_ids`` once ``session`` commits; for notifications inserted through Core."""
+    session.info.setdefault(_NEW_RECIPIENTS_KEY, set()).update(recipient_ids)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _publish_new_recipients(session) -> None:
+    # Only wake long-pollers once the rows are visible to their next query.
+    for recipient_id in session.info.pop(_NEW_RECIPIENTS_KEY, ()):
+        notification_bus.publish(recipient_id)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_new_recipients(session) -> None:
+    session.info.pop(_NEW_RECIPIENTS_KEY, None)
+
+
+def _loader_options(fieldset: FieldSet | None) -> list:
+    if fieldset is not None and fieldset.active:
+        return fieldset.loader_options(Notification)
+    return [selectinload(Notification.group)]
+
 
 async def list_notifications(
     session,
@@ -17,27 +51,58 @@ async def list_notifications(
     unread: bool | None = None,
     cursor_created_at: datetime | None = None,
     cursor_id: uuid.UUID | None = None,
+    since_created_at: datetime | None = None,
+    since_id: uuid.UUID | None = None,
     limit: int = 20,
+    fieldset: FieldSet | None = None,
 ) -> list[Notification]:
+    since = since_created_at is not None and since_id is not None
     stmt: Select[tuple[Notification]] = (
         select(Notification)
         .where(Notification.recipient_id == user_id)
-        .order_by(Notification.created_at.desc(), Notification.id.desc())
-        .options(selectinload(Notification.group))
+        .options(*_loader_options(fieldset))
     )
+    # A since query walks forward from the cursor, so a full page leaves the newer rows for the
+    # next poll instead of skipping the older ones; the page is still returned newest first.
+    if since:
+        stmt = stmt.order_by(Notification.created_at.asc(), Notification.id.asc())
+    else:
+        stmt = stmt.order_by(Notification.created_at.desc(), Notification.id.desc())
     if unread is not None:
+        # Inline literal so the planner can match idx_notifications_recipient_pending.
+        pending = literal_column(f"'{NotificationStatus.PENDING.value}'")
         if unread:
-            stmt = stmt.where(Notification.status == NotificationStatus.PENDING)
+            stmt = stmt.where(Notification.status == pending)
         else:
-            stmt = stmt.where(Notification.status != NotificationStatus.PENDING)
+            stmt = stmt.where(Notification.status != pending)
     if cursor_created_at and cursor_id:
         stmt = stmt.where(
-            (Notification.created_at, Notification.id)
-            < (cursor_created_at, cursor_id)
+            tuple_(Notification.created_at, Notification.id)
+            < tuple_(cursor_created_at, cursor_id)
+        )
+    if since:
+        stmt = stmt.where(
+            tuple_(Notification.created_at, Notification.id)
+            > tuple_(since_created_at, since_id)
         )
     stmt = stmt.limit(min(limit, 100))
     result = await session.execute(stmt)
-    return list(result.scalars().all())
+    notifications = list(result.scalars().all())
+    if since:
+        notifications.reverse()
+    return notifications
+
+
+async def count_unread(session, user_id: uuid.UUID) -> int:
+    pending = literal_column(f"'{NotificationStatus.PENDING.value}'")
+    stmt = select(func.count()).where(Notification.recipient_id == user_id, Notification.status == pending)
+    return (await session.execute(stmt)).scalar_one()
+
+
+async def get_recipient_version(session, user_id: uuid.UUID) -> dict[str, object]:
+    stmt = text("SELECT version, changed_at FROM recipient_versions WHERE recipient_id = :user_id")
+    row = (await session.execute(stmt, {"user_id": user_id})).mappings().one_or_none()
+    return dict(row) if row is not None else {"version": 0, "changed_at": None}
 
 
 async def mark_read(session, notification: Notification) -> Notification:
@@ -58,11 +123,69 @@ async def update_status(session, notification: Notification, status: Notificatio
     return notification
 
 
-async def get_notification(session, notification_id: uuid.UUID, user_id: uuid.UUID) -> Notification | None:
+async def get_notification(
+    session,
+    notification_id: uuid.UUID,
+    user_id: uuid.UUID,
+    fieldset: FieldSet | None = None,
+) -> Notification | None:
     stmt = (
         select(Notification)
         .where(Notification.id == notification_id, Notification.recipient_id == user_id)
-        .options(selectinload(Notification.group))
+        .options(*_loader_options(fieldset))
     )
     result = await session.execute(stmt)
     return result.scalar_one_or_none()
+
+
+_PURGE_BATCH_SQL = """
+WITH doomed AS (
+  SELECT id FROM notifications
+   WHERE status <> 'pending' AND created_at < :cutoff
+   ORDER BY created_at
+   LIMIT :batch_size
+   FOR UPDATE SKIP LOCKED
+), moved AS (
+  DELETE FROM notifications n USING doomed d WHERE n.id = d.id
+  RETURNING n.id, n.recipient_id, n.kind, n.status, n.title, n.body, n.group_id, n.created_at, n.read_at
+)
+"""
+
+_DELETE_BATCH = text(_PURGE_BATCH_SQL + "SELECT count(*) AS affected FROM moved")
+_ARCHIVE_BATCH = text(
+    _PURGE_BATCH_SQL
+    + """, archived AS (
+  INSERT INTO notifications_archive (id, recipient_id, kind, status, title, body, group_id, created_at, read_at)
+  SELECT * FROM moved
+  ON CONFLICT (id) DO NOTHING
+)
+SELECT count(*) AS affected FROM moved"""
+)
+
+
+async def purge_resolved_notifications(
+    session,
+    *,
+    older_than: timedelta,
+    batch_size: int = 500,
+    archive: bool = False,
+    max_batches: int | None = None,
+) -> int:
+    """Delete (or move to notifications_archive) resolved notifications in short transactions.
+
+    Each batch commits on its own and skips rows locked by in-flight requests, so the
+    purge never holds more than ``batch_size`` row locks at a time.
+    """
+    cutoff = datetime.now(timezone.utc) - older_than
+    stmt = _ARCHIVE_BATCH if archive else _DELETE_BATCH
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        result = await session.execute(stmt, {"cutoff": cutoff, "batch_size": batch_size})
+        affected = int(result.scalar_one())
+        await session.commit()
+        total += affected
+        batches += 1
+        if affected < batch_size:
+            break
+    return total
@@ -6,16 +6,17 @@ from datetime import datetime
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
+from app.core.fieldsets import FieldSet
 from app.models import Session, SessionParticipant, TimeLog
 from app.models.enums import ParticipantRole, SessionStatus
 
 
-async def get_session(session, session_id: uuid.UUID) -> Session | None:
-    stmt = (
-        select(Session)
-        .where(Session.id == session_id)
-        .options(selectinload(Session.participants).selectinload(SessionParticipant.user))
-    )
+async def get_session(session, session_id: uuid.UUID, fieldset: FieldSet | None = None) -> Session | None:
+    stmt = select(Session).where(Session.id == session_id)
+    if fieldset is not None and fieldset.active:
+        stmt = stmt.options(*fieldset.loader_options(Session))
+    else:
+        stmt = stmt.options(selectinload(Session.participants).selectinload(SessionParticipant.user))
     result = await session.execute(stmt)
     return result.scalar_one_or_none()
 
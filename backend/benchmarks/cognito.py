@@ -0,0 +1,55 @@
+"""Local stand-in for the Cognito user pool: a throwaway RSA key pair whose JWKS is preloaded
+into ``app.core.security`` so tokens verify without any network access."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from app.core import security
+
+KEY_ID = "lockin-benchmark"
+
+
+class LocalCognito:
+    def __init__(self, client_id: str) -> None:
+        self.client_id = client_id
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self._private_pem = key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        public_pem = key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        self.jwk: dict[str, Any] = {
+            **jwk.construct(public_pem, algorithm="RS256").to_dict(),
+            "kid": KEY_ID,
+            "use": "sig",
+        }
+
+    def install(self) -> None:
+        """Serve verification from the local key for the rest of the process."""
+        security._JWKS_CACHE = {KEY_ID: self.jwk}
+        security._JWKS_FETCHED_AT = time.time()
+        security._JWKS_EXP = float("inf")
+
+    def token(self, subject: str, *, email: str | None = None, ttl: int = 3600) -> str:
+        now = int(time.time())
+        claims = {
+            "sub": subject,
+            "aud": self.client_id,
+            "iss": security._issuer(),
+            "token_use": "id",
+            "iat": now,
+            "exp": now + ttl,
+        }
+        if email:
+            claims["email"] = email
+        return jwt.encode(claims, self._private_pem, algorithm="RS256", headers={"kid": KEY_ID})
@@ -0,0 +1,204 @@
+"""Property check for period windows across DST changes, optionally against ``group_period_totals``.
+
+    python -m benchmarks.dst_periods [--years 2005 2035] [--timezones America/Santiago ...] [--database]
+
+No database by default. For every offset change in each zone, instants from a day and a half
+before to a day and a half after it are checked. Random instants are added too. For each one:
+
+- ``window_at`` contains the instant, and the next window starts where this one ends;
+- a boundary is local midnight when that midnight exists exactly once. Otherwise it is
+  midnight at the smaller (standard) offset, which is what PostgreSQL's ``AT TIME ZONE`` picks;
+- a window without an offset change is exactly 24h (daily) or 168h (weekly). A window with a
+  change strictly inside it is shorter or longer by that change: 23/25h or 167/169h, or by
+  half an hour on Lord Howe. A change on a boundary moves it by the change or not at all.
+
+The default zones move the clock at midnight or by odd amounts. Samoa skipped 30 December 2011,
+so its daily window is empty and that week lasts 144h.
+
+``--database`` also builds each zone's groups over the whole range, inside a transaction that is
+rolled back, in ``LOCKIN_DATABASE_URL``. Their windows from ``group_period_totals`` must equal
+the ``group_window`` chain, apart from the empty row SQL emits for a skipped day. A mismatch
+here usually means the API hosts' ``tzdata`` and the server's differ.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+from collections import Counter
+from collections.abc import Iterator
+from datetime import datetime, time, timedelta, timezone
+
+from app.core import periods
+from app.models.enums import GoalPeriod
+
+TIMEZONES = [
+    "America/Santiago",
+    "America/Havana",
+    "Asia/Beirut",
+    "Pacific/Apia",
+    "Australia/Lord_Howe",
+    "America/Asuncion",
+]
+HOUR = timedelta(hours=1)
+
+
+def transitions(tz: str, lo: datetime, hi: datetime) -> Iterator[tuple[datetime, timedelta]]:
+    """UTC instants in ``[lo, hi)`` at which ``tz`` changes offset, with the change."""
+    zone = periods._zone(tz)
+
+    def offset(instant: datetime) -> timedelta:
+        return instant.astimezone(zone).utcoffset()
+
+    day = lo
+    while day < hi:
+        after = day + timedelta(days=1)
+        if offset(day) != offset(after):
+            before, found = 0, 86400  # seconds into the day; offsets never change twice in a day
+            while found - before > 1:
+                middle = (before + found) // 2
+                if offset(day + timedelta(seconds=middle)) == offset(day):
+                    before = middle
+                else:
+                    found = middle
+            at = day + timedelta(seconds=found)
+            yield at, offset(at) - offset(day)
+        day = after
+
+
+def check_boundary(tz: str, start: datetime) -> None:
+    zone = periods._zone(tz)
+    local = start.astimezone(zone)
+    day = local.date() if local.time() < time(12) else local.date() + timedelta(days=1)
+    midnight = datetime.combine(day, time())
+    offsets = {midnight.replace(tzinfo=zone, fold=fold).utcoffset() for fold in (0, 1)}
+    if len(offsets) == 1:
+        assert local.replace(tzinfo=None) == midnight, (tz, start, "boundary is not local midnight")
+    else:
+        expected = (midnight - min(offsets)).replace(tzinfo=timezone.utc)
+        assert start == expected, (tz, start, "boundary is not standard-offset midnight", expected)
+
+
+def check_window(
+    period: GoalPeriod, tz: str, instant: datetime, changes: list[tuple[datetime, timedelta]]
+) -> timedelta:
+    window = periods.window_at(period, tz, instant)
+    assert window.contains(instant), (tz, period.value, instant, window)
+    assert periods.window_at(period, tz, window.end).start == window.end, (tz, period.value, window)
+    check_boundary(tz, window.start)
+    check_boundary(tz, window.end)
+
+    nominal = timedelta(days=periods._STEP_DAYS[period])
+    duration = window.end - window.start
+    inside = [change for at, change in changes if window.start < at < window.end]
+    edges = [change for at, change in changes if window.start <= at <= window.end]
+    if not edges:
+        assert duration == nominal, (tz, period.value, window, duration)
+    elif not any(at == window.start or at == window.end for at, _ in changes):
+        assert duration == nominal - sum(inside, timedelta()), (tz, period.value, window, duration, inside)
+    else:
+        allowed = {nominal} | {nominal - change for change in edges}
+        assert duration in allowed, (tz, period.value, window, duration, edges)
+    return duration
+
+
+def check_zone(tz: str, lo: datetime, hi: datetime, samples: int, rng: random.Random) -> dict[str, Counter]:
+    changes = list(transitions(tz, lo - timedelta(days=8), hi + timedelta(days=8)))
+    assert changes, f"{tz} has no offset changes between {lo:%Y} and {hi:%Y}"
+    instants = [lo + (hi - lo) * rng.random() for _ in range(samples)]
+    for at, _ in changes:
+        instants += [at - timedelta(seconds=1), at]
+        instants += [at + step * timedelta(minutes=30) for step in range(-72, 73)]
+
+    durations: dict[str, Counter] = {}
+    for period in GoalPeriod:
+        seen = durations[period.value] = Counter()
+        for instant in instants:
+            seen[check_window(period, tz, instant, changes) / HOUR] += 1
+    return durations
+
+
+async def compare_with_sql(database_url: str, timezones: list[str], lo: datetime, hi: datetime) -> int:
+    """Windows that differ between ``group_period_totals`` and the ``group_window`` chain."""
+    import asyncpg
+
+    from app.core.database import asyncpg_dsn
+
+    connection = await asyncpg.connect(asyncpg_dsn(database_url))
+    mismatches = 0
+    try:
+        transaction = connection.transaction()
+        await transaction.start()
+        try:
+            owner = await connection.fetchval(
+                "INSERT INTO profiles (email) VALUES ('dst-periods@example.invalid') RETURNING id"
+            )
+            for tz in timezones:
+                for period in GoalPeriod:
+                    group = await connection.fetchval(
+                        """
+                        INSERT INTO groups (owner_id, name, start_at, end_at, timezone, period)
+                        VALUES ($1, $2, $3, $4, $5, $6) RETURNING id
+                        """,
+                        owner, f"dst {tz} {period.value}", lo, hi, tz, period.value,
+                    )
+                    await connection.execute(
+                        "INSERT INTO group_members (group_id, user_id) VALUES ($1, $2)", group, owner
+                    )
+                    rows = await connection.fetch(
+                        "SELECT period_start, period_end FROM group_period_totals($1) ORDER BY period_start", group
+                    )
+                    sql = [(row["period_start"], row["period_end"]) for row in rows]
+                    sql = [(start, end) for start, end in sql if start < end]  # a skipped day
+                    python = []
+                    instant = lo
+                    while instant < hi:
+                        window = periods.group_window(period, tz, lo, hi, instant)
+                        python.append(tuple(window))
+                        instant = window.end
+                    differ = sum(a != b for a, b in zip(sql, python)) + abs(len(sql) - len(python))
+                    if differ:
+                        first = next(((a, b) for a, b in zip(sql, python) if a != b), None)
+                        print(f"{tz:<22}{period.value:<8}{differ} windows differ, first {first}", file=sys.stderr)
+                    mismatches += differ
+                    print(f"{tz:<22}{period.value:<8}{len(sql):>6} windows compared with group_period_totals")
+        finally:
+            await transaction.rollback()
+    finally:
+        await connection.close()
+    return mismatches
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="DST property check for period windows")
+    parser.add_argument("--years", type=int, nargs=2, default=[2005, 2035], metavar=("FROM", "TO"))
+    parser.add_argument("--timezones", nargs="+", default=TIMEZONES)
+    parser.add_argument("--samples", type=int, default=2000, help="random instants per zone")
+    parser.add_argument("--seed", type=int, default=49)
+    parser.add_argument("--database", action="store_true", help="also compare with group_period_totals")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    lo = datetime(args.years[0], 1, 1, tzinfo=timezone.utc)
+    hi = datetime(args.years[1], 1, 1, tzinfo=timezone.utc)
+    rng = random.Random(args.seed)
+
+    print(f"{'timezone':<22}{'period':<8}window hours (count)")
+    for tz in args.timezones:
+        for period, seen in check_zone(tz, lo, hi, args.samples, rng).items():
+            hours = ", ".join(f"{h:g} ({n})" for h, n in sorted(seen.items()))
+            print(f"{tz:<22}{period:<8}{hours}")
+
+    if args.database:
+        from app.core.config import get_settings
+
+        if asyncio.run(compare_with_sql(get_settings().database_url, args.timezones, lo, hi)):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
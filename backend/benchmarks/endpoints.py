@@ -0,0 +1,261 @@
+"""Latency benchmark for the hot API endpoints, with regression budgets.
+
+    python -m benchmarks.endpoints                      # seed, run, compare against budgets.json
+    python -m benchmarks.endpoints --reuse-fixture      # skip reseeding an already loaded database
+    python -m benchmarks.endpoints --update-budgets     # record the current run as the new baseline
+
+The app runs in-process (httpx ASGI transport) against ``LOCKIN_DATABASE_URL``, which is
+TRUNCATED and reseeded with ``app.cli.seed`` unless ``--reuse-fixture`` is given, so point it at
+a scratch database. Cognito is replaced by a local key pair; each virtual user signs in as one of
+the seeded ``synthetic-N`` identities. Queries per request come from the ``Server-Timing``
+header written by ``QueryStatsMiddleware``.
+
+Latency budgets are machine-specific: record them on the machine that enforces them. Query
+budgets are portable and are the ones to watch for N+1 regressions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import re
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+BUDGET_FILE = Path(__file__).with_name("budgets.json")
+CLIENT_ID = "lockin-benchmark"
+_QUERY_COUNT = re.compile(r'desc="(\d+) queries')
+
+
+@dataclass(frozen=True)
+class VirtualUser:
+    subject: str
+    profile_id: str
+    group_id: str
+    session_id: str
+    session_started_at: datetime
+    session_ended_at: datetime
+    headers: dict[str, str] = field(default_factory=dict, compare=False)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    method: str
+    path: Callable[[VirtualUser], str]
+    body: Callable[[VirtualUser, int], dict[str, Any]] | None = None
+
+
+def _log_body(user: VirtualUser, index: int) -> dict[str, Any]:
+    # Slide a one-minute slice through the session window so every log passes the trigger.
+    window = max(int((user.session_ended_at - user.session_started_at).total_seconds()) - 60, 1)
+    started = user.session_started_at + timedelta(seconds=(index * 61) % window)
+    return {
+        "user_id": user.profile_id,
+        "started_at": started.isoformat(),
+        "ended_at": (started + timedelta(seconds=60)).isoformat(),
+    }
+
+
+SCENARIOS = (
+    Scenario("GET /api/groups", "GET", lambda user: "/api/groups"),
+    Scenario("GET /api/groups/{id}", "GET", lambda user: f"/api/groups/{user.group_id}"),
+    Scenario("GET /api/groups/{id}/members", "GET", lambda user: f"/api/groups/{user.group_id}/members"),
+    Scenario("GET /api/groups/{id}/progress/current", "GET", lambda user: f"/api/groups/{user.group_id}/progress/current"),
+    Scenario("GET /api/notifications", "GET", lambda user: "/api/notifications"),
+    Scenario("GET /api/me/home", "GET", lambda user: "/api/me/home"),
+    Scenario("POST /api/sessions/{id}/logs", "POST", lambda user: f"/api/sessions/{user.session_id}/logs", _log_body),
+)
+
+
+@dataclass
+class Result:
+    latencies: list[float] = field(default_factory=list)
+    queries: list[int] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self) -> dict[str, float]:
+        cuts = statistics.quantiles(self.latencies, n=100, method="inclusive") if len(self.latencies) > 1 else [0.0] * 99
+        return {
+            "requests": len(self.latencies),
+            "errors": self.errors,
+            "p50_ms": cuts[49] * 1000,
+            "p95_ms": cuts[94] * 1000,
+            "p99_ms": cuts[98] * 1000,
+            "queries_per_request": statistics.fmean(self.queries) if self.queries else 0.0,
+        }
+
+
+_FIXTURE_USERS = """
+SELECT DISTINCT ON (sp.user_id)
+       ai.subject, sp.user_id::text, s.group_id::text, s.id::text, s.started_at, s.ended_at
+  FROM session_participants sp
+  JOIN sessions s ON s.id = sp.session_id
+  JOIN groups g ON g.id = s.group_id AND g.status = 'active'
+  JOIN auth_identities ai ON ai.profile_id = sp.user_id AND ai.provider = 'cognito'
+ WHERE s.ended_at - s.started_at >= interval '5 minutes'
+ ORDER BY sp.user_id, s.id
+ LIMIT $1
+"""
+
+
+async def load_users(database_url: str, count: int) -> list[VirtualUser]:
+    import asyncpg
+
+    from app.core.database import asyncpg_dsn
+
+    connection = await asyncpg.connect(asyncpg_dsn(database_url))
+    try:
+        rows = await connection.fetch(_FIXTURE_USERS, count)
+    finally:
+        await connection.close()
+    return [VirtualUser(*row) for row in rows]
+
+
+async def run_scenario(client, scenario: Scenario, users: list[VirtualUser], *, requests: int, concurrency: int, warmup: int) -> Result:
+    result = Result()
+    counter = iter(range(requests + warmup))
+
+    async def worker(offset: int) -> None:
+        for index in counter:
+            user = users[(offset + index) % len(users)]
+            body = scenario.body(user, index) if scenario.body else None
+            started = time.perf_counter()
+            response = await client.request(scenario.method, scenario.path(user), headers=user.headers, json=body)
+            elapsed = time.perf_counter() - started
+            if index < warmup:
+                continue
+            if response.status_code >= 400:
+                result.errors += 1
+                continue
+            result.latencies.append(elapsed)
+            match = _QUERY_COUNT.search(response.headers.get("server-timing", ""))
+            if match:
+                result.queries.append(int(match.group(1)))
+
+    await asyncio.gather(*(worker(offset) for offset in range(concurrency)))
+    return result
+
+
+def check_budgets(results: dict[str, dict[str, float]], budgets: dict[str, dict[str, float]]) -> list[str]:
+    failures = []
+    for name, summary in results.items():
+        if summary["errors"]:
+            failures.append(f"{name}: {summary['errors']} failed requests")
+        budget = budgets.get(name)
+        if budget is None:
+            failures.append(f"{name}: no budget recorded (run with --update-budgets)")
+            continue
+        for metric, limit in budget.items():
+            if summary[metric] > limit:
+                failures.append(f"{name}: {metric} {summary[metric]:.2f} exceeds budget {limit:.2f}")
+    return failures
+
+
+def budgets_from(results: dict[str, dict[str, float]], headroom: float) -> dict[str, dict[str, float]]:
+    return {
+        name: {
+            "p95_ms": round(summary["p95_ms"] * headroom, 1),
+            "p99_ms": round(summary["p99_ms"] * headroom, 1),
+            "queries_per_request": float(math.ceil(summary["queries_per_request"])),
+        }
+        for name, summary in results.items()
+    }
+
+
+async def benchmark(args: argparse.Namespace) -> int:
+    from httpx import ASGITransport, AsyncClient
+
+    from app.cli import seed
+    from app.core.config import get_settings
+    from app.main import app
+    from benchmarks.cognito import LocalCognito
+
+    settings = get_settings()
+    if not args.reuse_fixture:
+        await seed.seed(seed.parse_args(["--scale", str(args.scale), "--seed", str(args.seed), "--truncate"]))
+
+    users = await load_users(settings.database_url, args.users)
+    if not users:
+        print("fixture has no active sessions to drive; reseed with a larger --scale", file=sys.stderr)
+        return 2
+    cognito = LocalCognito(CLIENT_ID)
+    cognito.install()
+    for user in users:
+        user.headers["Authorization"] = f"Bearer {cognito.token(user.subject)}"
+
+    results: dict[str, dict[str, float]] = {}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for scenario in SCENARIOS:
+            if args.only and args.only not in scenario.name:
+                continue
+            result = await run_scenario(
+                client,
+                scenario,
+                users,
+                requests=args.requests,
+                concurrency=args.concurrency,
+                warmup=args.warmup,
+            )
+            results[scenario.name] = result.summary()
+
+    print(f"{'endpoint':<42}{'reqs':>6}{'err':>5}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'q/req':>7}")
+    for name, summary in results.items():
+        print(
+            f"{name:<42}{summary['requests']:>6}{summary['errors']:>5}{summary['p50_ms']:>9.1f}"
+            f"{summary['p95_ms']:>9.1f}{summary['p99_ms']:>9.1f}{summary['queries_per_request']:>7.1f}"
+        )
+
+    if args.update_budgets:
+        recorded = json.loads(BUDGET_FILE.read_text()) if BUDGET_FILE.exists() else {}
+        recorded.update(budgets_from(results, args.headroom))
+        BUDGET_FILE.write_text(json.dumps(recorded, indent=2, sort_keys=True) + "\n")
+        print(f"budgets written to {BUDGET_FILE}")
+        return 0
+
+    budgets = json.loads(BUDGET_FILE.read_text()) if BUDGET_FILE.exists() else {}
+    failures = check_budgets(results, budgets)
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Endpoint latency benchmark with regression budgets")
+    parser.add_argument("--scale", type=float, default=0.1, help="fixture scale passed to app.cli.seed")
+    parser.add_argument("--seed", type=int, default=42, help="fixture seed")
+    parser.add_argument("--reuse-fixture", action="store_true", help="benchmark the database as it is")
+    parser.add_argument("--users", type=int, default=200, help="distinct signed-in virtual users")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients per endpoint")
+    parser.add_argument("--requests", type=int, default=500, help="measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=50, help="unmeasured requests per endpoint")
+    parser.add_argument("--only", help="run only endpoints whose name contains this text")
+    parser.add_argument("--update-budgets", action="store_true", help="write this run to budgets.json")
+    parser.add_argument("--headroom", type=float, default=1.5, help="latency multiplier used by --update-budgets")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    # Settings are read at import time, so the stub issuer must be configured before the app loads.
+    os.environ.setdefault("LOCKIN_AWS_REGION", "us-east-1")
+    os.environ.setdefault("LOCKIN_COGNITO_USER_POOL_ID", "us-east-1_benchmark")
+    os.environ["LOCKIN_COGNITO_APP_CLIENT_ID"] = CLIENT_ID
+    os.environ.setdefault("LOCKIN_MAINTENANCE_ENABLED", "false")
+    os.environ.setdefault("LOCKIN_SLOW_REQUEST_MS", "60000")
+    os.environ.setdefault("LOCKIN_RATE_LIMIT_ENABLED", "false")
+    sys.exit(asyncio.run(benchmark(args)))
+
+
+if __name__ == "__main__":
+    main()
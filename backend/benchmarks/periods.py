@@ -0,0 +1,69 @@
+"""Period-boundary cost: computing a group's windows cold versus from the process caches.
+
+    python -m benchmarks.periods [--days 365] [--timezones America/New_York Europe/London]
+
+No database. ``cold`` clears every cache before each call, as in a fresh worker; ``cached`` is
+the steady state, where ``boundary`` hits skip the zoneinfo arithmetic. These current-window
+lookups are what every progress request pays.
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+
+from app.core import periods
+from app.models.enums import GoalPeriod
+
+START = datetime(2026, 1, 5, 14, 30, tzinfo=timezone.utc)
+
+
+def clear_caches() -> None:
+    periods.boundary.cache_clear()
+    periods._zone.cache_clear()
+
+
+def cases(period: GoalPeriod, tz: str, days: int) -> dict[str, Callable[[], object]]:
+    end = START + timedelta(days=days)
+    middle = START + timedelta(days=days / 2)
+    return {
+        "window_at": lambda: periods.window_at(period, tz, middle),
+        "group_window": lambda: periods.group_window(period, tz, START, end, middle),
+    }
+
+
+def measure(run: Callable[[], object], *, cold: bool, repeat: int = 5) -> float:
+    """Best-of-``repeat`` µs per call."""
+    if cold:
+        number = 50
+
+        def timed() -> None:
+            clear_caches()
+            run()
+
+    else:
+        number = 5000
+        timed = run
+        run()  # fill the caches
+    return min(timeit.repeat(timed, number=number, repeat=repeat)) / number * 1e6
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Period-boundary microbenchmark")
+    parser.add_argument("--days", type=int, default=365, help="group lifetime")
+    parser.add_argument("--timezones", nargs="+", default=["America/New_York", "Europe/London", "Australia/Sydney"])
+    args = parser.parse_args(argv)
+
+    print(f"{'timezone':<20}{'period':<8}{'call':<18}{'cold µs':>10}{'cached µs':>11}")
+    for tz in args.timezones:
+        for period in GoalPeriod:
+            for name, run in cases(period, tz, args.days).items():
+                cold = measure(run, cold=True)
+                cached = measure(run, cold=False)
+                print(f"{tz:<20}{period.value:<8}{name:<18}{cold:>10.2f}{cached:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Latency benchmark for ``GET /api/groups/search`` over a million-group fixture.
+
+    python -m benchmarks.search                         # seed 1M groups, run, compare against budgets.json
+    python -m benchmarks.search --reuse-fixture         # keep the loaded groups
+    python -m benchmarks.search --update-budgets
+
+Like ``benchmarks.endpoints``, the app runs in-process against ``LOCKIN_DATABASE_URL``, which is
+TRUNCATED and reseeded unless ``--reuse-fixture`` is given. The fixture is groups only: two
+members each and no sessions, so a million groups load in a few minutes. About 70% of them
+end up archived and unsearchable, as in a long-running deployment.
+
+Queries cover both index paths: selective terms (GIN bitmap scan) and broad words or prefixes
+(recency index walk, stopped after ``SEARCH_CANDIDATES`` matches), with and without filters,
+and a keyset page deep into the results.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+from urllib.parse import urlencode
+
+from benchmarks.endpoints import BUDGET_FILE, CLIENT_ID, Scenario, budgets_from, check_budgets, run_scenario
+
+QUERIES = {
+    "selective": {"q": "quantum mech"},
+    "selective, filtered": {"q": "calculus", "period": "weekly"},
+    "common word": {"q": "crew"},
+    "common word, filtered": {"q": "sunday", "period": "daily", "status": "active"},
+    "broad prefix": {"q": "ca"},
+    "multi-word": {"q": "weekend crew an"},
+    "no match": {"q": "zzzyzx"},
+}
+DEEP_PAGE = 10
+
+
+@dataclass(frozen=True)
+class Searcher:
+    subject: str
+    headers: dict[str, str] = field(default_factory=dict, compare=False)
+
+
+def search_path(params: dict[str, str]) -> str:
+    return f"/api/groups/search?{urlencode(params)}"
+
+
+async def deep_page_params(client, searcher: Searcher, params: dict[str, str], pages: int) -> dict[str, str]:
+    """Follow the keyset cursor ``pages`` pages in, as a client scrolling the results would."""
+    params = dict(params)
+    for _ in range(pages):
+        response = await client.get(search_path(params), headers=searcher.headers)
+        response.raise_for_status()
+        hits = response.json()
+        if not hits:
+            break
+        params.update(cursor_rank=repr(hits[-1]["rank"]), cursor_id=hits[-1]["id"])
+    return params
+
+
+async def load_searchers(database_url: str, count: int) -> list[Searcher]:
+    import asyncpg
+
+    from app.core.database import asyncpg_dsn
+
+    connection = await asyncpg.connect(asyncpg_dsn(database_url))
+    try:
+        rows = await connection.fetch(
+            "SELECT subject FROM auth_identities WHERE provider = 'cognito' ORDER BY subject LIMIT $1", count
+        )
+    finally:
+        await connection.close()
+    return [Searcher(row["subject"]) for row in rows]
+
+
+async def benchmark(args: argparse.Namespace) -> int:
+    from httpx import ASGITransport, AsyncClient
+
+    from app.cli import seed
+    from app.core.config import get_settings
+    from app.main import app
+    from benchmarks.cognito import LocalCognito
+
+    settings = get_settings()
+    if not args.reuse_fixture:
+        await seed.seed(
+            seed.parse_args(
+                [
+                    "--groups", str(args.groups),
+                    "--profiles", str(args.profiles),
+                    "--max-group-size", "2",
+                    "--sessions-per-member", "0",
+                    "--seed", str(args.seed),
+                    "--truncate",
+                    *(["--skip-triggers"] if args.skip_triggers else []),
+                ]
+            )
+        )
+
+    searchers = await load_searchers(settings.database_url, args.users)
+    if not searchers:
+        print("fixture has no identities to sign in as; reseed", file=sys.stderr)
+        return 2
+    cognito = LocalCognito(CLIENT_ID)
+    cognito.install()
+    for searcher in searchers:
+        searcher.headers["Authorization"] = f"Bearer {cognito.token(searcher.subject)}"
+
+    results: dict[str, dict[str, float]] = {}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://benchmark") as client:
+        queries = {name: params for name, params in QUERIES.items()}
+        queries[f"common word, page {DEEP_PAGE + 1}"] = await deep_page_params(
+            client, searchers[0], QUERIES["common word"], DEEP_PAGE
+        )
+        for name, params in queries.items():
+            scenario_name = f"GET /api/groups/search ({name})"
+            if args.only and args.only not in scenario_name:
+                continue
+            path = search_path(params)
+            scenario = Scenario(scenario_name, "GET", lambda searcher, path=path: path)
+            result = await run_scenario(
+                client,
+                scenario,
+                searchers,
+                requests=args.requests,
+                concurrency=args.concurrency,
+                warmup=args.warmup,
+            )
+            results[scenario_name] = result.summary()
+
+    print(f"{'query':<56}{'reqs':>6}{'err':>5}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'q/req':>7}")
+    for name, summary in results.items():
+        print(
+            f"{name:<56}{summary['requests']:>6}{summary['errors']:>5}{summary['p50_ms']:>9.1f}"
+            f"{summary['p95_ms']:>9.1f}{summary['p99_ms']:>9.1f}{summary['queries_per_request']:>7.1f}"
+        )
+
+    if args.update_budgets:
+        recorded = json.loads(BUDGET_FILE.read_text()) if BUDGET_FILE.exists() else {}
+        recorded.update(budgets_from(results, args.headroom))
+        BUDGET_FILE.write_text(json.dumps(recorded, indent=2, sort_keys=True) + "\n")
+        print(f"budgets written to {BUDGET_FILE}")
+        return 0
+
+    budgets = json.loads(BUDGET_FILE.read_text()) if BUDGET_FILE.exists() else {}
+    failures = check_budgets(results, budgets)
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Group search latency benchmark")
+    parser.add_argument("--groups", type=int, default=1_000_000, help="groups in the fixture")
+    parser.add_argument("--profiles", type=int, default=20_000, help="profiles in the fixture")
+    parser.add_argument("--seed", type=int, default=42, help="fixture seed")
+    parser.add_argument("--skip-triggers", action="store_true", help="seed with session_replication_role=replica")
+    parser.add_argument("--reuse-fixture", action="store_true", help="benchmark the database as it is")
+    parser.add_argument("--users", type=int, default=50, help="distinct signed-in virtual users")
+    parser.add_argument("--concurrency", type=int, default=1, help="concurrent clients per query")
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per query")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests per query")
+    parser.add_argument("--only", help="run only queries whose name contains this text")
+    parser.add_argument("--update-budgets", action="store_true", help="write this run to budgets.json")
+    parser.add_argument("--headroom", type=float, default=1.5, help="latency multiplier used by --update-budgets")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    os.environ.setdefault("LOCKIN_AWS_REGION", "us-east-1")
+    os.environ.setdefault("LOCKIN_COGNITO_USER_POOL_ID", "us-east-1_benchmark")
+    os.environ["LOCKIN_COGNITO_APP_CLIENT_ID"] = CLIENT_ID
+    os.environ.setdefault("LOCKIN_MAINTENANCE_ENABLED", "false")
+    os.environ.setdefault("LOCKIN_SLOW_REQUEST_MS", "60000")
+    os.environ.setdefault("LOCKIN_RATE_LIMIT_ENABLED", "false")
+    sys.exit(asyncio.run(benchmark(args)))
+
+
+if __name__ == "__main__":
+    main()
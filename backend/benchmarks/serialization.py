@@ -0,0 +1,129 @@
+"""Per-item response serialization cost for the list-heavy schemas.
+
+    python -m benchmarks.serialization [--items 200] [--members 5]
+
+Builds transient ORM objects (no database) and times the ways a route can turn them into a JSON
+body. ``response_model`` is what the routers do now: hand ORM objects to FastAPI, which validates
+them once with ``from_attributes`` and dumps JSON in pydantic-core. ``validate in handler`` is the
+old ``[Model.model_validate(row) for row in rows]`` followed by the same response_model pass.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, TypeAdapter
+
+from app.models import Group, GroupMember, Notification, Profile
+from app.models.enums import GoalPeriod, GroupStatus, MemberRole, NotificationKind, NotificationStatus
+from app.schemas.group import GroupListItem, GroupRead
+from app.schemas.notification import NotificationRead
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional comparison only
+    orjson = None
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def make_group(index: int, members: int) -> Group:
+    group = Group(
+        id=uuid.uuid4(),
+        owner_id=uuid.uuid4(),
+        name=f"Study circle {index}",
+        description="Evening problem sets",
+        start_at=NOW,
+        end_at=NOW + timedelta(days=30),
+        timezone="America/New_York",
+        period=GoalPeriod.DAILY,
+        period_target_minutes=60,
+        status=GroupStatus.ACTIVE,
+        created_at=NOW,
+        updated_at=NOW,
+        member_count=members,
+        active_session_count=0,
+        total_seconds=0,
+    )
+    group.members = [
+        GroupMember(
+            id=uuid.uuid4(),
+            group_id=group.id,
+            user_id=uuid.uuid4(),
+            role=MemberRole.MEMBER,
+            override_period_target_minutes=None,
+            created_at=NOW,
+            user=Profile(id=uuid.uuid4(), email=f"user{index}.{n}@example.edu", display_name=f"User {n}"),
+        )
+        for n in range(members)
+    ]
+    group.sessions = []
+    return group
+
+
+def make_notification(index: int, group: Group | None) -> Notification:
+    return Notification(
+        id=uuid.uuid4(),
+        recipient_id=uuid.uuid4(),
+        kind=NotificationKind.GROUP_INVITE if group else NotificationKind.GENERIC,
+        status=NotificationStatus.PENDING,
+        title=f"Notification {index}",
+        body=None,
+        group_id=group.id if group else None,
+        created_at=NOW,
+        read_at=None,
+        group=group,
+    )
+
+
+def strategies(model: type[BaseModel], objects: list) -> dict[str, Callable[[], bytes]]:
+    adapter = TypeAdapter(list[model])
+    runs = {
+        "response_model": lambda: adapter.dump_json(adapter.validate_python(objects, from_attributes=True)),
+        "validate in handler": lambda: adapter.dump_json(
+            adapter.validate_python([model.model_validate(obj) for obj in objects], from_attributes=True)
+        ),
+        "jsonable_encoder + json": lambda: json.dumps(
+            jsonable_encoder([model.model_validate(obj) for obj in objects])
+        ).encode(),
+    }
+    if orjson is not None:
+        runs["model_dump + orjson"] = lambda: orjson.dumps([model.model_validate(obj).model_dump() for obj in objects])
+    return runs
+
+
+def measure(run: Callable[[], bytes], items: int, repeat: int = 5) -> float:
+    number = max(1, 2000 // items)
+    return min(timeit.repeat(run, number=number, repeat=repeat)) / number / items * 1e6
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Response serialization microbenchmark")
+    parser.add_argument("--items", type=int, default=200, help="rows per simulated response")
+    parser.add_argument("--members", type=int, default=5, help="members per GroupRead")
+    args = parser.parse_args(argv)
+
+    groups = [make_group(index, args.members) for index in range(args.items)]
+    cases = {
+        "GroupListItem": (GroupListItem, groups),
+        f"GroupRead ({args.members} members)": (GroupRead, groups),
+        "NotificationRead": (NotificationRead, [make_notification(index, None) for index in range(args.items)]),
+        "NotificationRead + group": (
+            NotificationRead,
+            [make_notification(index, groups[index]) for index in range(args.items)],
+        ),
+    }
+    print(f"{'schema':<28}{'strategy':<26}{'µs/item':>9}")
+    for label, (model, objects) in cases.items():
+        for name, run in strategies(model, objects).items():
+            print(f"{label:<28}{name:<26}{measure(run, len(objects)):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
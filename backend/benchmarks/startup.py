@@ -0,0 +1,214 @@
+"""Cold-start benchmark: import time, lifespan start-up and time to first response.
+
+    python -m benchmarks.startup                        # 5 fresh processes per mode, check budgets.json
+    python -m benchmarks.startup --runs 10 --importtime 15
+    python -m benchmarks.startup --update-budgets
+
+Every run is a new interpreter, as in a freshly started container. The child imports
+``app.main``, drives the ASGI lifespan start-up, then sends ``GET /api/healthz`` and two
+authenticated ``GET /api/groups`` requests against ``LOCKIN_DATABASE_URL`` (any database with
+the schema loaded; the benchmark identity is created on the first, unmeasured run).
+
+``cold`` runs with every warm-up step off; ``warm`` turns on ``LOCKIN_WARMUP_SCHEMAS``,
+``LOCKIN_WARMUP_JWKS`` and ``LOCKIN_DB_WARMUP_CONNECTIONS``, moving that work from the first
+request into start-up. The child preloads a local signing key, so the ``jwks`` step only pays
+for importing the JWT stack; the fetch from the real user pool is not measured.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.endpoints import BUDGET_FILE, check_budgets
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+CLIENT_ID = "lockin-startup-benchmark"
+SUBJECT = "startup-benchmark"
+SPEC_ENV = "LOCKIN_STARTUP_BENCHMARK"
+
+MODES = {
+    "cold": {"LOCKIN_WARMUP_SCHEMAS": "false", "LOCKIN_DB_WARMUP_CONNECTIONS": "0"},
+    "warm": {"LOCKIN_WARMUP_SCHEMAS": "true", "LOCKIN_WARMUP_JWKS": "true", "LOCKIN_DB_WARMUP_CONNECTIONS": "2"},
+}
+METRICS = ("import_ms", "startup_ms", "first_request_ms", "first_api_ms", "second_api_ms", "process_ttfr_ms")
+
+
+# ---------- child process ----------
+async def _start_lifespan(app):
+    """Send ``lifespan.startup`` through the full ASGI stack, as a server would."""
+    inbox: asyncio.Queue = asyncio.Queue()
+    outbox: asyncio.Queue = asyncio.Queue()
+    await inbox.put({"type": "lifespan.startup"})
+    task = asyncio.create_task(app({"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}, inbox.get, outbox.put))
+    message = await outbox.get()
+    if message["type"] != "lifespan.startup.complete":
+        raise RuntimeError(f"lifespan start-up failed: {message.get('message')}")
+
+    async def shutdown() -> None:
+        await inbox.put({"type": "lifespan.shutdown"})
+        await outbox.get()
+        await task
+
+    return shutdown
+
+
+async def _drive(app, headers: dict[str, str], timings: dict[str, float]) -> None:
+    from httpx import ASGITransport, AsyncClient
+
+    started = time.perf_counter()
+    shutdown = await _start_lifespan(app)
+    timings["startup_ms"] = (time.perf_counter() - started) * 1000
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://startup") as client:
+        for name, path, auth in (
+            ("first_request_ms", "/api/healthz", {}),
+            ("first_api_ms", "/api/groups", headers),
+            ("second_api_ms", "/api/groups", headers),
+        ):
+            started = time.perf_counter()
+            response = await client.get(path, headers=auth)
+            timings[name] = (time.perf_counter() - started) * 1000
+            response.raise_for_status()
+            if name == "first_api_ms":
+                timings["first_response_at"] = time.time()
+    await shutdown()
+
+
+def child() -> None:
+    # The harness's own imports happen before the clock starts; the app imports httpx lazily and
+    # only for JWKS refreshes, which this run never makes.
+    import httpx  # noqa: F401
+
+    spec = json.loads(os.environ[SPEC_ENV])
+    timings: dict[str, float] = {}
+
+    started = time.perf_counter()
+    from app.main import app
+
+    timings["import_ms"] = (time.perf_counter() - started) * 1000
+
+    # Same as LocalCognito.install(), without importing jose/cryptography into the measured process.
+    from app.core import security
+
+    security._JWKS_CACHE = {spec["kid"]: spec["jwk"]}
+    security._JWKS_FETCHED_AT = time.time()
+    security._JWKS_EXP = float("inf")
+
+    asyncio.run(_drive(app, {"Authorization": f"Bearer {spec['token']}"}, timings))
+    print(json.dumps(timings))
+
+
+# ---------- parent ----------
+def run_child(mode: str, spec: dict[str, object], importtime: bool = False) -> tuple[dict[str, float], str]:
+    env = {**os.environ, **MODES[mode], SPEC_ENV: json.dumps(spec)}
+    command = [sys.executable, *(["-X", "importtime"] if importtime else []), "-m", "benchmarks.startup", "--child"]
+    launched = time.time()
+    completed = subprocess.run(command, cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"{mode} run failed:\n{completed.stderr}")
+    timings = json.loads(completed.stdout.strip().splitlines()[-1])
+    timings["process_ttfr_ms"] = (timings.pop("first_response_at") - launched) * 1000
+    return timings, completed.stderr
+
+
+def slowest_imports(report: str, limit: int) -> list[tuple[int, int, str]]:
+    """``(self µs, cumulative µs, module)`` for the slowest imports in an ``-X importtime`` report."""
+    rows = []
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "|" not in line[13:]:
+            continue
+        own, cumulative, module = (part.strip() for part in line[12:].split("|"))
+        if own.isdigit():
+            rows.append((int(own), int(cumulative), module))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def summarize(runs: list[dict[str, float]]) -> dict[str, float]:
+    summary: dict[str, float] = {"errors": 0}
+    for metric in METRICS:
+        values = [run[metric] for run in runs]
+        summary[metric] = statistics.median(values)
+        summary[f"{metric}_max"] = max(values)
+    return summary
+
+
+def budgets_from(results: dict[str, dict[str, float]], headroom: float) -> dict[str, dict[str, float]]:
+    return {
+        name: {metric: round(summary[metric] * headroom, 1) for metric in ("import_ms", "first_api_ms", "process_ttfr_ms")}
+        for name, summary in results.items()
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    if args.child:
+        child()
+        return
+
+    os.environ.setdefault("LOCKIN_AWS_REGION", "us-east-1")
+    os.environ.setdefault("LOCKIN_COGNITO_USER_POOL_ID", "us-east-1_benchmark")
+    os.environ["LOCKIN_COGNITO_APP_CLIENT_ID"] = CLIENT_ID
+    os.environ.setdefault("LOCKIN_MAINTENANCE_ENABLED", "false")
+    os.environ.setdefault("LOCKIN_SLOW_REQUEST_MS", "60000")
+    os.environ.setdefault("LOCKIN_RATE_LIMIT_ENABLED", "false")
+
+    from benchmarks.cognito import KEY_ID, LocalCognito
+
+    cognito = LocalCognito(CLIENT_ID)
+    spec = {"kid": KEY_ID, "jwk": cognito.jwk, "token": cognito.token(SUBJECT)}
+
+    # Creates the benchmark profile and warms the OS page cache and bytecode caches.
+    run_child("cold", spec)
+
+    results: dict[str, dict[str, float]] = {}
+    for mode in args.modes:
+        results[f"startup ({mode})"] = summarize([run_child(mode, spec)[0] for _ in range(args.runs)])
+
+    header = "".join(f"{metric.removesuffix('_ms') + ' ms':>18}" for metric in METRICS)
+    print(f"{'mode':<18}{header}")
+    for name, summary in results.items():
+        cells = "".join(f"{summary[metric]:>10.1f} ({summary[f'{metric}_max']:>5.0f})" for metric in METRICS)
+        print(f"{name:<18}{cells}")
+    print("median (max) over", args.runs, "runs")
+
+    if args.importtime:
+        _, report = run_child("cold", spec, importtime=True)
+        print(f"\n{'self ms':>9}{'cumulative ms':>15}  module")
+        for own, cumulative, module in slowest_imports(report, args.importtime):
+            print(f"{own / 1000:>9.1f}{cumulative / 1000:>15.1f}  {module}")
+
+    if args.update_budgets:
+        recorded = json.loads(BUDGET_FILE.read_text()) if BUDGET_FILE.exists() else {}
+        recorded.update(budgets_from(results, args.headroom))
+        BUDGET_FILE.write_text(json.dumps(recorded, indent=2, sort_keys=True) + "\n")
+        print(f"budgets written to {BUDGET_FILE}")
+        return
+
+    budgets = json.loads(BUDGET_FILE.read_text()) if BUDGET_FILE.exists() else {}
+    failures = check_budgets(results, budgets)
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Import and time-to-first-response benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes per mode")
+    parser.add_argument("--modes", nargs="+", choices=sorted(MODES), default=["cold", "warm"])
+    parser.add_argument("--importtime", type=int, default=0, metavar="N", help="also list the N slowest imports")
+    parser.add_argument("--update-budgets", action="store_true", help="write this run to budgets.json")
+    parser.add_argument("--headroom", type=float, default=1.5, help="multiplier used by --update-budgets")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    main()
@@ -57,6 +57,12 @@ export type GroupListItem = {
   updated_at: string;
 };
 
+export type GroupOverview = GroupListItem & {
+  member_count: number;
+  active_session_count: number;
+  total_seconds: number;
+};
+
 export type ProfileSummary = Profile;
 
 export type GroupMember = {
@@ -65,6 +71,7 @@ export type GroupMember = {
   user_id: string;
   role: MemberRole;
   override_period_target_minutes: number | null;
+  created_at: string;
   user: ProfileSummary | null;
 };
 
@@ -87,7 +94,7 @@ export type SessionRead = {
   participants: SessionParticipant[];
 };
 
-export type GroupRead = GroupListItem & {
+export type GroupRead = GroupOverview & {
   members: GroupMember[];
   sessions: SessionRead[];
 };
@@ -195,17 +202,33 @@ export async function updateProfile(payload: {
   });
 }
 
-export async function listGroups(status?: GroupStatus): Promise<ApiListResponse<GroupListItem>> {
+export async function listGroups(status?: GroupStatus): Promise<ApiListResponse<GroupOverview>> {
   const search = status ? `?status=${encodeURIComponent(status)}` : "";
-  return apiFetch<ApiListResponse<GroupListItem>>(`/groups${search}`);
+  return apiFetch<ApiListResponse<GroupOverview>>(`/groups${search}`);
 }
 
 export async function getGroup(groupId: string): Promise<GroupRead> {
   return apiFetch<GroupRead>(`/groups/${groupId}`);
 }
 
-export async function getGroupMembers(groupId: string): Promise<ApiListResponse<GroupMember>> {
-  return apiFetch<ApiListResponse<GroupMember>>(`/groups/${groupId}/members`);
+export async function getGroupMembers(
+  groupId: string,
+  params?: { cursor_created_at?: string; cursor_id?: string; limit?: number },
+): Promise<ApiListResponse<GroupMember>> {
+  const search = new URLSearchParams();
+  if (params?.cursor_created_at) {
+    search.set("cursor_created_at", params.cursor_created_at);
+  }
+  if (params?.cursor_id) {
+    search.set("cursor_id", params.cursor_id);
+  }
+  if (params?.limit) {
+    search.set("limit", String(params.limit));
+  }
+  const query = search.toString();
+  return apiFetch<ApiListResponse<GroupMember>>(
+    `/groups/${groupId}/members${query ? `?${query}` : ""}`,
+  );
 }
 
 export async function getGroupProgress(groupId: string): Promise<ApiListResponse<GroupProgressRow>> {
@@ -86,6 +86,8 @@ CREATE TABLE IF NOT EXISTS groups (
 CREATE INDEX IF NOT EXISTS idx_groups_owner   ON groups(owner_id);
 CREATE INDEX IF NOT EXISTS idx_groups_status  ON groups(status);
 CREATE INDEX IF NOT EXISTS idx_groups_end_at  ON groups(end_at);
+-- maintenance runner archives expired groups oldest-first in small batches
+CREATE INDEX IF NOT EXISTS idx_groups_unarchived_end_at ON groups(end_at) WHERE status <> 'archived';
 
 -- ---------- Group Members ----------
 CREATE TABLE IF NOT EXISTS group_members (
@@ -100,7 +102,9 @@ CREATE TABLE IF NOT EXISTS group_members (
   UNIQUE(group_id, user_id)
 );
 
-CREATE INDEX IF NOT EXISTS idx_group_members_group ON group_members(group_id);
+-- member lists page through (created_at, id) per group
+DROP INDEX IF EXISTS idx_group_members_group;
+CREATE INDEX IF NOT EXISTS idx_group_members_group_cursor ON group_members(group_id, created_at, id);
 CREATE INDEX IF NOT EXISTS idx_group_members_user  ON group_members(user_id);
 
 -- prevent adding members to archived groups
@@ -188,9 +192,51 @@ CREATE TABLE IF NOT EXISTS notifications (
   read_at      TIMESTAMPTZ
 );
 
-CREATE INDEX IF NOT EXISTS idx_notifications_recipient ON notifications(recipient_id, created_at DESC);
+-- keyset pages walk (created_at, id) per recipient; status rides along for the read/unread filters
+DROP INDEX IF EXISTS idx_notifications_recipient;
+CREATE INDEX IF NOT EXISTS idx_notifications_recipient_cursor
+  ON notifications(recipient_id, created_at DESC, id DESC) INCLUDE (status);
+-- unread inbox only touches pending rows, never the read history
+CREATE INDEX IF NOT EXISTS idx_notifications_recipient_pending
+  ON notifications(recipient_id, created_at DESC, id DESC) WHERE status = 'pending';
+-- retention purge scans resolved rows oldest-first
+CREATE INDEX IF NOT EXISTS idx_notifications_resolved_created
+  ON notifications(created_at) WHERE status <> 'pending';
+
+CREATE TABLE IF NOT EXISTS notifications_archive (
+  LIKE notifications INCLUDING DEFAULTS,
+  archived_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (id)
+);
+
+-- wake long-polling inbox requests on every API worker (LOCKIN_NOTIFICATION_LISTEN=true).
+-- The API sets lockin.notify_listen on its connections only then: every NOTIFY takes the
+-- global notify-queue lock at commit, which would serialize inserts with nobody listening.
+CREATE OR REPLACE FUNCTION notify_notification_insert()
+RETURNS TRIGGER LANGUAGE plpgsql AS $$
+BEGIN
+  IF current_setting('lockin.notify_listen', true) = 'on' THEN
+    PERFORM pg_notify('lockin_notifications', NEW.recipient_id::text);
+  END IF;
+  RETURN NEW;
+END $$;
+
+DROP TRIGGER IF EXISTS trg_notify_notification_insert ON notifications;
+CREATE TRIGGER trg_notify_notification_insert
+  AFTER INSERT ON notifications
+  FOR EACH ROW EXECUTE FUNCTION notify_notification_insert();
 
 -- ---------- Current-Period Progress View ----------
+-- Local start of the period containing an instant. Where a DST change repeats midnight,
+-- AT TIME ZONE starts the day at the second (standard-time) one, so the first hour of the
+-- local date still belongs to the previous period.
+CREATE OR REPLACE FUNCTION local_period_start(unit TEXT, step INTERVAL, tz TEXT, instant TIMESTAMPTZ)
+RETURNS TIMESTAMP LANGUAGE sql STABLE AS $$
+  SELECT CASE WHEN date_trunc(unit, instant AT TIME ZONE tz) AT TIME ZONE tz > instant
+              THEN date_trunc(unit, instant AT TIME ZONE tz) - step
+              ELSE date_trunc(unit, instant AT TIME ZONE tz) END;
+$$;
+
 CREATE OR REPLACE VIEW group_member_period_progress AS
 WITH params AS (
   SELECT
@@ -208,23 +254,20 @@ WITH params AS (
 window_base AS (
   SELECT
     p.*,
-    CASE
-      WHEN p.period = 'daily'
-        THEN (date_trunc('day', (now() AT TIME ZONE p.timezone)) AT TIME ZONE p.timezone)
-      WHEN p.period = 'weekly'
-        THEN (date_trunc('week', (now() AT TIME ZONE p.timezone)) AT TIME ZONE p.timezone)
-    END AS w_start
+    local_period_start(s.unit, s.step, p.timezone, now()) AS w_local,
+    s.step
   FROM params p
+  CROSS JOIN LATERAL (
+    SELECT CASE WHEN p.period = 'daily' THEN 'day' ELSE 'week' END AS unit,
+           CASE WHEN p.period = 'daily' THEN interval '1 day' ELSE interval '1 week' END AS step
+  ) s
 ),
+-- The step is added to the local start, so a window across a DST change keeps local midnights.
 clamped AS (
   SELECT
     w.*,
-    GREATEST(w.w_start, w.start_at) AS period_start,
-    LEAST(
-      CASE WHEN w.period = 'daily'  THEN w.w_start + interval '1 day'
-           WHEN w.period = 'weekly' THEN w.w_start + interval '1 week' END,
-      w.end_at
-    ) AS period_end
+    GREATEST(w.w_local AT TIME ZONE w.timezone, w.start_at) AS period_start,
+    LEAST((w.w_local + w.step) AT TIME ZONE w.timezone, w.end_at) AS period_end
   FROM window_base w
 ),
 accum AS (
@@ -266,6 +309,200 @@ BEGIN
   RETURN n;
 END $$;
 
+-- ---------- Period Totals (history) ----------
+-- Per-member totals for every daily/weekly window of a group's lifetime, windows computed
+-- in the group's timezone and logs clamped to each window. range_start/range_end keep only
+-- windows starting in [range_start, range_end), and only the logs those windows can touch.
+--
+-- A completed window's totals cannot change without a write that clears them (see Period
+-- Rollups below), so seal_group_periods() stores them once in group_period_rollups, keyed
+-- by user id; only the unsealed windows, usually just the current one, are read from logs.
+CREATE TABLE IF NOT EXISTS group_period_rollups (
+  group_id        UUID NOT NULL REFERENCES groups(id) ON DELETE CASCADE,
+  period_start    TIMESTAMPTZ NOT NULL,
+  period_end      TIMESTAMPTZ NOT NULL,
+  seconds_by_user JSONB NOT NULL DEFAULT '{}'::jsonb,
+  sealed_at       TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (group_id, period_start)
+);
+
+DROP FUNCTION IF EXISTS group_period_totals(UUID);
+CREATE OR REPLACE FUNCTION group_period_totals(
+  target_group UUID,
+  range_start  TIMESTAMPTZ DEFAULT NULL,
+  range_end    TIMESTAMPTZ DEFAULT NULL
+)
+RETURNS TABLE (
+  group_id       UUID,
+  user_id        UUID,
+  period_start   TIMESTAMPTZ,
+  period_end     TIMESTAMPTZ,
+  seconds_done   BIGINT,
+  target_minutes INTEGER
+) LANGUAGE sql STABLE AS $$
+  WITH g AS (
+    SELECT grp.*,
+           CASE grp.period WHEN 'daily' THEN 'day' ELSE 'week' END AS unit,
+           CASE grp.period WHEN 'daily' THEN interval '1 day' ELSE interval '1 week' END AS step
+      FROM groups grp
+     WHERE grp.id = target_group
+  ),
+  all_windows AS (
+    SELECT local_start,
+           GREATEST(local_start AT TIME ZONE g.timezone, g.start_at) AS period_start,
+           LEAST((local_start + g.step) AT TIME ZONE g.timezone, g.end_at) AS period_end
+      FROM g,
+           generate_series(
+             local_period_start(g.unit, g.step, g.timezone, g.start_at),
+             g.end_at AT TIME ZONE g.timezone,
+             g.step
+           ) AS local_start
+     WHERE local_start AT TIME ZONE g.timezone < g.end_at
+  ),
+  windows AS (
+    SELECT w.*, r.seconds_by_user
+      FROM all_windows w
+      LEFT JOIN group_period_rollups r
+             ON r.group_id = target_group AND r.period_start = w.period_start
+     WHERE w.period_start >= COALESCE(range_start, '-infinity')
+       AND w.period_start <  COALESCE(range_end, 'infinity')
+  ),
+  open_windows AS (
+    SELECT local_start, period_start, period_end FROM windows WHERE seconds_by_user IS NULL
+  ),
+  -- One pass over the logs: each log lists the local window starts it spans (one, unless it
+  -- crosses midnight or a week boundary) and meets its windows by key, instead of every log
+  -- being tested against every window. Materialized so the windows are hashed once.
+  spans AS MATERIALIZED (
+    SELECT sp.user_id, tl.started_at, tl.ended_at, spanned.local_start
+      FROM g
+      JOIN sessions s ON s.group_id = g.id
+      JOIN session_participants sp ON sp.session_id = s.id
+      JOIN time_logs tl ON tl.participant_id = sp.id
+      CROSS JOIN LATERAL generate_series(
+             local_period_start(g.unit, g.step, g.timezone, tl.started_at),
+             tl.ended_at AT TIME ZONE g.timezone,
+             g.step
+           ) AS spanned(local_start)
+     WHERE EXISTS (
+             SELECT 1 FROM open_windows o
+              WHERE s.started_at < o.period_end
+                AND (s.ended_at IS NULL OR s.ended_at > o.period_start)
+           )
+  ),
+  live AS (
+    SELECT sp.user_id, ow.period_start,
+           SUM(EXTRACT(EPOCH FROM (LEAST(sp.ended_at, ow.period_end) - GREATEST(sp.started_at, ow.period_start))))::bigint
+             AS seconds_done
+      FROM spans sp
+      JOIN open_windows ow ON ow.local_start = sp.local_start
+     WHERE sp.started_at < ow.period_end
+       AND sp.ended_at   > ow.period_start
+     GROUP BY sp.user_id, ow.period_start
+  )
+  SELECT
+    g.id,
+    gm.user_id,
+    w.period_start,
+    w.period_end,
+    COALESCE(
+      CASE WHEN w.seconds_by_user IS NULL THEN l.seconds_done
+           ELSE (w.seconds_by_user ->> gm.user_id::text)::bigint END,
+      0
+    ),
+    COALESCE(gm.override_period_target_minutes, g.period_target_minutes)
+  FROM g
+  JOIN group_members gm ON gm.group_id = g.id
+  CROSS JOIN windows w
+  LEFT JOIN live l ON l.user_id = gm.user_id AND l.period_start = w.period_start
+$$;
+
+-- ---------- Cold Storage (archived groups) ----------
+ALTER TABLE groups ADD COLUMN IF NOT EXISTS summarized_at TIMESTAMPTZ;
+
+CREATE INDEX IF NOT EXISTS idx_groups_unsummarized
+  ON groups(end_at) WHERE status = 'archived' AND summarized_at IS NULL;
+
+CREATE TABLE IF NOT EXISTS group_period_summaries (
+  group_id       UUID NOT NULL REFERENCES groups(id) ON DELETE CASCADE,
+  user_id        UUID NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+  period_start   TIMESTAMPTZ NOT NULL,
+  period_end     TIMESTAMPTZ NOT NULL,
+  seconds_done   BIGINT NOT NULL,
+  target_minutes INTEGER NOT NULL,
+  goal_met       BOOLEAN GENERATED ALWAYS AS (seconds_done >= target_minutes * 60) STORED,
+  PRIMARY KEY (group_id, user_id, period_start)
+);
+
+CREATE TABLE IF NOT EXISTS sessions_archive (
+  LIKE sessions INCLUDING DEFAULTS,
+  archived_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (id)
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_archive_group ON sessions_archive(group_id);
+
+CREATE TABLE IF NOT EXISTS session_participants_archive (
+  LIKE session_participants INCLUDING DEFAULTS,
+  archived_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (id)
+);
+CREATE INDEX IF NOT EXISTS idx_sp_archive_session ON session_participants_archive(session_id);
+
+CREATE TABLE IF NOT EXISTS time_logs_archive (
+  LIKE time_logs INCLUDING DEFAULTS,
+  archived_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (id)
+);
+CREATE INDEX IF NOT EXISTS idx_time_logs_archive_participant ON time_logs_archive(participant_id);
+
+-- Freeze an archived group's history into group_period_summaries and move its sessions,
+-- participants and logs out of the hot tables. Returns the number of sessions moved.
+CREATE OR REPLACE FUNCTION summarize_archived_group(target_group UUID)
+RETURNS INTEGER LANGUAGE plpgsql AS $$
+DECLARE g groups; n INT;
+BEGIN
+  SELECT * INTO g FROM groups WHERE id = target_group FOR UPDATE;
+  IF g.id IS NULL OR g.status <> 'archived' OR g.summarized_at IS NOT NULL THEN
+    RETURN 0;
+  END IF;
+
+  INSERT INTO group_period_summaries (group_id, user_id, period_start, period_end, seconds_done, target_minutes)
+  SELECT t.group_id, t.user_id, t.period_start, t.period_end, t.seconds_done, t.target_minutes
+    FROM group_period_totals(target_group) t
+  ON CONFLICT DO NOTHING;
+  -- The summaries replace them; left in place, each session deleted below would clear them piecemeal.
+  DELETE FROM group_period_rollups WHERE group_id = target_group;
+
+  INSERT INTO time_logs_archive (id, participant_id, started_at, ended_at, created_at)
+  SELECT tl.id, tl.participant_id, tl.started_at, tl.ended_at, tl.created_at
+    FROM time_logs tl
+    JOIN session_participants sp ON sp.id = tl.participant_id
+    JOIN sessions s ON s.id = sp.session_id
+   WHERE s.group_id = target_group
+  ON CONFLICT DO NOTHING;
+
+  INSERT INTO session_participants_archive (id, session_id, user_id, role)
+  SELECT sp.id, sp.session_id, sp.user_id, sp.role
+    FROM session_participants sp
+    JOIN sessions s ON s.id = sp.session_id
+   WHERE s.group_id = target_group
+  ON CONFLICT DO NOTHING;
+
+  INSERT INTO sessions_archive (id, group_id, creator_id, status, started_at, ended_at, created_at)
+  SELECT s.id, s.group_id, s.creator_id, s.status, s.started_at, s.ended_at, s.created_at
+    FROM sessions s
+   WHERE s.group_id = target_group
+  ON CONFLICT DO NOTHING;
+
+  -- participants and logs follow via ON DELETE CASCADE
+  DELETE FROM sessions WHERE group_id = target_group;
+  GET DIAGNOSTICS n = ROW_COUNT;
+
+  -- Deleting the sessions emptied the counters; the group's lifetime total stands.
+  UPDATE groups SET summarized_at = now(), total_seconds = g.total_seconds WHERE id = target_group;
+  RETURN n;
+END $$;
+
 -- ---------- Clone Group (Repeat) ----------
 CREATE OR REPLACE FUNCTION clone_group(original_group UUID, new_owner UUID)
 RETURNS UUID LANGUAGE plpgsql AS $$
@@ -291,4 +528,603 @@ BEGIN
    WHERE gm.group_id = original_group;
 
   RETURN new_group;
-END $$;
\ No newline at end of file
+END $$;
+
+-- ---------- Version Counters (conditional GETs) ----------
+-- Bumped by triggers on every write that changes a group's detail/progress or a recipient's
+-- inbox, so the API can answer If-None-Match with a single primary-key lookup. No foreign
+-- keys: cascaded deletes still bump, and stale rows for deleted parents are harmless.
+CREATE TABLE IF NOT EXISTS group_versions (
+  group_id    UUID PRIMARY KEY,
+  version     BIGINT NOT NULL DEFAULT 1,
+  changed_at  TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS recipient_versions (
+  recipient_id  UUID PRIMARY KEY,
+  version       BIGINT NOT NULL DEFAULT 1,
+  changed_at    TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- group invalidation fans out to recipients whose notifications embed the group
+CREATE INDEX IF NOT EXISTS idx_notifications_group
+  ON notifications(group_id) WHERE group_id IS NOT NULL;
+
+CREATE OR REPLACE FUNCTION bump_group_version(target_group UUID)
+RETURNS VOID LANGUAGE sql AS $$
+  INSERT INTO group_versions (group_id)
+  SELECT target_group WHERE target_group IS NOT NULL
+  ON CONFLICT (group_id) DO UPDATE
+    SET version = group_versions.version + 1, changed_at = now();
+$$;
+
+CREATE OR REPLACE FUNCTION bump_recipient_version(target_recipient UUID)
+RETURNS VOID LANGUAGE sql AS $$
+  INSERT INTO recipient_versions (recipient_id)
+  SELECT target_recipient WHERE target_recipient IS NOT NULL
+  ON CONFLICT (recipient_id) DO UPDATE
+    SET version = recipient_versions.version + 1, changed_at = now();
+$$;
+
+-- owning group of a groups / group_members / sessions / session_participants / time_logs row
+CREATE OR REPLACE FUNCTION version_group_of(source_table TEXT, row_data JSONB)
+RETURNS UUID LANGUAGE sql STABLE AS $$
+  SELECT CASE source_table
+    WHEN 'groups' THEN (row_data->>'id')::uuid
+    WHEN 'session_participants' THEN
+      (SELECT s.group_id FROM sessions s WHERE s.id = (row_data->>'session_id')::uuid)
+    WHEN 'time_logs' THEN
+      (SELECT s.group_id
+         FROM session_participants sp
+         JOIN sessions s ON s.id = sp.session_id
+        WHERE sp.id = (row_data->>'participant_id')::uuid)
+    ELSE (row_data->>'group_id')::uuid
+  END;
+$$;
+
+CREATE OR REPLACE FUNCTION touch_group_version()
+RETURNS TRIGGER LANGUAGE plpgsql AS $$
+DECLARE
+  old_group UUID;
+  new_group UUID;
+BEGIN
+  IF TG_OP <> 'INSERT' THEN
+    old_group := version_group_of(TG_TABLE_NAME, to_jsonb(OLD));
+  END IF;
+  IF TG_OP <> 'DELETE' THEN
+    new_group := version_group_of(TG_TABLE_NAME, to_jsonb(NEW));
+  END IF;
+  PERFORM bump_group_version(new_group);
+  IF old_group IS DISTINCT FROM new_group THEN
+    PERFORM bump_group_version(old_group);
+  END IF;
+  RETURN NULL;
+END $$;
+
+DO $$
+DECLARE t TEXT;
+BEGIN
+  FOREACH t IN ARRAY ARRAY['group_members', 'sessions', 'session_participants', 'time_logs'] LOOP
+    EXECUTE format('DROP TRIGGER IF EXISTS trg_touch_group_version ON %I', t);
+    EXECUTE format(
+      'CREATE TRIGGER trg_touch_group_version AFTER INSERT OR UPDATE OR DELETE ON %I '
+      'FOR EACH ROW EXECUTE FUNCTION touch_group_version()', t);
+  END LOOP;
+END $$;
+
+-- Not the activity counters (see Group Counters): the write that moves them has bumped the
+-- version already, and recount_group_counters bumps it for a correction.
+DROP TRIGGER IF EXISTS trg_touch_group_version ON groups;
+CREATE TRIGGER trg_touch_group_version
+  AFTER INSERT OR DELETE OR UPDATE OF id, owner_id, name, description, start_at, end_at, timezone, period,
+                                      period_target_minutes, status, created_at, updated_at, summarized_at ON groups
+  FOR EACH ROW EXECUTE FUNCTION touch_group_version();
+
+-- member profiles are embedded in group detail
+CREATE OR REPLACE FUNCTION touch_member_group_versions()
+RETURNS TRIGGER LANGUAGE plpgsql AS $$
+BEGIN
+  IF (NEW.email, NEW.display_name, NEW.avatar_url) IS DISTINCT FROM (OLD.email, OLD.display_name, OLD.avatar_url) THEN
+    PERFORM bump_group_version(gm.group_id) FROM group_members gm WHERE gm.user_id = NEW.id;
+  END IF;
+  RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS trg_touch_member_group_versions ON profiles;
+CREATE TRIGGER trg_touch_member_group_versions
+  AFTER UPDATE ON profiles
+  FOR EACH ROW EXECUTE FUNCTION touch_member_group_versions();
+
+CREATE OR REPLACE FUNCTION touch_recipient_version()
+RETURNS TRIGGER LANGUAGE plpgsql AS $$
+BEGIN
+  IF TG_OP <> 'DELETE' THEN
+    PERFORM bump_recipient_version(NEW.recipient_id);
+  END IF;
+  IF TG_OP <> 'INSERT' AND (TG_OP = 'DELETE' OR OLD.recipient_id IS DISTINCT FROM NEW.recipient_id) THEN
+    PERFORM bump_recipient_version(OLD.recipient_id);
+  END IF;
+  RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS trg_touch_recipient_version ON notifications;
+CREATE TRIGGER trg_touch_recipient_version
+  AFTER INSERT OR UPDATE OR DELETE ON notifications
+  FOR EACH ROW EXECUTE FUNCTION touch_recipient_version();
+
+-- notification lists embed a summary of their group
+CREATE OR REPLACE FUNCTION touch_group_recipient_versions()
+RETURNS TRIGGER LANGUAGE plpgsql AS $$
+BEGIN
+  IF ROW(NEW.*) IS DISTINCT FROM ROW(OLD.*) THEN
+    PERFORM bump_recipient_version(recipient_id)
+       FROM (SELECT DISTINCT n.recipient_id FROM notifications n WHERE n.group_id = NEW.id) r;
+  END IF;
+  RETURN NULL;
+END $$;
+
+-- Only the columns of that summary (GroupListItem): the activity counters move on every time
+-- log, and each such update would otherwise fan out to every recipient.
+DROP TRIGGER IF EXISTS trg_touch_group_recipient_versions ON groups;
+CREATE TRIGGER trg_touch_group_recipient_versions
+  AFTER UPDATE OF owner_id, name, description, start_at, end_at, timezone, period,
+                  period_target_minutes, status, created_at, updated_at ON groups
+  FOR EACH ROW EXECUTE FUNCTION touch_group_recipient_versions();
+
+-- ---------- Response Cache (shared tier) ----------
+-- Serialized responses shared between API workers when LOCKIN_RESPONSE_CACHE_SHARED is set.
+-- Keys embed the version counters above, so rows are never updated in place by writes; the
+-- maintenance job purges rows older than the configured TTL. UNLOGGED: losing it on a crash
+-- only costs hit rate.
+CREATE UNLOGGED TABLE IF NOT EXISTS response_cache (
+  key        TEXT PRIMARY KEY,
+  value      BYTEA NOT NULL,
+  stored_at  TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- ---------- Rate Limit Buckets (shared backend) ----------
+-- Token buckets per profile shared between API workers when LOCKIN_RATE_LIMIT_SHARED is set.
+-- One upsert per request refills and spends atomically; idle rows (already full again) are
+-- purged by the maintenance job. UNLOGGED: after a crash every bucket simply starts full.
+CREATE UNLOGGED TABLE IF NOT EXISTS rate_limit_buckets (
+  key         TEXT PRIMARY KEY,
+  tokens      DOUBLE PRECISION NOT NULL,
+  admitted    BOOLEAN NOT NULL,
+  updated_at  TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- ---------- Avatar Uploads ----------
+-- Clients upload originals straight to S3 with a presigned POST, then register the key here.
+-- API workers claim pending rows (FOR UPDATE SKIP LOCKED), write a fixed-size thumbnail next to
+-- the original and point profiles.avatar_url at it; avatar_key is that thumbnail's object key
+-- (NULL when avatar_url was set directly). Rows stuck in 'processing' are reclaimed.
+ALTER TABLE profiles ADD COLUMN IF NOT EXISTS avatar_key TEXT;
+
+DO $$ BEGIN
+  CREATE TYPE avatar_upload_status AS ENUM ('pending','processing','done','superseded','failed');
+EXCEPTION WHEN duplicate_object THEN NULL; END $$;
+
+CREATE TABLE IF NOT EXISTS avatar_uploads (
+  id             UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  profile_id     UUID NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+  source_key     TEXT NOT NULL UNIQUE,
+  status         avatar_upload_status NOT NULL DEFAULT 'pending',
+  attempts       INT NOT NULL DEFAULT 0,
+  thumbnail_key  TEXT,
+  error          TEXT,
+  claimed_at     TIMESTAMPTZ,
+  processed_at   TIMESTAMPTZ,
+  created_at     TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_avatar_uploads_queue
+  ON avatar_uploads(created_at) WHERE status IN ('pending','processing');
+CREATE INDEX IF NOT EXISTS idx_avatar_uploads_profile
+  ON avatar_uploads(profile_id, created_at DESC);
+
+-- ---------- Group Search ----------
+-- Discovery search over name (weight A) and description (weight B). The 'simple' configuration
+-- does not stem, so prefix queries on a half-typed word ('chem:*') match as typed. Only
+-- non-archived groups are searchable, and both partial indexes leave archived ones out. Only
+-- the newest 1000 matches are ranked: broad terms walk idx_groups_searchable_recent and stop
+-- early, while selective terms use the GIN index. Adding the stored column rewrites `groups` once.
+ALTER TABLE groups ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+  GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+  ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_groups_search
+  ON groups USING GIN (search_vector) WHERE status <> 'archived';
+
+CREATE INDEX IF NOT EXISTS idx_groups_searchable_recent
+  ON groups(created_at DESC, id DESC) WHERE status <> 'archived';
+
+-- ---------- Group Exports ----------
+-- Exports (and group_period_totals) reach a group's logs through its sessions' participants;
+-- without this every export scans all of time_logs. started_at serves the export date range.
+CREATE INDEX IF NOT EXISTS idx_time_logs_participant
+  ON time_logs(participant_id, started_at);
+
+-- ---------- Period Rollups ----------
+-- group_period_rollups (see Period Totals) holds completed windows only. Any write that can
+-- change a window's totals deletes the rollups it overlaps and queues the group, and the
+-- seal_group_periods maintenance job re-seals it. Writers take a KEY SHARE lock on the group's
+-- row and sealing locks it FOR UPDATE, so a seal never stores totals that miss a log committed
+-- while it ran. Row locks, unlike advisory locks, take no lock table entry, so one transaction
+-- can touch any number of groups (a bulk load of a million runs out otherwise). A member
+-- joining clears all of the group's rollups, which only hold current members' totals.
+CREATE TABLE IF NOT EXISTS group_rollup_queue (
+  group_id  UUID PRIMARY KEY,  -- no foreign key: deleting a group detaches, and so queues, its sessions
+  queued_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS idx_group_rollup_queue_queued ON group_rollup_queue(queued_at);
+
+CREATE OR REPLACE FUNCTION forget_group_rollups(
+  target_group UUID,
+  from_ts      TIMESTAMPTZ DEFAULT '-infinity',
+  to_ts        TIMESTAMPTZ DEFAULT 'infinity'
+)
+RETURNS VOID LANGUAGE plpgsql AS $$
+BEGIN
+  IF target_group IS NULL THEN
+    RETURN;
+  END IF;
+  PERFORM 1 FROM groups WHERE id = target_group FOR KEY SHARE;
+  DELETE FROM group_period_rollups r
+   WHERE r.group_id = target_group
+     AND r.period_start < to_ts
+     AND r.period_end   > from_ts;
+  INSERT INTO group_rollup_queue (group_id) VALUES (target_group)
+  ON CONFLICT (group_id) DO NOTHING;
+END $$;
+
+CREATE OR REPLACE FUNCTION touch_group_rollups()
+RETURNS TRIGGER LANGUAGE plpgsql AS $$
+DECLARE
+  s sessions%ROWTYPE;
+BEGIN
+  IF TG_TABLE_NAME = 'time_logs' THEN
+    IF TG_OP <> 'INSERT' THEN
+      PERFORM forget_group_rollups(version_group_of('time_logs', to_jsonb(OLD)), OLD.started_at, OLD.ended_at);
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+      PERFORM forget_group_rollups(version_group_of('time_logs', to_jsonb(NEW)), NEW.started_at, NEW.ended_at);
+    END IF;
+  ELSIF TG_TABLE_NAME = 'session_participants' THEN
+    -- Gone already when the session itself is deleted; its own trigger covers that case.
+    SELECT * INTO s FROM sessions WHERE id = OLD.session_id;
+    IF FOUND AND s.started_at IS NOT NULL THEN
+      PERFORM forget_group_rollups(s.group_id, s.started_at, COALESCE(s.ended_at, 'infinity'));
+    END IF;
+    IF TG_OP = 'UPDATE' THEN
+      SELECT * INTO s FROM sessions WHERE id = NEW.session_id;
+      IF FOUND AND s.started_at IS NOT NULL THEN
+        PERFORM forget_group_rollups(s.group_id, s.started_at, COALESCE(s.ended_at, 'infinity'));
+      END IF;
+    END IF;
+  ELSIF TG_TABLE_NAME = 'sessions' THEN
+    -- Logs always fall inside their session, so the session's span bounds what can change.
+    IF OLD.started_at IS NOT NULL THEN
+      PERFORM forget_group_rollups(OLD.group_id, OLD.started_at, COALESCE(OLD.ended_at, 'infinity'));
+      IF TG_OP = 'UPDATE' THEN
+        PERFORM forget_group_rollups(NEW.group_id, OLD.started_at, COALESCE(OLD.ended_at, 'infinity'));
+      END IF;
+    END IF;
+  ELSIF TG_TABLE_NAME = 'group_members' THEN
+    PERFORM forget_group_rollups(NEW.group_id);
+  ELSE  -- groups: the windows themselves moved
+    PERFORM forget_group_rollups(NEW.id);
+  END IF;
+  RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS trg_touch_group_rollups ON time_logs;
+CREATE TRIGGER trg_touch_group_rollups
+AFTER INSERT OR UPDATE OR DELETE ON time_logs
+FOR EACH ROW EXECUTE FUNCTION touch_group_rollups();
+
+DROP TRIGGER IF EXISTS trg_touch_group_rollups ON session_participants;
+CREATE TRIGGER trg_touch_group_rollups
+AFTER UPDATE OF session_id, user_id OR DELETE ON session_participants
+FOR EACH ROW EXECUTE FUNCTION touch_group_rollups();
+
+DROP TRIGGER IF EXISTS trg_touch_group_rollups ON sessions;
+CREATE TRIGGER trg_touch_group_rollups
+AFTER UPDATE OF group_id OR DELETE ON sessions
+FOR EACH ROW EXECUTE FUNCTION touch_group_rollups();
+
+DROP TRIGGER IF EXISTS trg_touch_group_rollups ON group_members;
+CREATE TRIGGER trg_touch_group_rollups
+AFTER INSERT OR UPDATE OF group_id, user_id ON group_members
+FOR EACH ROW EXECUTE FUNCTION touch_group_rollups();
+
+DROP TRIGGER IF EXISTS trg_touch_group_rollups ON groups;
+CREATE TRIGGER trg_touch_group_rollups
+AFTER UPDATE OF timezone, period, start_at, end_at ON groups
+FOR EACH ROW EXECUTE FUNCTION touch_group_rollups();
+
+-- Seals every completed, unsealed window of one group and returns how many it stored. The
+-- group leaves the queue once no session reaches past its last sealed window; otherwise it
+-- goes to the back of the queue.
+CREATE OR REPLACE FUNCTION seal_group_periods(target_group UUID)
+RETURNS INTEGER LANGUAGE plpgsql AS $$
+DECLARE
+  grp groups%ROWTYPE;
+  n   INT := 0;
+BEGIN
+  SELECT * INTO grp FROM groups WHERE id = target_group FOR UPDATE;
+  -- Cold storage serves frozen summaries instead.
+  IF NOT FOUND OR grp.summarized_at IS NOT NULL THEN
+    DELETE FROM group_rollup_queue WHERE group_id = target_group;
+    RETURN 0;
+  END IF;
+
+  INSERT INTO group_period_rollups (group_id, period_start, period_end, seconds_by_user)
+  SELECT target_group, t.period_start, t.period_end,
+         COALESCE(jsonb_object_agg(t.user_id, t.seconds_done) FILTER (WHERE t.seconds_done > 0), '{}')
+    FROM group_period_totals(target_group, NULL, now()) t
+   WHERE t.period_end <= now()
+     AND NOT EXISTS (
+           SELECT 1 FROM group_period_rollups r
+            WHERE r.group_id = target_group AND r.period_start = t.period_start
+         )
+   GROUP BY t.period_start, t.period_end;
+  GET DIAGNOSTICS n = ROW_COUNT;
+
+  DELETE FROM group_rollup_queue q
+   WHERE q.group_id = target_group
+     AND NOT EXISTS (
+           SELECT 1 FROM sessions s
+            WHERE s.group_id = target_group
+              AND s.started_at < grp.end_at
+              AND LEAST(s.ended_at, grp.end_at) > (
+                    SELECT COALESCE(max(r.period_end), grp.start_at)
+                      FROM group_period_rollups r WHERE r.group_id = target_group
+                  )
+         );
+  UPDATE group_rollup_queue SET queued_at = now() WHERE group_id = target_group;
+  RETURN n;
+END $$;
+
+-- ---------- Group Counters ----------
+-- member_count, active_session_count (running or paused) and total_seconds (all time logs) on
+-- groups are kept by row triggers in the writing transaction, so lists and detail read them
+-- instead of counting. A delete subtracts at the outermost row it removes, in a BEFORE trigger
+-- while that row's group can still be found; rows its cascade removes no longer resolve to a
+-- group and subtract nothing. Cold storage keeps a summarized group's total_seconds.
+ALTER TABLE groups ADD COLUMN IF NOT EXISTS member_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE groups ADD COLUMN IF NOT EXISTS active_session_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE groups ADD COLUMN IF NOT EXISTS total_seconds BIGINT NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION add_group_counts(target_group UUID, members INT, active INT, seconds BIGINT)
+RETURNS VOID LANGUAGE sql AS $$
+  UPDATE groups
+     SET member_count = member_count + members,
+         active_session_count = active_session_count + active,
+         total_seconds = total_seconds + seconds
+   WHERE id = target_group
+     AND (members <> 0 OR active <> 0 OR seconds <> 0);
+$$;
+
+CREATE OR REPLACE FUNCTION session_is_active(s_status session_status)
+RETURNS INT LANGUAGE sql IMMUTABLE AS $$
+  SELECT CASE WHEN s_status IN ('running', 'paused') THEN 1 ELSE 0 END;
+$$;
+
+CREATE OR REPLACE FUNCTION time_log_seconds(started TIMESTAMPTZ, ended TIMESTAMPTZ)
+RETURNS BIGINT LANGUAGE sql IMMUTABLE AS $$
+  SELECT EXTRACT(EPOCH FROM ended - started)::bigint;
+$$;
+
+CREATE OR REPLACE FUNCTION participant_seconds(target_participant UUID)
+RETURNS BIGINT LANGUAGE sql STABLE AS $$
+  SELECT COALESCE(sum(time_log_seconds(tl.started_at, tl.ended_at)), 0)::bigint
+    FROM time_logs tl
+   WHERE tl.participant_id = target_participant;
+$$;
+
+CREATE OR REPLACE FUNCTION session_seconds(target_session UUID)
+RETURNS BIGINT LANGUAGE sql STABLE AS $$
+  SELECT COALESCE(sum(time_log_seconds(tl.started_at, tl.ended_at)), 0)::bigint
+    FROM session_participants sp
+    JOIN time_logs tl ON tl.participant_id = sp.id
+   WHERE sp.session_id = target_session;
+$$;
+
+CREATE OR REPLACE FUNCTION count_group_activity()
+RETURNS TRIGGER LANGUAGE plpgsql AS $$
+DECLARE
+  old_group UUID;
+  new_group UUID;
+  moved     BIGINT;
+BEGIN
+  IF TG_TABLE_NAME = 'group_members' THEN
+    IF TG_OP = 'UPDATE' AND OLD.group_id IS NOT DISTINCT FROM NEW.group_id THEN
+      RETURN NULL;
+    END IF;
+    IF TG_OP <> 'INSERT' THEN
+      PERFORM add_group_counts(OLD.group_id, -1, 0, 0);
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+      PERFORM add_group_counts(NEW.group_id, 1, 0, 0);
+    END IF;
+
+  ELSIF TG_TABLE_NAME = 'sessions' THEN
+    IF TG_OP = 'INSERT' THEN
+      PERFORM add_group_counts(NEW.group_id, 0, session_is_active(NEW.status), 0);
+    ELSIF TG_OP = 'DELETE' THEN
+      PERFORM add_group_counts(OLD.group_id, 0, -session_is_active(OLD.status), -session_seconds(OLD.id));
+      RETURN OLD;
+    ELSIF OLD.group_id IS NOT DISTINCT FROM NEW.group_id THEN
+      PERFORM add_group_counts(NEW.group_id, 0, session_is_active(NEW.status) - session_is_active(OLD.status), 0);
+    ELSE
+      moved := session_seconds(NEW.id);
+      PERFORM add_group_counts(OLD.group_id, 0, -session_is_active(OLD.status), -moved);
+      PERFORM add_group_counts(NEW.group_id, 0, session_is_active(NEW.status), moved);
+    END IF;
+
+  ELSIF TG_TABLE_NAME = 'session_participants' THEN
+    old_group := version_group_of('session_participants', to_jsonb(OLD));
+    IF TG_OP = 'DELETE' THEN
+      PERFORM add_group_counts(old_group, 0, 0, -participant_seconds(OLD.id));
+      RETURN OLD;
+    END IF;
+    new_group := version_group_of('session_participants', to_jsonb(NEW));
+    IF old_group IS DISTINCT FROM new_group THEN
+      moved := participant_seconds(NEW.id);
+      PERFORM add_group_counts(old_group, 0, 0, -moved);
+      PERFORM add_group_counts(new_group, 0, 0, moved);
+    END IF;
+
+  ELSE  -- time_logs
+    IF TG_OP <> 'INSERT' THEN
+      old_group := version_group_of('time_logs', to_jsonb(OLD));
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+      new_group := version_group_of('time_logs', to_jsonb(NEW));
+    END IF;
+    IF TG_OP = 'UPDATE' AND old_group IS NOT DISTINCT FROM new_group THEN
+      PERFORM add_group_counts(new_group, 0, 0,
+        time_log_seconds(NEW.started_at, NEW.ended_at) - time_log_seconds(OLD.started_at, OLD.ended_at));
+    ELSE
+      IF TG_OP <> 'INSERT' THEN
+        PERFORM add_group_counts(old_group, 0, 0, -time_log_seconds(OLD.started_at, OLD.ended_at));
+      END IF;
+      IF TG_OP <> 'DELETE' THEN
+        PERFORM add_group_counts(new_group, 0, 0, time_log_seconds(NEW.started_at, NEW.ended_at));
+      END IF;
+    END IF;
+  END IF;
+  RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS trg_count_group_activity ON group_members;
+CREATE TRIGGER trg_count_group_activity
+AFTER INSERT OR UPDATE OF group_id OR DELETE ON group_members
+FOR EACH ROW EXECUTE FUNCTION count_group_activity();
+
+DROP TRIGGER IF EXISTS trg_count_group_activity ON sessions;
+CREATE TRIGGER trg_count_group_activity
+AFTER INSERT OR UPDATE OF group_id, status ON sessions
+FOR EACH ROW EXECUTE FUNCTION count_group_activity();
+
+DROP TRIGGER IF EXISTS trg_count_group_activity_delete ON sessions;
+CREATE TRIGGER trg_count_group_activity_delete
+BEFORE DELETE ON sessions
+FOR EACH ROW EXECUTE FUNCTION count_group_activity();
+
+DROP TRIGGER IF EXISTS trg_count_group_activity ON session_participants;
+CREATE TRIGGER trg_count_group_activity
+AFTER UPDATE OF session_id ON session_participants
+FOR EACH ROW EXECUTE FUNCTION count_group_activity();
+
+DROP TRIGGER IF EXISTS trg_count_group_activity_delete ON session_participants;
+CREATE TRIGGER trg_count_group_activity_delete
+BEFORE DELETE ON session_participants
+FOR EACH ROW EXECUTE FUNCTION count_group_activity();
+
+DROP TRIGGER IF EXISTS trg_count_group_activity ON time_logs;
+CREATE TRIGGER trg_count_group_activity
+AFTER INSERT OR UPDATE OR DELETE ON time_logs
+FOR EACH ROW EXECUTE FUNCTION count_group_activity();
+
+-- Recounts one group from its rows (or its cold-storage rows once summarized). Writers add to
+-- the group row under its lock, so counting only after taking that lock misses none of them.
+CREATE OR REPLACE FUNCTION recount_group_counters(target_group UUID)
+RETURNS VOID LANGUAGE plpgsql AS $$
+DECLARE
+  summarized BOOLEAN;
+  n_members  INT;
+  n_active   INT;
+  n_seconds  BIGINT;
+BEGIN
+  SELECT summarized_at IS NOT NULL INTO summarized FROM groups WHERE id = target_group FOR UPDATE;
+  IF NOT FOUND THEN
+    RETURN;
+  END IF;
+  SELECT count(*) INTO n_members FROM group_members gm WHERE gm.group_id = target_group;
+  SELECT count(*) INTO n_active
+    FROM sessions s WHERE s.group_id = target_group AND s.status IN ('running', 'paused');
+  IF summarized THEN
+    SELECT COALESCE(sum(time_log_seconds(tl.started_at, tl.ended_at)), 0) INTO n_seconds
+      FROM sessions_archive s
+      JOIN session_participants_archive sp ON sp.session_id = s.id
+      JOIN time_logs_archive tl ON tl.participant_id = sp.id
+     WHERE s.group_id = target_group;
+  ELSE
+    SELECT COALESCE(sum(time_log_seconds(tl.started_at, tl.ended_at)), 0) INTO n_seconds
+      FROM sessions s
+      JOIN session_participants sp ON sp.session_id = s.id
+      JOIN time_logs tl ON tl.participant_id = sp.id
+     WHERE s.group_id = target_group;
+  END IF;
+  UPDATE groups
+     SET member_count = n_members, active_session_count = n_active, total_seconds = n_seconds
+   WHERE id = target_group
+     AND (member_count, active_session_count, total_seconds) IS DISTINCT FROM (n_members, n_active, n_seconds);
+  -- Counter columns do not fire trg_touch_group_version.
+  IF FOUND THEN
+    PERFORM bump_group_version(target_group);
+  END IF;
+END $$;
+
+-- Counts every group that has none yet, in one set-based pass, and returns how many it set.
+-- For rows written without the counting triggers: the columns arriving on an existing table,
+-- or a bulk load under session_replication_role = replica. A group that was ever counted has
+-- at least its owner. Takes a lock that holds off the counting triggers until commit.
+CREATE OR REPLACE FUNCTION backfill_group_counters()
+RETURNS INTEGER LANGUAGE plpgsql AS $$
+DECLARE n INT;
+BEGIN
+  LOCK TABLE groups IN SHARE ROW EXCLUSIVE MODE;
+  WITH counted AS (
+    UPDATE groups g
+       SET member_count = c.members, active_session_count = c.active, total_seconds = c.seconds
+      FROM (
+        SELECT t.id,
+               COALESCE(m.n, 0) AS members,
+               COALESCE(a.n, 0) AS active,
+               CASE WHEN t.summarized_at IS NULL THEN COALESCE(l.seconds, 0) ELSE COALESCE(al.seconds, 0) END AS seconds
+          FROM groups t
+          LEFT JOIN (SELECT group_id, count(*) AS n FROM group_members GROUP BY group_id) m ON m.group_id = t.id
+          LEFT JOIN (
+            SELECT group_id, count(*) AS n FROM sessions WHERE status IN ('running', 'paused') GROUP BY group_id
+          ) a ON a.group_id = t.id
+          LEFT JOIN (
+            SELECT s.group_id, sum(time_log_seconds(tl.started_at, tl.ended_at)) AS seconds
+              FROM sessions s
+              JOIN session_participants sp ON sp.session_id = s.id
+              JOIN time_logs tl ON tl.participant_id = sp.id
+             GROUP BY s.group_id
+          ) l ON l.group_id = t.id
+          LEFT JOIN (
+            SELECT s.group_id, sum(time_log_seconds(tl.started_at, tl.ended_at)) AS seconds
+              FROM sessions_archive s
+              JOIN session_participants_archive sp ON sp.session_id = s.id
+              JOIN time_logs_archive tl ON tl.participant_id = sp.id
+             GROUP BY s.group_id
+          ) al ON al.group_id = t.id
+         WHERE t.member_count = 0
+      ) c
+     WHERE g.id = c.id
+       AND (c.members, c.active, c.seconds) IS DISTINCT FROM (0, 0, 0::numeric)
+    RETURNING g.id
+  )
+  -- Counter columns do not fire trg_touch_group_version; bodies cached without them are stale.
+  INSERT INTO group_versions (group_id)
+  SELECT id FROM counted
+  ON CONFLICT (group_id) DO UPDATE
+    SET version = group_versions.version + 1, changed_at = now();
+  GET DIAGNOSTICS n = ROW_COUNT;
+  RETURN n;
+END $$;
+
+-- Backfill when the columns arrive zeroed; later runs find nothing to count.
+DO $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM groups g WHERE g.member_count = 0
+                AND EXISTS (SELECT 1 FROM group_members gm WHERE gm.group_id = g.id)) THEN
+    PERFORM backfill_group_counters();
+  END IF;
+END $$;